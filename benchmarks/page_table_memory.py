@@ -0,0 +1,59 @@
+"""
+Memory benchmark: PageTable vs CompactPageTable
+
+Maps N distinct pages, unmaps half of them, and reports traced Python
+heap usage after each phase. Timing comes from a separate untraced run,
+since tracemalloc slows allocation-heavy code unevenly.
+
+    python benchmarks/page_table_memory.py [num_pages]
+"""
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulator.page_table import PageTable, CompactPageTable
+
+def fill_and_drain(table_cls, pages, on_phase=None):
+    """Map every page, then unmap every other one"""
+    table = table_cls()
+    for frame, page in enumerate(pages):
+        table.insert(page, frame)
+    if on_phase:
+        on_phase()
+    for page in pages[::2]:
+        table.remove(page)
+    if on_phase:
+        on_phase()
+    return table
+
+def measure(table_cls, pages):
+    """Return (bytes after insert, bytes after removing half, seconds)"""
+    start = time.perf_counter()
+    fill_and_drain(table_cls, pages)
+    elapsed = time.perf_counter() - start
+    
+    samples = []
+    tracemalloc.start()
+    fill_and_drain(table_cls, pages, lambda: samples.append(tracemalloc.get_traced_memory()[0]))
+    tracemalloc.stop()
+    return samples[0], samples[1], elapsed
+
+def main():
+    num_pages = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(42)
+    pages = rng.sample(range(1 << 36), num_pages)
+    
+    print(f"{num_pages} distinct pages")
+    print(f"{'table':<18}{'mapped MB':>12}{'after remove MB':>18}{'bytes/page':>12}{'seconds':>10}")
+    for table_cls in (PageTable, CompactPageTable):
+        mapped, unmapped, elapsed = measure(table_cls, pages)
+        print(f"{table_cls.__name__:<18}{mapped / 2**20:>12.1f}{unmapped / 2**20:>18.1f}"
+              f"{mapped / num_pages:>12.1f}{elapsed:>10.2f}")
+
+if __name__ == "__main__":
+    main()
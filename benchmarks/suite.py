@@ -0,0 +1,229 @@
+"""
+Hot-path benchmark suite
+
+Runs every replacer on its own (access() per reference) and
+MemoryManager.access_page end to end over the seeded workloads in
+workloads.py, for each frame count. Each case reports:
+
+    refs_per_sec      best of --repeat untraced runs, setup excluded
+    peak_bytes        tracemalloc peak while building and running it
+    allocated_blocks  blocks allocated by the case still held after the run
+
+Workloads draw from twice as many pages as there are frames, and run at
+least two references per frame so that large frame counts still evict.
+Results are saved as a JSON baseline; --compare reruns the baseline's
+cases and flags any metric that is worse by more than --threshold. The
+default frame counts finish in minutes; --large adds 65536 and 1048576.
+
+    python benchmarks/suite.py -o baseline.json
+    python benchmarks/suite.py --compare baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.workloads import WORKLOADS, generate
+from simulator.memory_manager import MemoryManager
+from simulator.page_replacement import get_replacer
+
+ALGORITHMS = ['FIFO', 'LRU', 'LFU', 'Optimal', 'ARC', '2Q', 'LIRS',
+              'CLOCK', 'SecondChance', 'NRU', 'Aging']
+FRAME_COUNTS = [16, 1024]
+LARGE_FRAME_COUNTS = [65536, 1 << 20]
+TARGETS = ('replacer', 'access_page')
+
+# metric -> (higher is better, smallest absolute change worth flagging)
+METRICS = {
+    'refs_per_sec': (True, 0),
+    'peak_bytes': (False, 4096),
+    'allocated_blocks': (False, 64)
+}
+
+def run_replacer(algorithm, num_frames, refs):
+    """Setup and run callables for a bare replacer"""
+    state = {}
+    def setup():
+        state['replacer'] = get_replacer(algorithm, num_frames, refs)
+    def run():
+        access = state['replacer'].access
+        for page in refs:
+            access(page)
+    return setup, run
+
+def run_access_page(algorithm, num_frames, refs):
+    """Setup and run callables for MemoryManager.access_page"""
+    state = {}
+    def setup():
+        mm = MemoryManager(num_frames=num_frames, algorithm=algorithm)
+        mm.initialize_replacer(refs)
+        state['mm'] = mm
+    def run():
+        access_page = state['mm'].access_page
+        for page in refs:
+            access_page(page)
+    return setup, run
+
+RUNNERS = {'replacer': run_replacer, 'access_page': run_access_page}
+
+def measure(setup, run, num_refs, repeat=3, memory=True):
+    """Time the best of repeat runs, then one traced run for memory"""
+    best = None
+    for _ in range(repeat):
+        setup()
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    result = {'refs_per_sec': num_refs / best if best > 0 else 0.0}
+    
+    if memory:
+        tracemalloc.start()
+        setup()
+        run()
+        result['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        # Only blocks traced since start: what the case's structures hold
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        result['allocated_blocks'] = sum(stat.count for stat in snapshot.statistics('filename'))
+    return result
+
+def case_key(target, algorithm, workload, num_frames):
+    return f"{target}/{algorithm}/{workload}/{num_frames}"
+
+def run_suite(algorithms, workloads, frame_counts, targets=TARGETS, num_refs=100000,
+              seed=0, repeat=3, memory=True, only=None, log=print):
+    """Run every case (or the keys in only), returns {case key: metrics}"""
+    results = {}
+    for num_frames in frame_counts:
+        refs_count = max(num_refs, 2 * num_frames)
+        for workload in workloads:
+            refs = None
+            for target in targets:
+                for algorithm in algorithms:
+                    key = case_key(target, algorithm, workload, num_frames)
+                    if only is not None and key not in only:
+                        continue
+                    if refs is None:
+                        refs = generate(workload, refs_count, 2 * num_frames, seed)
+                    setup, run = RUNNERS[target](algorithm, num_frames, refs)
+                    results[key] = measure(setup, run, len(refs), repeat, memory)
+                    log(format_row(key, results[key]))
+    return results
+
+def format_row(key, metrics):
+    row = f"{key:<44}{metrics['refs_per_sec']:>14,.0f} refs/s"
+    if 'peak_bytes' in metrics:
+        row += f"{metrics['peak_bytes'] / 2**20:>10.1f} MB peak{metrics['allocated_blocks']:>12,} blocks"
+    return row
+
+def compare(baseline, current, threshold):
+    """Cases where a metric got worse than baseline by more than threshold (a fraction)
+    
+    Returns a list of (key, metric, baseline value, current value).
+    """
+    regressions = []
+    for key, before in baseline.items():
+        after = current.get(key)
+        if after is None:
+            continue
+        for metric, (higher_is_better, floor) in METRICS.items():
+            if metric not in before or metric not in after:
+                continue
+            old, new = before[metric], after[metric]
+            if higher_is_better:
+                worse = new < old * (1 - threshold)
+            else:
+                worse = new > old * (1 + threshold) and new - old > floor
+            if worse:
+                regressions.append((key, metric, old, new))
+    return regressions
+
+def _split(text, convert=str):
+    return [convert(item) for item in text.split(',') if item]
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Benchmark the replacement and access hot path.')
+    parser.add_argument('-a', '--algorithms', type=_split, default=ALGORITHMS,
+                        help='comma-separated algorithms (default: all)')
+    parser.add_argument('-w', '--workloads', type=_split, default=list(WORKLOADS),
+                        help='comma-separated workloads (default: all)')
+    parser.add_argument('-f', '--frames', type=lambda text: _split(text, int), default=FRAME_COUNTS,
+                        help='comma-separated frame counts (default: 16,1024)')
+    parser.add_argument('--large', action='store_true',
+                        help='also run 65536 and 1048576 frames (hours for the full grid)')
+    parser.add_argument('--targets', type=_split, default=list(TARGETS),
+                        help='replacer and/or access_page (default: both)')
+    parser.add_argument('-n', '--refs', type=int, default=100000,
+                        help='references per case, at least twice the frame count (default: 100000)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per case, best is kept')
+    parser.add_argument('--no-memory', action='store_true', help='skip the traced memory run')
+    parser.add_argument('-o', '--output', help='write results as a JSON baseline')
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help="rerun the baseline's cases and report regressions")
+    parser.add_argument('--threshold', type=float, default=0.20,
+                        help='allowed slowdown or growth before a regression is flagged (default: 0.20)')
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    for name in args.workloads:
+        if name not in WORKLOADS:
+            raise SystemExit(f"Unknown workload: {name}")
+    for target in args.targets:
+        if target not in RUNNERS:
+            raise SystemExit(f"Unknown target: {target}")
+    
+    if args.large:
+        args.frames = args.frames + [f for f in LARGE_FRAME_COUNTS if f not in args.frames]
+    
+    baseline = None
+    only = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        # Same cases and workload parameters as the baseline
+        meta = baseline['meta']
+        args.refs, args.seed = meta['refs'], meta['seed']
+        args.algorithms, args.workloads = meta['algorithms'], meta['workloads']
+        args.frames, args.targets = meta['frames'], meta['targets']
+        only = set(baseline['results'])
+    
+    results = run_suite(args.algorithms, args.workloads, args.frames, args.targets,
+                        args.refs, args.seed, args.repeat, not args.no_memory, only)
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'meta': {
+                    'python': platform.python_version(),
+                    'machine': platform.machine(),
+                    'refs': args.refs,
+                    'seed': args.seed,
+                    'algorithms': args.algorithms,
+                    'workloads': args.workloads,
+                    'frames': args.frames,
+                    'targets': args.targets
+                },
+                'results': results
+            }, f, indent=2)
+    
+    if baseline is not None:
+        regressions = compare(baseline['results'], results, args.threshold)
+        for key, metric, old, new in regressions:
+            change = (new - old) / old * 100 if old else float('inf')
+            print(f"REGRESSION {key} {metric}: {old:,.0f} -> {new:,.0f} ({change:+.1f}%)")
+        print(f"{len(regressions)} regression(s) in {len(results)} case(s)")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
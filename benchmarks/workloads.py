@@ -0,0 +1,81 @@
+"""
+Seeded synthetic page reference workloads
+
+Every generator takes (num_refs, num_pages, rng) and returns an
+array('q') of page numbers, so the same seed always gives the same trace.
+
+    sequential  one pass over fresh pages, every reference a cold miss
+    loop        cycles over num_pages pages in order
+    uniform     pages drawn uniformly from num_pages
+    zipf        Zipfian popularity (skew 1.0) over num_pages
+    phase       a hot eighth of the pages takes 90% of references and
+                moves to a new region every phase
+
+    python benchmarks/workloads.py zipf 100000 4096 -o zipf.txt
+"""
+
+import argparse
+import random
+from array import array
+from itertools import accumulate
+
+def sequential(num_refs, num_pages, rng):
+    """Scan: each reference touches a page never seen before"""
+    return array('q', range(num_refs))
+
+def loop(num_refs, num_pages, rng):
+    """Repeatedly walk num_pages pages in order"""
+    return array('q', (i % num_pages for i in range(num_refs)))
+
+def uniform(num_refs, num_pages, rng):
+    """Independent uniform picks"""
+    randrange = rng.randrange
+    return array('q', (randrange(num_pages) for _ in range(num_refs)))
+
+def zipf(num_refs, num_pages, rng, skew=1.0):
+    """Page k is referenced with weight 1 / (k + 1) ** skew"""
+    cum_weights = list(accumulate(1.0 / (k + 1) ** skew for k in range(num_pages)))
+    return array('q', rng.choices(range(num_pages), cum_weights=cum_weights, k=num_refs))
+
+def phase(num_refs, num_pages, rng, phases=8, hot_share=0.9):
+    """Shifting hot set: each phase favours a different eighth of the pages"""
+    hot_pages = max(1, num_pages // 8)
+    per_phase = max(1, num_refs // phases)
+    refs = array('q')
+    random_ = rng.random
+    randrange = rng.randrange
+    while len(refs) < num_refs:
+        base = randrange(num_pages - hot_pages + 1)
+        count = min(per_phase, num_refs - len(refs))
+        refs.extend(base + randrange(hot_pages) if random_() < hot_share else randrange(num_pages)
+                    for _ in range(count))
+    return refs
+
+WORKLOADS = {
+    'sequential': sequential,
+    'loop': loop,
+    'uniform': uniform,
+    'zipf': zipf,
+    'phase': phase
+}
+
+def generate(name, num_refs, num_pages, seed=0):
+    """Build a named workload from a fresh seeded generator"""
+    return WORKLOADS[name](num_refs, num_pages, random.Random(seed))
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a synthetic page trace, one page per line.')
+    parser.add_argument('workload', choices=list(WORKLOADS))
+    parser.add_argument('refs', type=int, help='number of references')
+    parser.add_argument('pages', type=int, help='number of distinct pages to draw from')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', required=True, help='trace file to write')
+    args = parser.parse_args()
+    
+    refs = generate(args.workload, args.refs, args.pages, args.seed)
+    with open(args.output, 'w') as f:
+        f.write('\n'.join(map(str, refs)))
+        f.write('\n')
+
+if __name__ == "__main__":
+    main()
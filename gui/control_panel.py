@@ -1,6 +1,8 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
+import os
+from tkinter import ttk, messagebox, simpledialog, filedialog
 from simulator.memory_manager import MemoryManager
+from simulator.trace_reader import read_references, TraceFormatError
 
 
 class ControlPanel(tk.Frame):
@@ -19,18 +21,29 @@ class ControlPanel(tk.Frame):
         
         self.algo_var = tk.StringVar(value='LRU')
         algo_menu = ttk.Combobox(self, textvariable=self.algo_var, 
-                                values=['FIFO', 'LRU', 'LFU', 'Optimal'],
-                                state='readonly', width=10)
+                                values=['FIFO', 'LRU', 'LFU', 'Optimal', 'ARC', '2Q', 'LIRS',
+                                        'CLOCK', 'SecondChance', 'NRU', 'Aging'],
+                                state='readonly', width=12)
         algo_menu.pack(side=tk.LEFT, padx=5)
         
         # Reference string
         tk.Label(self, text="Reference String:", bg='#2c3e50', fg='white',
                 font=('Arial', 11, 'bold')).pack(side=tk.LEFT, padx=20)
         
+        # Page numbers; a 'w' suffix marks a write (e.g. "2w")
         self.ref_entry = tk.Entry(self, width=30, font=('Arial', 10))
         self.ref_entry.insert(0, "1,2,3,4,1,2,5,1,2,3,4,5")
         self.ref_entry.pack(side=tk.LEFT, padx=5)
         
+        # Trace file loaded with the Load button, shown in the entry as @name
+        self.trace_pages = None
+        self.trace_writes = None
+        self.trace_label = None
+        self.load_btn = tk.Button(self, text="📂 Load", command=self.load_trace,
+                                  bg='#34495e', fg='white', font=('Arial', 11, 'bold'),
+                                  width=7, height=1)
+        self.load_btn.pack(side=tk.LEFT, padx=5)
+        
         # Settings button
         self.settings_btn = tk.Button(self, text="⚙ Settings", command=self.open_settings,
                                      bg='#9b59b6', fg='white', font=('Arial', 11, 'bold'),
@@ -55,6 +68,17 @@ class ControlPanel(tk.Frame):
                                    width=10, height=1)
         self.reset_btn.pack(side=tk.LEFT, padx=5)
         
+        # Step back / jump: restore a snapshot and replay up to the step
+        self.back_btn = tk.Button(self, text="⏮ Back", command=self.step_back,
+                                  bg='#16a085', fg='white', font=('Arial', 11, 'bold'),
+                                  width=7, height=1)
+        self.back_btn.pack(side=tk.LEFT, padx=5)
+        
+        self.jump_btn = tk.Button(self, text="⤵ Jump", command=self.jump_to_step,
+                                  bg='#16a085', fg='white', font=('Arial', 11, 'bold'),
+                                  width=7, height=1)
+        self.jump_btn.pack(side=tk.LEFT, padx=5)
+        
         # Speed control
         tk.Label(self, text="Speed:", bg='#2c3e50', fg='white',
                 font=('Arial', 11, 'bold')).pack(side=tk.LEFT, padx=20)
@@ -64,6 +88,13 @@ class ControlPanel(tk.Frame):
                                      command=self.update_speed)
         self.speed_slider.set(800)
         self.speed_slider.pack(side=tk.LEFT)
+        
+        # Turbo mode: run on a worker thread, redraw at a fixed rate
+        self.turbo_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(self, text="Turbo", variable=self.turbo_var,
+                      bg='#2c3e50', fg='white', selectcolor='#2c3e50',
+                      activebackground='#2c3e50', activeforeground='white',
+                      font=('Arial', 11, 'bold')).pack(side=tk.LEFT, padx=10)
     
     def open_settings(self):
         """Open settings dialog"""
@@ -85,6 +116,8 @@ class ControlPanel(tk.Frame):
             )
             
             if tlb_size:
+                self.app.stop_turbo()
+                
                 # Recreate memory manager with new settings
                 self.app.memory_manager = MemoryManager(
                     num_frames=num_frames,
@@ -92,25 +125,74 @@ class ControlPanel(tk.Frame):
                     algorithm=self.algo_var.get()
                 )
                 
+                # Snapshots of the old manager cannot be restored into this one
+                self.app.snapshots.clear()
+                
                 # Update all views
                 self.app.memory_view.set_memory_manager(self.app.memory_manager)
                 self.app.tlb_view.set_memory_manager(self.app.memory_manager)
                 self.app.page_table_view.set_memory_manager(self.app.memory_manager)
                 self.app.swap_view.set_memory_manager(self.app.memory_manager)
+                self.app.curve_view.set_memory_manager(self.app.memory_manager)
                 
                 self.app.log_event(f"Settings updated: {num_frames} frames, TLB size {tlb_size}")
     
+    def load_trace(self):
+        """Load a reference string from a trace file"""
+        path = filedialog.askopenfilename(
+            title="Load Trace",
+            filetypes=[("Page number traces", "*.txt *.csv"), ("Binary address traces", "*.bin"),
+                       ("All files", "*")]
+        )
+        if not path:
+            return
+        
+        fmt = 'bin64' if path.endswith('.bin') else 'pages'
+        try:
+            pages, writes = read_references(path, fmt, self.app.memory_manager.page_size)
+        except (OSError, TraceFormatError) as e:
+            messagebox.showerror("Error", f"Could not load trace:\n{e}")
+            return
+        
+        self.trace_pages, self.trace_writes = list(pages), writes
+        self.trace_label = f"@{os.path.basename(path)}"
+        self.ref_entry.delete(0, tk.END)
+        self.ref_entry.insert(0, self.trace_label)
+        self.app.log_event(f"Loaded {len(self.trace_pages)} references from {path}")
+    
     def start_sim(self):
-        """Start simulation"""
+        """Start simulation, or resume a paused one"""
+        if self.app.can_resume():
+            self.app.resume_simulation()
+            self.start_btn.config(state=tk.DISABLED)
+            self.pause_btn.config(state=tk.NORMAL)
+            return
+        
         ref_string = self.ref_entry.get()
         try:
-            pages = [int(x.strip()) for x in ref_string.split(',')]
-            self.app.start_simulation(pages, self.algo_var.get())
+            if self.trace_pages is not None and ref_string == self.trace_label:
+                pages, writes = self.trace_pages, self.trace_writes
+            else:
+                pages, writes = self.parse_references(ref_string)
+            self.app.start_simulation(pages, self.algo_var.get(), turbo=self.turbo_var.get(),
+                                      writes=writes)
             self.start_btn.config(state=tk.DISABLED)
             self.pause_btn.config(state=tk.NORMAL)
         except ValueError:
             messagebox.showerror("Error", "Invalid reference string!")
     
+    @staticmethod
+    def parse_references(text):
+        """Parse '1,2w,3' into page numbers and write flags"""
+        pages = []
+        writes = bytearray()
+        for token in text.split(','):
+            token = token.strip().lower()
+            is_write = token.endswith('w')
+            pages.append(int(token.rstrip('rw')))
+            writes.append(is_write)
+        return pages, writes
+    
     def pause_sim(self):
         """Pause simulation"""
         self.app.pause_simulation()
@@ -123,6 +205,30 @@ class ControlPanel(tk.Frame):
         self.start_btn.config(state=tk.NORMAL)
         self.pause_btn.config(state=tk.DISABLED)
     
+    def step_back(self):
+        """Go back one reference and pause"""
+        if self.app.can_step_back():
+            self.app.step_back()
+            self.start_btn.config(state=tk.NORMAL)
+            self.pause_btn.config(state=tk.DISABLED)
+    
+    def jump_to_step(self):
+        """Ask for a step number, show the state after it and pause"""
+        if not self.app.snapshots:
+            messagebox.showinfo("Jump", "Start a simulation first.")
+            return
+        step = simpledialog.askinteger(
+            "Jump to Step",
+            f"Step (0-{len(self.app.reference_pages)}):",
+            initialvalue=self.app.current_index,
+            minvalue=0,
+            maxvalue=len(self.app.reference_pages)
+        )
+        if step is not None:
+            self.app.goto_step(step)
+            self.start_btn.config(state=tk.NORMAL)
+            self.pause_btn.config(state=tk.DISABLED)
+    
     def update_speed(self, value):
         """Update animation speed"""
         self.app.animation_speed = int(value)
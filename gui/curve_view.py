@@ -0,0 +1,124 @@
+import queue
+import threading
+import tkinter as tk
+from simulator.analysis import miss_ratio_curves
+
+class CurveView(tk.Frame):
+    """Fault count vs. number of frames, for LRU and OPT
+    
+    Curves of a new trace are computed on a worker thread the first time
+    the tab is shown, so a long trace never blocks the window.
+    """
+    SERIES = [('lru_faults', 'LRU', '#3498db'), ('opt_faults', 'OPT', '#27ae60')]
+    POLL_MS = 100
+    
+    def __init__(self, parent):
+        super().__init__(parent, bg='white')
+        tk.Label(self, text="Page Faults vs. Frames", bg='white',
+                font=('Arial', 14, 'bold')).pack(pady=10)
+        self.canvas = tk.Canvas(self, bg='white', highlightthickness=0)
+        self.canvas.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.canvas.bind('<Configure>', lambda e: self.draw_curves())
+        self.bind('<Map>', lambda e: self.compute())
+        self.memory_manager = None
+        self.curves = None
+        self.pending = None         # (pages, max_frames) not computed yet
+        self.computing = False
+        self.generation = 0         # Bumped per trace so stale results are dropped
+    
+    def set_memory_manager(self, mm):
+        """Set memory manager reference"""
+        self.memory_manager = mm
+        self.draw_curves()
+    
+    def set_curves(self, curves):
+        """Show curves from simulator.analysis.miss_ratio_curves"""
+        self.generation += 1
+        self.pending = None
+        self.computing = False
+        self.curves = curves
+        self.draw_curves()
+    
+    def set_trace(self, pages, max_frames):
+        """Show the curves of pages up to max_frames, computed when the tab is shown"""
+        self.generation += 1
+        self.pending = (pages, max_frames)
+        self.computing = False
+        self.curves = None
+        self.draw_curves()
+        if self.winfo_ismapped():
+            self.compute()
+    
+    def compute(self):
+        """Start computing the pending curves on a worker thread"""
+        if self.pending is None:
+            return
+        pages, max_frames = self.pending
+        self.pending = None
+        self.computing = True
+        self.draw_curves()
+        results = queue.Queue()
+        threading.Thread(target=lambda: results.put(miss_ratio_curves(pages, max_frames)),
+                         daemon=True).start()
+        self.after(self.POLL_MS, self.poll, self.generation, results)
+    
+    def poll(self, generation, results):
+        """Show the worker's curves once ready, unless a newer trace replaced them"""
+        if generation != self.generation:
+            return
+        try:
+            curves = results.get_nowait()
+        except queue.Empty:
+            self.after(self.POLL_MS, self.poll, generation, results)
+            return
+        self.set_curves(curves)
+    
+    def draw_curves(self):
+        """Draw both curves with a marker at the configured frame count"""
+        self.canvas.delete("all")
+        if not self.curves or not self.curves['frames']:
+            text = 'Computing the curves...' if self.computing or self.pending else \
+                'Start a simulation to compute the curves'
+            self.canvas.create_text(20, 20, anchor='nw', fill='#95a5a6',
+                                   font=('Arial', 11), text=text)
+            return
+        
+        width = max(self.canvas.winfo_width(), 300)
+        height = max(self.canvas.winfo_height(), 200)
+        left, right, top, bottom = 60, width - 20, 20, height - 40
+        
+        frames = self.curves['frames']
+        max_x = max(frames[-1], 2)
+        max_y = max(self.curves['total_accesses'], 1)
+        
+        def x_of(k):
+            return left + (k - 1) * (right - left) / (max_x - 1)
+        
+        def y_of(faults):
+            return bottom - faults * (bottom - top) / max_y
+        
+        # Axes
+        self.canvas.create_line(left, top, left, bottom, right, bottom, fill='#7f8c8d', width=2)
+        self.canvas.create_text(left - 8, top, text=str(max_y), anchor='e', font=('Arial', 9))
+        self.canvas.create_text(left - 8, bottom, text='0', anchor='e', font=('Arial', 9))
+        self.canvas.create_text(left, bottom + 8, text='1', anchor='n', font=('Arial', 9))
+        self.canvas.create_text(right, bottom + 8, text=str(frames[-1]), anchor='n', font=('Arial', 9))
+        self.canvas.create_text((left + right) / 2, bottom + 22, text='Frames',
+                               font=('Arial', 10, 'bold'))
+        
+        # Current configuration
+        if self.memory_manager and self.memory_manager.num_frames <= frames[-1]:
+            x = x_of(self.memory_manager.num_frames)
+            self.canvas.create_line(x, top, x, bottom, fill='#e74c3c', dash=(4, 2))
+        
+        for i, (key, name, color) in enumerate(self.SERIES):
+            points = []
+            for k, faults in zip(frames, self.curves[key]):
+                points.extend((x_of(k), y_of(faults)))
+            if len(points) >= 4:
+                self.canvas.create_line(*points, fill=color, width=2)
+            else:
+                self.canvas.create_oval(points[0] - 3, points[1] - 3, points[0] + 3, points[1] + 3,
+                                       fill=color, outline=color)
+            self.canvas.create_text(right - 10, top + 10 + i * 18, text=name, anchor='e',
+                                   fill=color, font=('Arial', 10, 'bold'))
@@ -0,0 +1,133 @@
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+from simulator.memory_manager import TLB_HIT, PAGE_HIT, PAGE_FAULT
+from simulator.event_log import MESSAGE
+
+class LogView(tk.Frame):
+    """Virtualized view of an EventLog
+    
+    Only the visible lines are rendered; scrolling re-renders from the log
+    instead of keeping every line in the Text widget. Appends are batched
+    into one refresh per idle cycle.
+    """
+    FILTERS = [
+        ('All', None),
+        ('Page Faults', {PAGE_FAULT}),
+        ('TLB Hits', {TLB_HIT}),
+        ('Page Hits', {PAGE_HIT}),
+        ('Messages', {MESSAGE})
+    ]
+    
+    def __init__(self, parent, event_log, lines=6):
+        super().__init__(parent, bg='white')
+        self.event_log = event_log
+        self.lines = lines
+        self.offset = 0          # Index of the first visible matching record
+        self.follow = True       # Stick to the newest records
+        self.refresh_pending = False
+        self.create_widgets()
+    
+    def create_widgets(self):
+        """Create log widgets"""
+        header = tk.Frame(self, bg='white')
+        header.pack(side=tk.TOP, fill=tk.X)
+        
+        tk.Label(header, text="Event Log", bg='white',
+                font=('Arial', 12, 'bold')).pack(side=tk.LEFT, padx=5, pady=5)
+        
+        self.export_btn = tk.Button(header, text="Export…", command=self.toggle_export,
+                                    bg='#34495e', fg='white', font=('Arial', 9, 'bold'))
+        self.export_btn.pack(side=tk.RIGHT, padx=5)
+        
+        self.filter_var = tk.StringVar(value='All')
+        filter_menu = ttk.Combobox(header, textvariable=self.filter_var,
+                                   values=[name for name, _ in self.FILTERS],
+                                   state='readonly', width=12)
+        filter_menu.pack(side=tk.RIGHT, padx=5)
+        filter_menu.bind('<<ComboboxSelected>>', lambda e: self.on_filter())
+        tk.Label(header, text="Show:", bg='white', font=('Arial', 9)).pack(side=tk.RIGHT)
+        
+        self.text = tk.Text(self, height=self.lines, font=('Courier', 9), wrap=tk.NONE,
+                            state=tk.DISABLED)
+        self.scrollbar = ttk.Scrollbar(self, command=self.on_scroll)
+        
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.text.bind('<MouseWheel>', lambda e: self.scroll_by(-1 if e.delta > 0 else 1))
+        self.text.bind('<Button-4>', lambda e: self.scroll_by(-1))
+        self.text.bind('<Button-5>', lambda e: self.scroll_by(1))
+    
+    def kinds(self):
+        """Outcome codes selected by the filter (None for all)"""
+        return dict(self.FILTERS)[self.filter_var.get()]
+    
+    def schedule_refresh(self):
+        """Refresh once the current batch of appends is done"""
+        if not self.refresh_pending:
+            self.refresh_pending = True
+            self.after_idle(self.refresh)
+    
+    def refresh(self):
+        """Render the visible window of matching records"""
+        self.refresh_pending = False
+        seqs = self.event_log.matching(self.kinds())
+        total = len(seqs)
+        last_start = max(0, total - self.lines)
+        self.offset = last_start if self.follow else min(self.offset, last_start)
+        
+        end = min(self.offset + self.lines, total)
+        text = '\n'.join(self.event_log.format_record(seqs[i]) for i in range(self.offset, end))
+        
+        self.text.config(state=tk.NORMAL)
+        self.text.delete(1.0, tk.END)
+        self.text.insert(tk.END, text)
+        self.text.config(state=tk.DISABLED)
+        
+        if total:
+            self.scrollbar.set(self.offset / total, end / total)
+        else:
+            self.scrollbar.set(0, 1)
+    
+    def scroll_to(self, offset):
+        """Show records starting at offset"""
+        total = len(self.event_log.matching(self.kinds()))
+        last_start = max(0, total - self.lines)
+        self.offset = max(0, min(int(offset), last_start))
+        self.follow = self.offset >= last_start
+        self.refresh()
+    
+    def scroll_by(self, lines):
+        self.scroll_to(self.offset + lines)
+        return 'break'
+    
+    def on_scroll(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, what)"""
+        if args[0] == 'moveto':
+            total = len(self.event_log.matching(self.kinds()))
+            self.scroll_to(float(args[1]) * total)
+        elif args[0] == 'scroll':
+            step = int(args[1]) * (self.lines if args[2] == 'pages' else 1)
+            self.scroll_by(step)
+    
+    def on_filter(self):
+        self.follow = True
+        self.refresh()
+    
+    def toggle_export(self):
+        """Start streaming the log to a CSV file, or stop"""
+        if self.event_log.export_file:
+            self.event_log.stop_export()
+            self.export_btn.config(text="Export…")
+            return
+        
+        path = filedialog.asksaveasfilename(title="Export Event Log", defaultextension='.csv',
+                                            filetypes=[("CSV files", "*.csv"), ("All files", "*")])
+        if not path:
+            return
+        try:
+            self.event_log.start_export(path)
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not export log:\n{e}")
+            return
+        self.export_btn.config(text="■ Stop Export")
@@ -1,15 +1,28 @@
 from tkinter import simpledialog
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
-from simulator.memory_manager import MemoryManager
+from simulator.memory_manager import MemoryManager, TLB_HIT, PAGE_HIT, PAGE_FAULT
+from simulator.checkpoint import SnapshotHistory, rewind
+from simulator.event_log import EventLog
+from simulator.trace_reader import WRITE, FETCH
 from .control_panel import ControlPanel
 from .memory_view import MemoryView
 from .tlb_view import TLBView
 from .page_table_view import PageTableView
 from .swap_view import SwapView
+from .curve_view import CurveView
+from .turbo import TurboRunner
+from .log_view import LogView
 
 class MainWindow(tk.Tk):
     """Main application window"""
+    TURBO_REFRESH_MS = 33  # Redraw rate while a turbo run is live (~30 Hz)
+    SNAPSHOT_INTERVAL = 500  # Least steps between snapshots for step back / jump
+    SNAPSHOT_COUNT = 32  # Snapshots spread over a trace before thinning
+    SNAPSHOT_BUDGET = 32 * 2**20  # Bytes of snapshots kept per run
+    
     def __init__(self):
         super().__init__()
         
@@ -24,7 +37,19 @@ class MainWindow(tk.Tk):
         self.is_running = False
         self.current_index = 0
         self.reference_pages = []
+        self.reference_writes = None
         self.animation_speed = 800
+        self.step_job = None
+        
+        # Turbo mode: worker thread plus the lock guarding the memory manager
+        self.turbo = None
+        self.turbo_lock = threading.Lock()
+        
+        # Bounded log of every access and message
+        self.event_log = EventLog(capacity=100000)
+        
+        # Periodic simulator states of the current run
+        self.snapshots = SnapshotHistory(self.SNAPSHOT_INTERVAL, self.SNAPSHOT_BUDGET)
         
         self.create_layout()
     
@@ -53,31 +78,24 @@ class MainWindow(tk.Tk):
         self.tlb_view = TLBView(self.notebook)
         self.page_table_view = PageTableView(self.notebook)
         self.swap_view = SwapView(self.notebook)
+        self.curve_view = CurveView(self.notebook)
         
         self.notebook.add(self.memory_view, text="Physical Memory")
         self.notebook.add(self.tlb_view, text="TLB")
         self.notebook.add(self.page_table_view, text="Page Table")
         self.notebook.add(self.swap_view, text="Swap Space")
+        self.notebook.add(self.curve_view, text="Fault Curve")
         
         # Set memory manager
         self.memory_view.set_memory_manager(self.memory_manager)
         self.tlb_view.set_memory_manager(self.memory_manager)
         self.page_table_view.set_memory_manager(self.memory_manager)
         self.swap_view.set_memory_manager(self.memory_manager)
+        self.curve_view.set_memory_manager(self.memory_manager)
         
         # Event log
-        log_frame = tk.Frame(self, bg='white')
-        log_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=10)
-        
-        tk.Label(log_frame, text="Event Log", bg='white', 
-                font=('Arial', 12, 'bold')).pack(anchor='w', padx=5, pady=5)
-        
-        self.log_text = tk.Text(log_frame, height=6, font=('Courier', 9))
-        log_scroll = ttk.Scrollbar(log_frame, command=self.log_text.yview)
-        self.log_text.configure(yscrollcommand=log_scroll.set)
-        
-        self.log_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
-        log_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.log_view = LogView(self, self.event_log)
+        self.log_view.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=10)
     
     def create_metrics(self, parent):
         """Create metrics panel"""
@@ -93,90 +111,243 @@ class MainWindow(tk.Tk):
             ('TLB Misses', 'tlb_misses'),
             ('TLB Hit Ratio (%)', 'tlb_hit_ratio'),
             ('Swap Ins', 'swap_ins'),
-            ('Swap Outs', 'swap_outs')
+            ('Swap Outs', 'swap_outs'),
+            ('Clean Evictions', 'clean_evictions'),
+            ('Dirty Evictions', 'dirty_evictions')
+        ]
+        timing = [
+            ('EAT', 'eat_ns'),
+            ('TLB', 'time_tlb_ns'),
+            ('Memory', 'time_memory_ns'),
+            ('Page Walks', 'time_walk_ns'),
+            ('Swap In', 'time_swap_in_ns'),
+            ('Swap Out', 'time_swap_out_ns'),
+            ('Latency p50', 'latency_p50_ns'),
+            ('Latency p99', 'latency_p99_ns')
         ]
         
         for label, key in metrics:
-            frame = tk.Frame(parent, bg='#34495e')
-            frame.pack(fill=tk.X, padx=15, pady=8)
-            
-            tk.Label(frame, text=label, bg='#34495e', fg='#ecf0f1',
-                    font=('Arial', 10), anchor='w').pack(side=tk.LEFT)
-            
-            value_label = tk.Label(frame, text='0', bg='#34495e', fg='#3498db',
-                                  font=('Arial', 12, 'bold'), anchor='e')
-            value_label.pack(side=tk.RIGHT)
-            
-            self.metric_labels[key] = value_label
-    
-    def start_simulation(self, pages, algorithm):
-        """Start simulation"""
+            self.add_metric_row(parent, label, key, 5)
+        
+        tk.Label(parent, text="Simulated Time (ns)", bg='#34495e', fg='white',
+                font=('Arial', 11, 'bold')).pack(pady=(10, 2))
+        for label, key in timing:
+            self.add_metric_row(parent, label, key, 1)
+    
+    def add_metric_row(self, parent, label, key, pady):
+        """Add a label/value row to the metrics panel"""
+        frame = tk.Frame(parent, bg='#34495e')
+        frame.pack(fill=tk.X, padx=15, pady=pady)
+        
+        tk.Label(frame, text=label, bg='#34495e', fg='#ecf0f1',
+                font=('Arial', 10), anchor='w').pack(side=tk.LEFT)
+        
+        value_label = tk.Label(frame, text='0', bg='#34495e', fg='#3498db',
+                              font=('Arial', 12, 'bold'), anchor='e')
+        value_label.pack(side=tk.RIGHT)
+        
+        self.metric_labels[key] = value_label
+    
+    def start_simulation(self, pages, algorithm, turbo=False, writes=None):
+        """Start simulation; writes optionally flags write references"""
+        self.stop_turbo()
         self.is_running = True
         self.current_index = 0
         self.reference_pages = pages
+        self.reference_writes = writes
         
         # Reset and initialize
         self.memory_manager.reset()
         self.memory_manager.algorithm = algorithm
         self.memory_manager.initialize_replacer(pages)
+        self.snapshots.clear(max(self.SNAPSHOT_INTERVAL, len(pages) // self.SNAPSHOT_COUNT))
+        self.snapshots.record(self.memory_manager, 0)
+        max_frames = max(self.memory_manager.num_frames, min(len(set(pages)), 64))
+        self.curve_view.set_trace(pages, max_frames)
+        self.refresh_views()
         
-        self.log_event(f"Started {algorithm} simulation")
-        self.log_event(f"Reference string: {pages}")
+        self.log_event(f"Started {algorithm} simulation" + (" (turbo)" if turbo else ""))
+        if len(pages) <= 64:
+            self.log_event(f"Reference string: {pages}")
+        else:
+            self.log_event(f"Reference string: {len(pages)} references")
         
-        self.run_step()
+        if turbo:
+            self.start_turbo()
+        else:
+            self.run_step()
+    
+    def can_resume(self):
+        """True if a paused run has references left"""
+        return not self.is_running and 0 < self.current_index < len(self.reference_pages)
+    
+    def resume_simulation(self):
+        """Continue a paused simulation"""
+        self.is_running = True
+        self.log_event("Simulation resumed")
+        if self.turbo:
+            self.turbo.resume()
+            self.drain_turbo()
+        else:
+            self.run_step()
     
     def run_step(self):
         """Run one simulation step"""
-        if not self.is_running or self.current_index >= len(self.reference_pages):
+        self.step_job = None
+        if not self.is_running:
+            return
+        if self.current_index >= len(self.reference_pages):
             self.is_running = False
             self.log_event("Simulation completed!")
             return
         
         page = self.reference_pages[self.current_index]
-        result = self.memory_manager.access_page(page)
+        flags = self.reference_writes[self.current_index] if self.reference_writes else 0
+        result = self.memory_manager.access_page(page, bool(flags & WRITE), bool(flags & FETCH))
         
         # Log event
-        msg = f"Access Page {page}: "
         if result['tlb_hit']:
-            msg += "TLB Hit ✓"
+            outcome = TLB_HIT
         elif result['page_fault']:
-            msg += f"Page Fault ✗"
-            if result['victim']:
-                msg += f" (Replaced {result['victim']})"
+            outcome = PAGE_FAULT
         else:
-            msg += "Page Hit ✓"
+            outcome = PAGE_HIT
+        self.event_log.append(self.current_index, page, outcome, result['frame'], result['victim'])
+        self.log_view.schedule_refresh()
         
-        self.log_event(msg)
-        
-        # Update displays
-        self.memory_view.draw_memory(result['frame'])
-        self.tlb_view.update_display()
-        self.page_table_view.update_display()
-        self.swap_view.update_display()
+        # Update displays with just what this access changed
+        self.memory_view.apply_access(result)
+        self.tlb_view.apply_access(result)
+        self.page_table_view.apply_access(result)
+        self.swap_view.apply_access(result)
         self.update_metrics()
         
         self.current_index += 1
-        self.after(self.animation_speed, self.run_step)
+        if self.snapshots.due(self.current_index):
+            self.snapshots.record(self.memory_manager, self.current_index)
+        self.step_job = self.after(self.animation_speed, self.run_step)
+    
+    def start_turbo(self):
+        """Run the remaining references on a worker thread"""
+        self.turbo = TurboRunner(self.memory_manager, self.reference_pages,
+                                 self.current_index, self.turbo_lock, self.reference_writes,
+                                 self.snapshots)
+        self.turbo.start()
+        self.drain_turbo()
+    
+    def drain_turbo(self):
+        """Fold every finished chunk into one redraw, then reschedule"""
+        self.step_job = None
+        runner = self.turbo
+        if runner is None:
+            return
+        
+        done = False
+        steps = 0
+        last_frame = None
+        while True:
+            try:
+                item = runner.results.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                done = True
+                break
+            end_index, chunk, outcomes, frames, chunk_victims = item
+            self.current_index = end_index
+            steps += len(chunk)
+            self.event_log.extend(end_index - len(chunk), chunk, outcomes, frames, chunk_victims)
+            last_frame = frames[-1]
+        
+        if steps:
+            with self.turbo_lock:
+                self.memory_view.repaint(last_frame)
+                self.tlb_view.update_display()
+                self.page_table_view.update_display()
+                self.swap_view.sync()
+                self.update_metrics()
+            self.log_view.schedule_refresh()
+        
+        if done:
+            self.turbo = None
+            if self.current_index >= len(self.reference_pages):
+                self.is_running = False
+                self.log_event("Simulation completed!")
+            return
+        if self.is_running:
+            self.step_job = self.after(self.TURBO_REFRESH_MS, self.drain_turbo)
+    
+    def stop_turbo(self):
+        """Cancel a turbo run, waiting for the worker to finish its chunk"""
+        if self.turbo is not None:
+            self.turbo.cancel()
+            self.turbo.join()
+            self.turbo = None
+    
+    def cancel_pending_step(self):
+        """Drop the scheduled step or redraw, if any"""
+        if self.step_job is not None:
+            self.after_cancel(self.step_job)
+            self.step_job = None
     
     def pause_simulation(self):
         """Pause simulation"""
         self.is_running = False
+        self.cancel_pending_step()
+        if self.turbo:
+            self.turbo.pause()
+            # Show everything finished before the pause took effect
+            self.drain_turbo()
         self.log_event("Simulation paused")
     
     def reset_simulation(self):
         """Reset simulation"""
         self.is_running = False
+        self.cancel_pending_step()
+        self.stop_turbo()
         self.current_index = 0
         self.memory_manager.reset()
+        self.snapshots.clear()
+        self.refresh_views()
         
+        self.event_log.clear()
+        self.log_event("Simulation reset")
+    
+    def can_step_back(self):
+        """True if a run has been started and is past its first reference"""
+        return len(self.snapshots) > 0 and self.current_index > 0
+    
+    def step_back(self):
+        """Undo the last reference"""
+        if self.can_step_back():
+            self.goto_step(self.current_index - 1)
+    
+    def goto_step(self, step):
+        """Pause and show the state after step references
+        
+        The nearest earlier snapshot is restored and only the references
+        after it are simulated again.
+        """
+        if not self.snapshots:
+            return
+        step = max(0, min(step, len(self.reference_pages)))
+        self.is_running = False
+        self.cancel_pending_step()
+        self.stop_turbo()
+        with self.turbo_lock:
+            start = rewind(self.memory_manager, self.snapshots, step,
+                           self.reference_pages, self.reference_writes)
+        self.current_index = step
+        self.refresh_views()
+        self.log_event(f"Moved to step {step} (replayed {step - start} from snapshot {start})")
+    
+    def refresh_views(self):
+        """Redraw every view from scratch"""
         self.memory_view.draw_memory()
         self.tlb_view.update_display()
         self.page_table_view.update_display()
         self.swap_view.update_display()
         self.update_metrics()
-        
-        self.log_text.delete(1.0, tk.END)
-        self.log_event("Simulation reset")
     
     def update_metrics(self):
         """Update metrics display"""
@@ -190,8 +361,15 @@ class MainWindow(tk.Tk):
         self.metric_labels['tlb_hit_ratio'].config(text=f"{metrics['tlb_hit_ratio']:.2f}")
         self.metric_labels['swap_ins'].config(text=str(metrics['swap_ins']))
         self.metric_labels['swap_outs'].config(text=str(metrics['swap_outs']))
+        self.metric_labels['clean_evictions'].config(text=str(metrics['clean_evictions']))
+        self.metric_labels['dirty_evictions'].config(text=str(metrics['dirty_evictions']))
+        
+        self.metric_labels['eat_ns'].config(text=f"{metrics['eat_ns']:,.1f}")
+        for key in ('time_tlb_ns', 'time_memory_ns', 'time_walk_ns', 'time_swap_in_ns',
+                    'time_swap_out_ns', 'latency_p50_ns', 'latency_p99_ns'):
+            self.metric_labels[key].config(text=f"{metrics[key]:,.0f}")
     
     def log_event(self, message):
         """Add message to log"""
-        self.log_text.insert(tk.END, f"{message}\n")
-        self.log_text.see(tk.END)
+        self.event_log.add_message(self.current_index, message)
+        self.log_view.schedule_refresh()
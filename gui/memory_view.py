@@ -7,6 +7,9 @@ class MemoryView(tk.Frame):
         self.canvas = tk.Canvas(self, bg='white', highlightthickness=0)
         self.canvas.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         self.memory_manager = None
+        # Canvas item ids per frame: (rectangle, frame label, page text)
+        self.items = []
+        self.highlight_frame = None
     
     def set_memory_manager(self, mm):
         """Set memory manager reference"""
@@ -19,10 +22,11 @@ class MemoryView(tk.Frame):
             return
         
         self.canvas.delete("all")
+        self.items = []
+        self.highlight_frame = highlight_frame
         
         num_frames = self.memory_manager.num_frames
         cols = 4
-        rows = (num_frames + cols - 1) // cols
         
         block_width = 150
         block_height = 70
@@ -37,23 +41,57 @@ class MemoryView(tk.Frame):
             x2 = x1 + block_width
             y2 = y1 + block_height
             
-            page = self.memory_manager.physical_memory[i]
+            rect = self.canvas.create_rectangle(x1, y1, x2, y2, outline='#7f8c8d', width=2)
             
-            if page is None:
-                color = '#ecf0f1'
-                text = 'Empty'
-                text_color = '#95a5a6'
-            else:
-                color = '#3498db' if i != highlight_frame else '#27ae60'
-                text = f'Page {page}'
-                text_color = 'white'
+            label = self.canvas.create_text(x1 + 10, y1 + 10, text=f'Frame {i}',
+                                           anchor='nw', font=('Arial', 9, 'bold'))
             
-            self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, 
-                                        outline='#7f8c8d', width=2)
+            text = self.canvas.create_text((x1 + x2) / 2, (y1 + y2) / 2,
+                                          font=('Arial', 12, 'bold'))
             
-            self.canvas.create_text(x1 + 10, y1 + 10, text=f'Frame {i}',
-                                   anchor='nw', font=('Arial', 9, 'bold'),
-                                   fill=text_color)
-            
-            self.canvas.create_text((x1 + x2) / 2, (y1 + y2) / 2, text=text,
-                                   font=('Arial', 12, 'bold'), fill=text_color)
+            self.items.append((rect, label, text))
+            self.paint_frame(i)
+    
+    def paint_frame(self, i):
+        """Recolor and relabel one frame from the current memory contents"""
+        page = self.memory_manager.physical_memory[i]
+        
+        if page is None:
+            color = '#ecf0f1'
+            text = 'Empty'
+            text_color = '#95a5a6'
+        else:
+            color = '#3498db' if i != self.highlight_frame else '#27ae60'
+            text = f'Page {page}'
+            text_color = 'white'
+        
+        rect, label, page_text = self.items[i]
+        self.canvas.itemconfigure(rect, fill=color)
+        self.canvas.itemconfigure(label, fill=text_color)
+        self.canvas.itemconfigure(page_text, text=text, fill=text_color)
+    
+    def repaint(self, highlight_frame=None):
+        """Refresh every frame's colors and labels without recreating items"""
+        if not self.memory_manager:
+            return
+        if len(self.items) != self.memory_manager.num_frames:
+            self.draw_memory(highlight_frame)
+            return
+        self.highlight_frame = highlight_frame
+        for i in range(len(self.items)):
+            self.paint_frame(i)
+    
+    def apply_access(self, result):
+        """Update only the frames touched by one access_page result"""
+        if not self.memory_manager:
+            return
+        if len(self.items) != self.memory_manager.num_frames:
+            self.draw_memory(result['frame'])
+            return
+        
+        previous = self.highlight_frame
+        self.highlight_frame = result['frame']
+        if previous is not None and previous != self.highlight_frame:
+            self.paint_frame(previous)
+        if self.highlight_frame is not None:
+            self.paint_frame(self.highlight_frame)
@@ -7,10 +7,14 @@ class PageTableView(tk.Frame):
         super().__init__(parent, bg='white')
         self.create_table()
         self.memory_manager = None
+        # page -> Treeview item id
+        self.rows = {}
+        # Replacer's bits_cleared count the Referenced column reflects
+        self.bits_cleared = 0
     
     def create_table(self):
         """Create page table"""
-        columns = ('Page Number', 'Frame Number', 'Valid')
+        columns = ('Page Number', 'Frame Number', 'Valid', 'Referenced', 'Dirty')
         self.tree = ttk.Treeview(self, columns=columns, show='headings', height=15)
         
         for col in columns:
@@ -35,7 +39,52 @@ class PageTableView(tk.Frame):
         
         for item in self.tree.get_children():
             self.tree.delete(item)
+        self.rows = {}
         
-        mappings = self.memory_manager.page_table.get_all_mappings()
-        for page, frame in mappings:
-            self.tree.insert('', tk.END, values=(page, frame, '✓'))
+        page_table = self.memory_manager.page_table
+        self.bits_cleared = self._replacer_bits_cleared()
+        for page, frame in page_table.get_all_mappings():
+            self.rows[page] = self.tree.insert('', tk.END, values=(
+                page, frame, '✓', '✓' if page_table.is_referenced(page) else '',
+                '✓' if page_table.is_dirty(page) else ''))
+    
+    def _replacer_bits_cleared(self):
+        """Referenced bits the replacer has cleared in CLOCK sweeps (0 if it never does)"""
+        return getattr(self.memory_manager.replacer, 'bits_cleared', 0)
+    
+    def apply_access(self, result):
+        """Update only the rows touched by one access_page result"""
+        if not self.memory_manager:
+            return
+        
+        self._apply_rows(result)
+        if result['tick']:
+            # The tick after this access cleared every referenced bit
+            self.bits_cleared = self._replacer_bits_cleared()
+            for item in self.rows.values():
+                self.tree.set(item, 'Referenced', '')
+    
+    def _apply_rows(self, result):
+        """Rows of the accessed page and the victim, plus bits a sweep cleared"""
+        page = result['page']
+        page_table = self.memory_manager.page_table
+        dirty = '✓' if page_table.is_dirty(page) else ''
+        if not result['page_fault']:
+            if page in self.rows:
+                self.tree.set(self.rows[page], 'Referenced', '✓')
+                if result['write']:
+                    self.tree.set(self.rows[page], 'Dirty', dirty)
+            return
+        
+        item = self.rows.pop(result['victim'], None)
+        if item is not None:
+            self.tree.delete(item)
+        bits_cleared = self._replacer_bits_cleared()
+        if bits_cleared != self.bits_cleared:
+            # The victim's CLOCK sweep cleared referenced bits on its way
+            self.bits_cleared = bits_cleared
+            for other, item in self.rows.items():
+                self.tree.set(item, 'Referenced', '✓' if page_table.is_referenced(other) else '')
+        
+        if page not in self.rows:
+            self.rows[page] = self.tree.insert('', tk.END, values=(page, result['frame'], '✓', '✓', dirty))
@@ -7,6 +7,8 @@ class SwapView(tk.Frame):
         super().__init__(parent, bg='white')
         self.create_widgets()
         self.memory_manager = None
+        # Pages already listed, in swap-space order
+        self.listed = set()
     
     def create_widgets(self):
         """Create swap space widgets"""
@@ -31,7 +33,30 @@ class SwapView(tk.Frame):
             return
         
         self.listbox.delete(0, tk.END)
+        self.listed = set()
         
         pages = self.memory_manager.swap_space.get_pages_on_disk()
         for page in pages:
             self.listbox.insert(tk.END, f"Page {page}")
+            self.listed.add(page)
+    
+    def apply_access(self, result):
+        """Append the page written back by one access_page result, if new"""
+        if not self.memory_manager:
+            return
+        
+        if result['victim_dirty']:
+            self.add_pages([result['victim']])
+    
+    def sync(self):
+        """Append every page that reached swap since the last update"""
+        if not self.memory_manager:
+            return
+        self.add_pages(self.memory_manager.swap_space.get_pages_on_disk(start=len(self.listed)))
+    
+    def add_pages(self, pages):
+        """Append swapped-out pages that are not listed yet"""
+        for page in pages:
+            if page not in self.listed:
+                self.listbox.insert(tk.END, f"Page {page}")
+                self.listed.add(page)
@@ -1,5 +1,6 @@
 import tkinter as tk
 from tkinter import ttk
+from simulator.tlb import TLB
 
 class TLBView(tk.Frame):
     """TLB display"""
@@ -7,6 +8,9 @@ class TLBView(tk.Frame):
         super().__init__(parent, bg='white')
         self.create_table()
         self.memory_manager = None
+        # page -> Treeview item id, rows kept in LRU to MRU order
+        self.rows = {}
+        self.next_entry = 0
     
     def create_table(self):
         """Create TLB table"""
@@ -35,7 +39,37 @@ class TLBView(tk.Frame):
         
         for item in self.tree.get_children():
             self.tree.delete(item)
+        self.rows = {}
+        self.next_entry = 0
         
-        entries = self.memory_manager.tlb.get_entries()
-        for idx, (page, frame) in enumerate(entries):
-            self.tree.insert('', tk.END, values=(idx, page, frame))
+        for page, frame in self.memory_manager.tlb.get_entries():
+            self._add_row(page, frame)
+    
+    def _add_row(self, page, frame):
+        """Append a row for a newly cached page"""
+        self.rows[page] = self.tree.insert('', tk.END, values=(self.next_entry, page, frame))
+        self.next_entry += 1
+    
+    def _remove_row(self, page):
+        item = self.rows.pop(page, None)
+        if item is not None:
+            self.tree.delete(item)
+    
+    def apply_access(self, result):
+        """Update only the rows touched by one access_page result"""
+        if not self.memory_manager:
+            return
+        if not isinstance(self.memory_manager.tlb, TLB):
+            # Entries of a TLB hierarchy move between levels; redraw
+            self.update_display()
+            return
+        
+        self._remove_row(result['victim'])
+        self._remove_row(result['tlb_evicted'])
+        
+        page = result['page']
+        item = self.rows.get(page)
+        if item is None:
+            self._add_row(page, result['frame'])
+        else:
+            self.tree.move(item, '', tk.END)
@@ -0,0 +1,85 @@
+import queue
+import threading
+import time
+from simulator.checkpoint import save_state
+
+class TurboRunner(threading.Thread):
+    """Runs a reference string on a worker thread, in chunks
+    
+    Each chunk is simulated with MemoryManager.access_many while holding
+    lock; its (end_index, pages, outcomes, frames, victims) is then put on
+    results. A None item marks the end of the run (finished or cancelled).
+    The GUI drains the queue on its own schedule and takes the same lock
+    while reading simulator state for redraws. With a SnapshotHistory,
+    the state after a chunk is recorded whenever one is due, as long as
+    snapshots stay within SNAPSHOT_SHARE of the time spent simulating. It
+    is serialized outside the lock, since only this thread changes it.
+    """
+    CHUNK_SIZE = 2048
+    SNAPSHOT_SHARE = 0.2
+    
+    def __init__(self, memory_manager, pages, start_index, lock, writes=None, snapshots=None):
+        super().__init__(daemon=True)
+        self.memory_manager = memory_manager
+        self.pages = pages
+        self.writes = writes
+        self.snapshots = snapshots
+        self.simulated = 0.0        # Seconds simulated since the last snapshot
+        self.snapshot_cost = 0.0    # Seconds the last snapshot took
+        self.index = start_index
+        self.lock = lock
+        self.results = queue.Queue()
+        self._running = threading.Event()
+        self._running.set()
+        self._cancelled = threading.Event()
+    
+    def run(self):
+        """Simulate chunks until the trace ends or the run is cancelled"""
+        try:
+            while self.index < len(self.pages):
+                self._running.wait()
+                if self._cancelled.is_set():
+                    break
+                end = self.index + self.CHUNK_SIZE
+                chunk = self.pages[self.index:end]
+                writes = self.writes[self.index:end] if self.writes is not None else None
+                start = time.perf_counter()
+                with self.lock:
+                    outcomes, frames, victims = self.memory_manager.access_many(chunk, writes=writes)
+                    self.index += len(chunk)
+                self.simulated += time.perf_counter() - start
+                if self.snapshot_due():
+                    self.take_snapshot()
+                self.results.put((self.index, chunk, outcomes, frames, victims))
+        finally:
+            self.results.put(None)
+    
+    def snapshot_due(self):
+        snapshots = self.snapshots
+        return (snapshots is not None and snapshots.due(self.index)
+                and self.simulated * self.SNAPSHOT_SHARE >= self.snapshot_cost)
+    
+    def take_snapshot(self):
+        start = time.perf_counter()
+        state = save_state(self.memory_manager)
+        with self.lock:
+            self.snapshots.add(self.index, state)
+        self.snapshot_cost = time.perf_counter() - start
+        self.simulated = 0.0
+    
+    def pause(self):
+        """Stop after the current chunk"""
+        self._running.clear()
+    
+    def resume(self):
+        """Continue a paused run"""
+        self._running.set()
+    
+    def cancel(self):
+        """End the run; the worker exits after the current chunk"""
+        self._cancelled.set()
+        self._running.set()
+    
+    @property
+    def paused(self):
+        return not self._running.is_set()
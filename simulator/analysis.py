@@ -0,0 +1,141 @@
+"""
+Single-pass miss-ratio analysis
+
+LRU and OPT are stack algorithms: a reference hits in a memory of k frames
+exactly when its stack distance is at most k. Computing every reference's
+distance once therefore gives the fault count for every frame count.
+"""
+
+from array import array
+
+from .page_replacement import OptimalReplacer
+
+COLD = 0  # Distance recorded for first references (a fault at any size)
+# Default cap on the curves' frame count; OPT costs O(max_frames) per reference
+DEFAULT_MAX_FRAMES = 256
+
+class FenwickTree:
+    """Binary indexed tree over positions 1..size"""
+    def __init__(self, size):
+        self.size = size
+        self.tree = array('l', [0]) * (size + 1)
+    
+    def add(self, i, delta):
+        """Add delta at position i"""
+        tree = self.tree
+        while i <= self.size:
+            tree[i] += delta
+            i += i & -i
+    
+    def prefix(self, i):
+        """Sum of positions 1..i"""
+        tree = self.tree
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+def lru_stack_distances(pages):
+    """LRU stack distance of every reference, O(n log n)
+    
+    The tree marks the last access time of each page, so the number of
+    distinct pages touched since page's previous access is a range sum.
+    """
+    n = len(pages)
+    tree = FenwickTree(n)
+    last_access = {}
+    distances = array('q', [COLD]) * n
+    
+    for t, page in enumerate(pages, 1):
+        prev = last_access.get(page)
+        if prev is not None:
+            distances[t - 1] = tree.prefix(t - 1) - tree.prefix(prev) + 1
+            tree.add(prev, -1)
+        tree.add(t, 1)
+        last_access[page] = t
+    
+    return distances
+
+def opt_stack_distances(pages, max_depth):
+    """OPT stack distance of every reference (Mattson's priority stack)
+    
+    Pages are ordered so the top k entries are what OPT keeps in k frames.
+    The stack is capped at max_depth, so each reference costs O(max_depth);
+    deeper references are reported as COLD (a fault for every size up to
+    max_depth).
+    """
+    next_use = OptimalReplacer._build_next_use(pages)
+    priority = {}
+    stack = []
+    distances = array('q', [COLD]) * len(pages)
+    
+    for t, page in enumerate(pages):
+        priority[page] = next_use[t]
+        try:
+            depth = stack.index(page)
+        except ValueError:
+            depth = None
+        
+        if depth == 0:
+            distances[t] = 1
+            continue
+        
+        if depth is None:
+            end = len(stack)
+        else:
+            distances[t] = depth + 1
+            end = depth
+        
+        if not stack:
+            stack.append(page)
+            continue
+        
+        # The displaced top sinks until it meets a page used later than itself
+        carry = stack[0]
+        stack[0] = page
+        for i in range(1, end):
+            resident = stack[i]
+            if priority[resident] > priority[carry]:
+                stack[i] = carry
+                carry = resident
+        
+        if depth is not None:
+            stack[depth] = carry
+        elif len(stack) < max_depth:
+            stack.append(carry)
+    
+    return distances
+
+def fault_curve(distances, max_frames):
+    """Fault count for 1..max_frames frames from stack distances"""
+    histogram = [0] * (max_frames + 1)
+    for d in distances:
+        if d <= max_frames:
+            histogram[d] += 1
+    
+    # With k frames, every reference at distance 1..k hits
+    faults = []
+    hits = 0
+    for k in range(1, max_frames + 1):
+        hits += histogram[k]
+        faults.append(len(distances) - hits)
+    return faults
+
+def miss_ratio_curves(pages, max_frames=None):
+    """Fault-count-vs-frames curves for LRU and OPT
+    
+    max_frames defaults to the number of distinct pages, beyond which
+    only cold misses remain, but at most DEFAULT_MAX_FRAMES.
+    """
+    if max_frames is None:
+        max_frames = max(1, min(len(set(pages)), DEFAULT_MAX_FRAMES))
+    
+    lru = fault_curve(lru_stack_distances(pages), max_frames)
+    opt = fault_curve(opt_stack_distances(pages, max_frames), max_frames)
+    return {
+        'frames': list(range(1, max_frames + 1)),
+        'lru_faults': lru,
+        'opt_faults': opt,
+        'total_accesses': len(pages)
+    }
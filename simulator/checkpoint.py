@@ -0,0 +1,249 @@
+"""
+Checkpoint and restore of simulator state
+
+save_state pickles a whole MemoryManager (frame table, page table, TLB
+order, replacer internals, swap contents and counters) and compresses it.
+Optimal's trace is left out, only its position is kept: restore_state
+reuses the trace of the replacer being replaced, or takes future_refs.
+
+SnapshotHistory keeps such states spread over a run, within a byte
+budget, so any earlier step is reached by restoring the nearest one and
+replaying the gap (rewind). Checkpointer writes them to a file for headless runs
+that must survive an interruption.
+"""
+
+import bisect
+import os
+import pickle
+import zlib
+
+from .page_replacement import OptimalReplacer
+from .swap_file import SwapFile
+from .tlb import TLBHierarchy
+
+VERSION = 2
+# Settings a checkpoint must share with the run resuming it (plus the TLB,
+# timing model and swap device)
+CONFIG_KEYS = ('algorithm', 'num_frames', 'page_size', 'page_table_levels',
+               'compact_page_table', 'tick_interval')
+TIMING_KEYS = ('tlb_ns', 'memory_ns', 'walk_level_ns', 'swap_in_ns', 'swap_out_ns',
+               'switch_ns', 'flush_ns')
+
+def save_state(memory_manager):
+    """Serialize the complete state of a MemoryManager to compressed bytes"""
+    return zlib.compress(pickle.dumps(memory_manager, pickle.HIGHEST_PROTOCOL), 1)
+
+def _bare(component):
+    return getattr(component, 'target', component)
+
+def run_config(memory_manager):
+    """Settings of a MemoryManager that a checkpoint records and checks"""
+    config = {name: getattr(memory_manager, name) for name in CONFIG_KEYS}
+    tlb = _bare(memory_manager.tlb)
+    if isinstance(tlb, TLBHierarchy):
+        config['tlb'] = ('TLBHierarchy', tlb.l1d.entries_count, tlb.l1d.ways, tlb.l1d.policy,
+                         tlb.l2.entries_count, tlb.l2.ways, tlb.l2.policy, tlb.use_asid)
+    else:
+        config['tlb'] = (type(tlb).__name__, tlb.size)
+    # Restoring replaces these too, so a resume must not change them silently
+    config['timing'] = tuple(getattr(memory_manager.timing, name) for name in TIMING_KEYS)
+    swap = _bare(memory_manager.swap_space)
+    if isinstance(swap, SwapFile):
+        config['swap'] = ('SwapFile', swap.num_slots, swap.page_size, swap.batch_size)
+    else:
+        config['swap'] = (type(swap).__name__,)
+    return config
+
+def _bind_future(replacer, future_refs, old_replacer=None):
+    """Give a restored Optimal replacer its trace back"""
+    if not isinstance(replacer, OptimalReplacer) or not replacer.future_length:
+        return
+    if (isinstance(old_replacer, OptimalReplacer)
+            and len(old_replacer.next_use) == replacer.future_length):
+        replacer.set_future(old_replacer.future_refs, old_replacer.next_use)
+    elif future_refs is not None and len(future_refs) == replacer.future_length:
+        replacer.set_future(future_refs)
+    else:
+        raise ValueError("Restoring an Optimal simulation needs the trace it was run on")
+
+def load_state(data, future_refs=None):
+    """Rebuild a MemoryManager from save_state bytes"""
+    memory_manager = pickle.loads(zlib.decompress(data))
+    _bind_future(memory_manager.replacer, future_refs)
+    return memory_manager
+
+def restore_state(memory_manager, data, future_refs=None):
+    """Restore save_state bytes into an existing MemoryManager
+    
+    The object itself is kept, so views and runners holding it see the
+    restored state; registered observers stay registered.
+    """
+    old_replacer = _bare(memory_manager.replacer)
+    old_swap = _bare(memory_manager.swap_space)
+    if hasattr(old_swap, 'close'):
+        # A swap file is reopened at its path by the restored state
+        old_swap.close()
+    
+    restored = pickle.loads(zlib.decompress(data))
+    _bind_future(restored.replacer, future_refs, old_replacer)
+    hub = memory_manager.hub
+    memory_manager.__dict__.clear()
+    memory_manager.__dict__.update(restored.__dict__)
+    if hub is not None:
+        memory_manager._wrap(hub)
+
+class SnapshotHistory:
+    """States of one run every interval references, by step
+    
+    With a budget (in bytes), once the stored states outgrow it every
+    other snapshot is dropped, keeping the first and the latest, and the
+    interval doubles. Snapshots then stay spread over the whole run while
+    the number taken grows only logarithmically with its length.
+    """
+    def __init__(self, interval=1000, budget=None):
+        self.base_interval = interval
+        self.budget = budget
+        self.clear()
+    
+    def __len__(self):
+        return len(self.steps)
+    
+    def clear(self, interval=None):
+        """Drop every snapshot; interval, if given, is the new starting spacing"""
+        if interval is not None:
+            self.base_interval = interval
+        self.interval = self.base_interval
+        self.steps = []             # Sorted steps that have a snapshot
+        self.states = {}            # step -> save_state bytes
+        self.size = 0               # Total bytes in states
+    
+    def due(self, step):
+        """True if step is interval or more past the latest snapshot"""
+        return not self.steps or step - self.steps[-1] >= self.interval
+    
+    def record(self, memory_manager, step):
+        """Snapshot the state after step references"""
+        self.add(step, save_state(memory_manager))
+    
+    def add(self, step, state):
+        """Keep save_state bytes taken after step references"""
+        old = self.states.get(step)
+        if old is None:
+            bisect.insort(self.steps, step)
+        else:
+            self.size -= len(old)
+        self.states[step] = state
+        self.size += len(state)
+        if self.budget is not None:
+            while self.size > self.budget and len(self.steps) > 2:
+                self._thin()
+    
+    def _thin(self):
+        """Drop every other snapshot and double the interval"""
+        steps = self.steps
+        keep = steps[::2]
+        if keep[-1] != steps[-1]:
+            keep.append(steps[-1])
+        for step in steps[1::2]:
+            if step != steps[-1]:
+                self.size -= len(self.states.pop(step))
+        self.steps = keep
+        self.interval *= 2
+    
+    def nearest(self, step):
+        """(snapshot step, state) of the latest snapshot at or before step, or None"""
+        i = bisect.bisect_right(self.steps, step)
+        if i == 0:
+            return None
+        return self.steps[i - 1], self.states[self.steps[i - 1]]
+    
+    def bytes_used(self):
+        """Total size of the stored states"""
+        return self.size
+
+def rewind(memory_manager, history, step, pages, writes=None):
+    """Put memory_manager in its state after step references of pages
+    
+    Restores the nearest snapshot at or before step and replays the
+    references in between. Returns the snapshot's step.
+    """
+    snapshot = history.nearest(step)
+    if snapshot is None:
+        raise ValueError(f"No snapshot at or before step {step}")
+    start, state = snapshot
+    restore_state(memory_manager, state, pages)
+    if step > start:
+        memory_manager.access_many(pages[start:step],
+                                   writes=writes[start:step] if writes is not None else None)
+    return start
+
+class Checkpointer:
+    """Periodic checkpoint file for a long headless run
+    
+    The file holds the manager's state, the number of trace references
+    already simulated and a description of the trace. It is replaced
+    atomically, so an interruption leaves the previous checkpoint intact.
+    """
+    def __init__(self, path, every=1000000, resume=False):
+        self.path = path
+        self.every = every
+        # Load the existing checkpoint at the start of the run
+        self.resume = resume
+        self.last = 0
+        self.saves = 0
+    
+    def due(self, position):
+        return position - self.last >= self.every
+    
+    def save(self, memory_manager, position, trace=None):
+        """Write a checkpoint taken after position references of trace"""
+        record = {
+            'version': VERSION,
+            'position': position,
+            'trace': trace,
+            'config': run_config(memory_manager),
+            'state': save_state(memory_manager)
+        }
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(record, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+        self.last = position
+        self.saves += 1
+    
+    def _read(self):
+        """The checkpoint record, or None if no checkpoint file exists"""
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, 'rb') as f:
+            record = pickle.load(f)
+        if record.get('version') != VERSION:
+            raise ValueError(f"Unsupported checkpoint version in {self.path}")
+        return record
+    
+    def position(self):
+        """References covered by the checkpoint file, or None if there is none"""
+        record = self._read()
+        return record['position'] if record is not None else None
+    
+    def load(self, memory_manager, trace=None, future_refs=None):
+        """Restore the checkpoint into memory_manager, returns its position
+        
+        Returns None (and restores nothing) if no checkpoint file exists.
+        Raises ValueError if it was taken on another trace or with other
+        settings (see run_config).
+        """
+        record = self._read()
+        if record is None:
+            return None
+        if trace is not None and record['trace'] != trace:
+            raise ValueError(f"Checkpoint {self.path} was taken on {record['trace']}, not {trace}")
+        
+        saved = record['config']
+        for name, value in run_config(memory_manager).items():
+            if saved.get(name) != value:
+                raise ValueError(f"Checkpoint {self.path} has {name}={saved.get(name)}, "
+                                 f"this run {value}")
+        restore_state(memory_manager, record['state'], future_refs)
+        self.last = record['position']
+        return record['position']
@@ -0,0 +1,208 @@
+"""
+Command-line entry point for headless simulation runs
+"""
+
+import argparse
+import sys
+
+from .checkpoint import Checkpointer
+from .engine import SimulationEngine, format_metrics, format_curves, format_processes
+from .event_log import EventLog
+from .multiprocess import MultiProcessManager, POLICIES
+from .observer import BinaryTraceSink, PhaseTimer
+from .swap_file import SwapFile
+from .timing import TimingModel
+from .tlb import SetAssociativeTLB, TLBHierarchy
+from .trace_reader import FORMATS, TAGGED
+
+ALGORITHMS = ['FIFO', 'LRU', 'LFU', 'Optimal', 'ARC', '2Q', 'LIRS',
+              'CLOCK', 'SecondChance', 'NRU', 'Aging']
+
+def parse_levels(text):
+    """Parse '9,9,9,9' into a tuple of level bit widths"""
+    try:
+        return tuple(int(bits) for bits in text.split(','))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid level split: {text!r}")
+
+def build_parser():
+    """Create argument parser"""
+    parser = argparse.ArgumentParser(
+        prog='python -m simulator',
+        description='Run a page reference trace through the virtual memory simulator.'
+    )
+    parser.add_argument('trace', help='trace file')
+    parser.add_argument('-i', '--trace-format', choices=FORMATS + (TAGGED,), default='pages',
+                        help="trace file format (default: page numbers); 'tagged' runs a "
+                             "multi-process simulation over 'PID PAGE' lines")
+    parser.add_argument('-a', '--algorithm', choices=ALGORITHMS, default='LRU')
+    parser.add_argument('-f', '--frames', type=int, default=16, help='number of physical frames')
+    parser.add_argument('-t', '--tlb-size', type=int, default=8, help='number of TLB entries')
+    parser.add_argument('-p', '--page-size', type=int, default=4096, help='page size in bytes')
+    parser.add_argument('-l', '--levels', type=parse_levels,
+                        help='multi-level page table bits per level, e.g. 9,9,9,9')
+    parser.add_argument('--compact-page-table', action='store_true',
+                        help='use the array-backed single-level page table')
+    parser.add_argument('--replacement', choices=POLICIES, default='global',
+                        help="multi-process frame replacement scope (default: global); 'ws' "
+                             "and 'pff' size each resident set at run time")
+    parser.add_argument('--quota', type=int,
+                        help='frames per process under local replacement')
+    parser.add_argument('--window', type=int,
+                        help='working-set window in references; tracks working sets and '
+                             'thrashing, required by --replacement ws')
+    parser.add_argument('--pff-threshold', type=int,
+                        help='fault gap in references below which PFF grows a resident set')
+    parser.add_argument('--sample-interval', type=int, default=1000,
+                        help='record the combined working-set size every N accesses (default: 1000)')
+    parser.add_argument('--tick-interval', type=int, default=0,
+                        help='clear referenced bits every N accesses (default: never)')
+    parser.add_argument('--curve', action='store_true',
+                        help='output LRU and OPT fault counts for every frame count instead of metrics')
+    parser.add_argument('--max-frames', type=int,
+                        help='largest frame count on the curve (default: distinct pages, at most 256)')
+    parser.add_argument('--swap-file', metavar='PATH',
+                        help='use a memory-mapped swap file at PATH instead of the in-memory swap')
+    parser.add_argument('--swap-slots', type=int, default=1 << 16,
+                        help='page-sized slots in the swap file (default: 65536)')
+    parser.add_argument('--swap-batch', type=int, default=0,
+                        help='group this many write-outs into clustered writes (default: off)')
+    tlb = parser.add_argument_group('TLB hierarchy (replaces the single --tlb-size TLB)')
+    tlb.add_argument('--tlb-hierarchy', action='store_true',
+                     help='use set-associative L1 instruction/data TLBs and a shared L2')
+    tlb.add_argument('--l1-entries', type=int, default=64, help='entries per L1 TLB (default: 64)')
+    tlb.add_argument('--l1-ways', type=int, default=4, help='L1 associativity (default: 4)')
+    tlb.add_argument('--l2-entries', type=int, default=1536, help='L2 TLB entries (default: 1536)')
+    tlb.add_argument('--l2-ways', type=int, default=12, help='L2 associativity (default: 12)')
+    tlb.add_argument('--l1-policy', choices=SetAssociativeTLB.POLICIES, default='LRU')
+    tlb.add_argument('--l2-policy', choices=SetAssociativeTLB.POLICIES, default='LRU')
+    tlb.add_argument('--asid', action='store_true',
+                     help='tag TLB entries with address-space ids instead of flushing on switches')
+    timing = parser.add_argument_group('timing model (nanoseconds)')
+    timing.add_argument('--tlb-ns', type=float, default=1, help='TLB lookup (default: 1)')
+    timing.add_argument('--memory-ns', type=float, default=100, help='memory access (default: 100)')
+    timing.add_argument('--walk-ns', type=float, default=100,
+                        help='each page-table walk level (default: 100)')
+    timing.add_argument('--swap-in-ns', type=float, default=8000000, help='swap-in (default: 8000000)')
+    timing.add_argument('--swap-out-ns', type=float, default=8000000, help='swap-out (default: 8000000)')
+    timing.add_argument('--switch-ns', type=float, default=2000,
+                        help='each context switch, tagged traces only (default: 2000)')
+    timing.add_argument('--flush-ns', type=float, default=100,
+                        help='TLB flush on a switch without --asid (default: 100)')
+    parser.add_argument('--event-log', metavar='PATH',
+                        help='stream a CSV record of every access to PATH')
+    parser.add_argument('--event-trace', metavar='PATH',
+                        help='write every TLB, walk, fault, victim and swap event to PATH '
+                             '(17-byte binary records, see simulator.observer)')
+    parser.add_argument('--phase-times', action='store_true',
+                        help='add seconds spent in the TLB, page table, replacer and swap to the metrics')
+    parser.add_argument('--checkpoint', metavar='PATH',
+                        help='save the simulator state to PATH periodically during the run')
+    parser.add_argument('--checkpoint-every', type=int, default=1000000,
+                        help='references between checkpoints (default: 1000000)')
+    parser.add_argument('--resume', action='store_true',
+                        help='continue from the --checkpoint file, if it exists')
+    parser.add_argument('--format', choices=['json', 'csv'], default='json', help='output format')
+    parser.add_argument('-o', '--output', help='write metrics to this file instead of stdout')
+    return parser
+
+def main(argv=None):
+    """Run simulation from command-line arguments"""
+    args = build_parser().parse_args(argv)
+    
+    swap = None
+    if args.swap_file:
+        swap = SwapFile(args.swap_file, num_slots=args.swap_slots,
+                        page_size=args.page_size, batch_size=args.swap_batch)
+    
+    tlb = None
+    if args.tlb_hierarchy:
+        tlb = TLBHierarchy(args.l1_entries, args.l1_ways, args.l2_entries, args.l2_ways,
+                           args.l1_policy, args.l2_policy, use_asid=args.asid)
+    
+    timing = TimingModel(args.tlb_ns, args.memory_ns, args.walk_ns,
+                         args.swap_in_ns, args.swap_out_ns, args.switch_ns, args.flush_ns)
+    
+    if args.trace_format == TAGGED:
+        manager = MultiProcessManager(
+            num_frames=args.frames,
+            page_size=args.page_size,
+            tlb_size=args.tlb_size,
+            algorithm=args.algorithm,
+            policy=args.replacement,
+            quota=args.quota,
+            page_table_levels=args.levels,
+            compact_page_table=args.compact_page_table,
+            swap_space=swap,
+            timing=timing,
+            tlb=tlb,
+            tick_interval=args.tick_interval,
+            window=args.window,
+            pff_threshold=args.pff_threshold,
+            sample_interval=args.sample_interval
+        )
+        try:
+            metrics = manager.run_file(args.trace)
+        finally:
+            if swap:
+                swap.close()
+        return _write_output(args, format_processes(metrics, manager.process_metrics(), args.format,
+                                                    manager.wss_history()))
+    
+    engine = SimulationEngine(
+        num_frames=args.frames,
+        page_size=args.page_size,
+        tlb_size=args.tlb_size,
+        algorithm=args.algorithm,
+        page_table_levels=args.levels,
+        compact_page_table=args.compact_page_table,
+        swap_space=swap,
+        tick_interval=args.tick_interval,
+        tlb=tlb,
+        timing=timing
+    )
+    if args.curve:
+        curves = engine.fault_curves_file(args.trace, args.trace_format, args.max_frames)
+        text = format_curves(curves, args.format)
+    else:
+        resume_at = None
+        if args.checkpoint:
+            engine.checkpointer = Checkpointer(args.checkpoint, args.checkpoint_every, args.resume)
+            if args.resume:
+                resume_at = engine.checkpointer.position()
+        if args.event_log:
+            # Records go straight to the file; nothing needs to stay buffered.
+            # A resumed run continues the rows exported up to its checkpoint
+            engine.event_log = EventLog(capacity=1)
+            engine.event_log.start_export(args.event_log, resume_at)
+        event_trace = timer = None
+        if args.event_trace:
+            event_trace = BinaryTraceSink(args.event_trace)
+            engine.memory_manager.add_observer(event_trace)
+        if args.phase_times:
+            timer = PhaseTimer()
+            engine.memory_manager.add_observer(timer)
+        try:
+            metrics = engine.run_file(args.trace, args.trace_format)
+        finally:
+            if engine.event_log is not None:
+                engine.event_log.stop_export()
+            if event_trace:
+                event_trace.close()
+            if swap:
+                # Resuming replaces the swap device with the checkpoint's
+                engine.memory_manager.swap_space.close()
+        if timer:
+            for phase, stats in timer.report().items():
+                metrics[f'phase_{phase}_seconds'] = stats['seconds']
+        text = format_metrics(metrics, args.format)
+    return _write_output(args, text)
+
+def _write_output(args, text):
+    """Write text to --output or stdout"""
+    if args.output:
+        with open(args.output, 'w', newline='') as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text if text.endswith('\n') else text + '\n')
+    return 0
@@ -0,0 +1,155 @@
+import csv
+import io
+import json
+import os
+
+from .analysis import miss_ratio_curves
+from .memory_manager import MemoryManager
+from .preprocess import collapse_runs
+from .tlb import TLB
+from .trace_reader import DEFAULT_CHUNK_SIZE, iter_chunks, read_pages, read_references
+
+class SimulationEngine:
+    """Headless driver that runs a whole trace through a MemoryManager"""
+    def __init__(self, num_frames=16, page_size=4096, tlb_size=8, algorithm='LRU',
+                 page_table_levels=None, compact_page_table=False, collapse=True,
+                 swap_space=None, timing=None, tick_interval=0, tlb=None):
+        # Collapse repeated references into runs before simulating them
+        self.collapse = collapse
+        # Optional EventLog receiving a record per access
+        self.event_log = None
+        # Optional checkpoint.Checkpointer saving progress through run_file
+        self.checkpointer = None
+        self.memory_manager = MemoryManager(
+            num_frames=num_frames,
+            page_size=page_size,
+            tlb_size=tlb_size,
+            algorithm=algorithm,
+            page_table_levels=page_table_levels,
+            compact_page_table=compact_page_table,
+            swap_space=swap_space,
+            timing=timing,
+            tick_interval=tick_interval,
+            tlb=tlb
+        )
+    
+    def run(self, pages, writes=None):
+        """Simulate every reference in pages, returns metrics
+        
+        writes optionally flags which references are writes.
+        """
+        mm = self.memory_manager
+        mm.reset()
+        mm.initialize_replacer(pages)
+        self.feed(pages, writes)
+        return mm.get_metrics()
+    
+    def run_file(self, path, fmt='pages'):
+        """Stream a trace file through the simulator, returns metrics
+        
+        With a checkpointer, progress is saved between chunks, and a
+        resuming checkpointer first restores its last checkpoint and skips
+        the references it already covers.
+        """
+        mm = self.memory_manager
+        checkpointer = self.checkpointer
+        future_refs = None
+        if mm.algorithm == 'Optimal':
+            # Optimal needs the whole future; keep it as one compact array
+            future_refs, all_writes = read_references(path, fmt, mm.page_size)
+            if checkpointer is None:
+                return self.run(future_refs, all_writes)
+            chunks = ((future_refs[i:i + DEFAULT_CHUNK_SIZE],
+                       all_writes[i:i + DEFAULT_CHUNK_SIZE] if all_writes is not None else None)
+                      for i in range(0, len(future_refs), DEFAULT_CHUNK_SIZE))
+        else:
+            chunks = iter_chunks(path, fmt, mm.page_size)
+        
+        trace = (os.path.abspath(path), fmt)
+        position = None
+        if checkpointer is not None and checkpointer.resume:
+            position = checkpointer.load(mm, trace, future_refs)
+        if position is None:
+            position = 0
+            mm.reset()
+            mm.initialize_replacer(future_refs)
+        
+        done = 0
+        for pages, writes in chunks:
+            done += len(pages)
+            if done <= position:
+                continue
+            if done - len(pages) < position:
+                # Resuming inside this chunk
+                skip = position - (done - len(pages))
+                pages = pages[skip:]
+                writes = writes[skip:] if writes is not None else None
+            self.feed(pages, writes)
+            if checkpointer is not None and checkpointer.due(done):
+                checkpointer.save(mm, done, trace)
+        if checkpointer is not None and checkpointer.last != done:
+            checkpointer.save(mm, done, trace)
+        return mm.get_metrics()
+    
+    def fault_curves(self, pages, max_frames=None):
+        """LRU and OPT fault counts for every frame count, in one pass each"""
+        return miss_ratio_curves(pages, max_frames)
+    
+    def fault_curves_file(self, path, fmt='pages', max_frames=None):
+        """Fault curves for a trace file"""
+        return self.fault_curves(read_pages(path, fmt, self.memory_manager.page_size), max_frames)
+    
+    def feed(self, pages, writes=None):
+        """Access a chunk of pages (and optional write flags) on the current simulation"""
+        mm = self.memory_manager
+        if self.event_log is not None:
+            first_step = mm.total_accesses
+            outcomes, frames, victims = mm.access_many(pages, writes=writes)
+            self.event_log.extend(first_step, pages, outcomes, frames, victims)
+        elif self.collapse and not (writes is not None and (mm.tick_interval or type(mm.tlb) is not TLB)):
+            # (With ticks, where a write falls inside a run decides which
+            # dirty bits a tick sees, and a TLB hierarchy routes fetches and
+            # data separately, so flagged traces are fed uncollapsed)
+            pages, counts, writes = collapse_runs(pages, writes)
+            mm.access_many(pages, record=False, counts=counts, writes=writes)
+        else:
+            mm.access_many(pages, record=False, writes=writes)
+
+def format_metrics(metrics, fmt='json'):
+    """Render a metrics dict as JSON or a one-row CSV"""
+    if fmt == 'json':
+        return json.dumps(metrics, indent=2)
+    if fmt == 'csv':
+        out = io.StringIO()
+        writer = csv.DictWriter(out, fieldnames=list(metrics))
+        writer.writeheader()
+        writer.writerow(metrics)
+        return out.getvalue()
+    raise ValueError(f"Unknown output format: {fmt}")
+
+def format_processes(metrics, processes, fmt='json', wss_over_time=None):
+    """Render multi-process results: totals plus per-process rows as JSON, or one CSV row per process"""
+    if fmt == 'json':
+        out = dict(metrics, per_process=processes)
+        if wss_over_time:
+            out['wss_over_time'] = wss_over_time
+        return json.dumps(out, indent=2)
+    if fmt == 'csv':
+        out = io.StringIO()
+        writer = csv.DictWriter(out, fieldnames=list(processes[0]) if processes else ['pid'])
+        writer.writeheader()
+        writer.writerows(processes)
+        return out.getvalue()
+    raise ValueError(f"Unknown output format: {fmt}")
+
+def format_curves(curves, fmt='json'):
+    """Render fault curves as JSON or CSV with one row per frame count"""
+    if fmt == 'json':
+        return json.dumps(curves, indent=2)
+    if fmt == 'csv':
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(['frames', 'lru_faults', 'opt_faults'])
+        writer.writerows(zip(curves['frames'], curves['lru_faults'], curves['opt_faults']))
+        return out.getvalue()
+    raise ValueError(f"Unknown output format: {fmt}")
@@ -0,0 +1,216 @@
+"""
+Bounded structured event log
+
+Access events are kept as compact records (step, page, outcome, frame,
+victim) in a ring buffer of typed arrays, so memory stays fixed however
+long a run is. Free-text messages share the same sequence as records with
+the MESSAGE outcome. Export streams every record to a CSV file as it is
+appended, so the file holds the full log even after the buffer wraps.
+"""
+
+import csv
+import os
+from array import array
+from collections import deque
+
+from .memory_manager import TLB_HIT, PAGE_HIT, PAGE_FAULT
+
+MESSAGE = 3
+
+EVENT_NAMES = {
+    TLB_HIT: 'TLB Hit',
+    PAGE_HIT: 'Page Hit',
+    PAGE_FAULT: 'Page Fault',
+    MESSAGE: 'Message'
+}
+
+def _truncate_export(path, step):
+    """Cut an export file back to its header and rows before step
+    
+    Returns the bytes kept (0 if there is no usable file). A partial last
+    row from an interrupted run is dropped as well.
+    """
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'r+b') as f:
+        end = 0
+        for i, line in enumerate(f):
+            if not line.endswith(b'\n'):
+                break
+            if i > 0 and int(line.split(b',', 1)[0]) >= step:
+                break
+            end += len(line)
+        f.truncate(end)
+    return end
+
+class EventLog:
+    """Ring buffer of access records and messages"""
+    def __init__(self, capacity=100000):
+        self.capacity = capacity
+        self.steps = array('q', [0]) * capacity
+        self.pages = array('q', [0]) * capacity
+        self.outcomes = array('b', [0]) * capacity
+        self.frames = array('q', [0]) * capacity
+        self.victims = array('q', [0]) * capacity
+        # Text of MESSAGE records, keyed by sequence number
+        self.messages = {}
+        # Sequence number of the next record; the oldest kept is total - len
+        self.total = 0
+        self.export_file = None
+        self.export_writer = None
+        self._filters = {}
+    
+    def __len__(self):
+        return min(self.total, self.capacity)
+    
+    @property
+    def first_seq(self):
+        """Sequence number of the oldest record still buffered"""
+        return self.total - len(self)
+    
+    def append(self, step, page, outcome, frame, victim=-1):
+        """Add one access record"""
+        slot = self.total % self.capacity
+        if self.outcomes[slot] == MESSAGE and self.total >= self.capacity:
+            self.messages.pop(self.total - self.capacity, None)
+        self.steps[slot] = step
+        self.pages[slot] = page
+        self.outcomes[slot] = outcome
+        self.frames[slot] = frame
+        self.victims[slot] = -1 if victim is None else victim
+        self.total += 1
+        if self.export_writer:
+            self._export(self.total - 1, self.total)
+    
+    def add_message(self, step, text):
+        """Add a free-text message"""
+        self.messages[self.total] = text
+        self.append(step, -1, MESSAGE, -1)
+    
+    def extend(self, first_step, pages, outcomes, frames, victims):
+        """Add a batch of consecutive access records (access_many output)"""
+        n = len(pages)
+        if n == 0:
+            return
+        if n > self.capacity:
+            # Only the newest capacity records can be kept
+            skip = n - self.capacity
+            self.total += skip
+            if self.export_writer:
+                self._write_arrays(first_step, pages[:skip], outcomes[:skip],
+                                   frames[:skip], victims[:skip])
+            first_step += skip
+            pages, outcomes = pages[skip:], outcomes[skip:]
+            frames, victims = frames[skip:], victims[skip:]
+            n = self.capacity
+        
+        # Drop texts of messages about to be overwritten
+        new_first = self.total + n - self.capacity
+        for seq in [seq for seq in self.messages if seq < new_first]:
+            del self.messages[seq]
+        
+        done = 0
+        while done < n:
+            slot = (self.total + done) % self.capacity
+            size = min(n - done, self.capacity - slot)
+            self.steps[slot:slot + size] = array('q', range(first_step + done, first_step + done + size))
+            self.pages[slot:slot + size] = array('q', pages[done:done + size])
+            self.outcomes[slot:slot + size] = array('b', outcomes[done:done + size])
+            self.frames[slot:slot + size] = array('q', frames[done:done + size])
+            self.victims[slot:slot + size] = array('q', victims[done:done + size])
+            done += size
+        self.total += n
+        
+        if self.export_writer:
+            self._export(self.total - n, self.total)
+    
+    def record(self, seq):
+        """(step, page, outcome, frame, victim) for a buffered sequence number"""
+        if not self.first_seq <= seq < self.total:
+            raise IndexError(f"Record {seq} is no longer buffered")
+        slot = seq % self.capacity
+        return (self.steps[slot], self.pages[slot], self.outcomes[slot],
+                self.frames[slot], self.victims[slot])
+    
+    def format_record(self, seq):
+        """One display line for a buffered record"""
+        step, page, outcome, frame, victim = self.record(seq)
+        if outcome == MESSAGE:
+            return self.messages.get(seq, '')
+        msg = f"[{step}] Access Page {page}: "
+        if outcome == TLB_HIT:
+            msg += "TLB Hit ✓"
+        elif outcome == PAGE_FAULT:
+            msg += "Page Fault ✗"
+            if victim >= 0:
+                msg += f" (Replaced {victim})"
+        else:
+            msg += "Page Hit ✓"
+        return msg + f" → Frame {frame}"
+    
+    def matching(self, kinds=None):
+        """Sequence numbers of buffered records whose outcome is in kinds
+        
+        Results are cached per filter and extended incrementally, so
+        repeated calls cost only the records added since the last one.
+        """
+        if kinds is None:
+            return range(self.first_seq, self.total)
+        key = frozenset(kinds)
+        seqs, scanned = self._filters.get(key, (deque(), 0))
+        first = self.first_seq
+        while seqs and seqs[0] < first:
+            seqs.popleft()
+        outcomes = self.outcomes
+        capacity = self.capacity
+        for seq in range(max(scanned, first), self.total):
+            if outcomes[seq % capacity] in key:
+                seqs.append(seq)
+        self._filters[key] = (seqs, self.total)
+        return seqs
+    
+    def clear(self):
+        """Drop every record (an active export keeps going)"""
+        self.total = 0
+        self.messages.clear()
+        self._filters.clear()
+    
+    def start_export(self, path, resume_at=None):
+        """Write buffered records to path and stream every later one
+        
+        With resume_at, an existing export at path is continued: its rows
+        for steps before resume_at are kept and any later ones dropped.
+        """
+        self.stop_export()
+        keep = _truncate_export(path, resume_at) if resume_at is not None else 0
+        self.export_file = open(path, 'a' if keep else 'w', newline='')
+        self.export_writer = csv.writer(self.export_file)
+        if not keep:
+            self.export_writer.writerow(['step', 'page', 'event', 'frame', 'victim', 'message'])
+        self._export(self.first_seq, self.total)
+    
+    def stop_export(self):
+        """Close the export file"""
+        if self.export_file:
+            self.export_file.close()
+        self.export_file = None
+        self.export_writer = None
+    
+    def _export(self, start, end):
+        """Write buffered records start..end-1"""
+        rows = []
+        for seq in range(start, end):
+            step, page, outcome, frame, victim = self.record(seq)
+            if outcome == MESSAGE:
+                rows.append([step, '', EVENT_NAMES[MESSAGE], '', '', self.messages.get(seq, '')])
+                continue
+            rows.append([step, page, EVENT_NAMES[outcome], frame,
+                         victim if victim >= 0 else '', ''])
+        self.export_writer.writerows(rows)
+    
+    def _write_arrays(self, first_step, pages, outcomes, frames, victims):
+        """Write records that never enter the buffer"""
+        self.export_writer.writerows(
+            [first_step + i, page, EVENT_NAMES[outcome], frame, victim if victim >= 0 else '', '']
+            for i, (page, outcome, frame, victim) in enumerate(zip(pages, outcomes, frames, victims))
+        )
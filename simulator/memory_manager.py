@@ -1,113 +1,390 @@
-from .page_table import PageTable
+from array import array
+
+from .page_table import PageTable, CompactPageTable, MultiLevelPageTable
 from .tlb import TLB
+from .trace_reader import WRITE, FETCH
 from .page_replacement import get_replacer
 from .swap_space import SwapSpace
+from .timing import TimingModel
+from .observer import (ObserverHub, ObservedTLB, ObservedPageTable, ObservedReplacer,
+                       ObservedSwap)
+
+# Outcome codes reported by access_many
+TLB_HIT = 0
+PAGE_HIT = 1
+PAGE_FAULT = 2
+
+class OutOfFramesError(RuntimeError):
+    """Raised when a fault needs a frame but none is free or evictable"""
 
 class MemoryManager:
     """Main Virtual Memory Manager"""
-    def __init__(self, num_frames=16, page_size=4096, tlb_size=8, algorithm='LRU'):
+    def __init__(self, num_frames=16, page_size=4096, tlb_size=8, algorithm='LRU',
+                 page_table_levels=None, compact_page_table=False, swap_space=None,
+                 timing=None, tick_interval=0, tlb=None):
         self.num_frames = num_frames
         self.page_size = page_size
         self.algorithm = algorithm
+        # Bits per level for a multi-level page table; None for a flat one
+        self.page_table_levels = page_table_levels
+        # Array-backed single-level table instead of per-entry objects
+        self.compact_page_table = compact_page_table
+        # Clear referenced bits every this many accesses (0: never)
+        self.tick_interval = tick_interval
         
         # Components
-        self.page_table = PageTable()
-        self.tlb = TLB(tlb_size)
-        self.swap_space = SwapSpace()
-        self.physical_memory = [None] * num_frames
+        self.page_table = self._create_page_table()
+        # Single fully associative TLB unless a TLBHierarchy is given
+        self.tlb = tlb if tlb is not None else TLB(tlb_size)
+        # Any swap device with the SwapSpace interface, e.g. swap_file.SwapFile
+        self.swap_space = swap_space if swap_space is not None else SwapSpace()
+        self.timing = timing if timing is not None else TimingModel()
+        self._init_frames()
         
         # Metrics
         self.page_faults = 0
         self.total_accesses = 0
+        self.clean_evictions = 0
+        self.dirty_evictions = 0
+        # TLB misses by latency class: (walk_levels, fault, victim_dirty) -> count
+        self.miss_classes = {}
+        self.ticks = 0
         
         # Page replacement
         self.replacer = None
+        # Set while observers are registered; components are then wrapped
+        self.hub = None
+    
+    def _create_page_table(self):
+        """Create flat or multi-level page table"""
+        if self.page_table_levels:
+            return MultiLevelPageTable(self.page_table_levels)
+        if self.compact_page_table:
+            return CompactPageTable()
+        return PageTable()
     
     def initialize_replacer(self, future_refs=None):
         """Initialize page replacement algorithm"""
-        self.replacer = get_replacer(self.algorithm, self.num_frames, future_refs)
+        hub = self.hub
+        page_table = self.page_table if hub is None else self.page_table.target
+        self.replacer = get_replacer(self.algorithm, self.num_frames, future_refs,
+                                     page_table=page_table)
+        if hub is not None:
+            self.replacer = ObservedReplacer(self.replacer, hub, page_table)
+    
+    def add_observer(self, observer):
+        """Send simulation events to observer (see observer.py)
+        
+        The first observer wraps the TLB, page table, replacer and swap
+        device in reporting proxies; without observers nothing is wrapped.
+        """
+        if self.hub is None:
+            self._wrap(ObserverHub())
+        self.hub.add(observer)
+    
+    def remove_observer(self, observer):
+        """Stop sending events to observer; the last one unwraps the components"""
+        self.hub.remove(observer)
+        if not self.hub.observers:
+            self._unwrap()
     
-    def access_page(self, page_num):
-        """Access a page - main simulation logic"""
+    def _wrap(self, hub):
+        self.hub = hub
+        self.tlb = ObservedTLB(self.tlb, hub)
+        self.swap_space = ObservedSwap(self.swap_space, hub)
+        self.page_table = ObservedPageTable(self.page_table, hub)
+        if self.replacer is not None:
+            self.replacer = ObservedReplacer(self.replacer, hub, self.page_table.target)
+    
+    def _unwrap(self):
+        """Drop the observer proxies, returns the hub"""
+        hub = self.hub
+        self.tlb = self.tlb.target
+        self.swap_space = self.swap_space.target
+        self.page_table = self.page_table.target
+        if self.replacer is not None:
+            self.replacer = self.replacer.target
+        self.hub = None
+        return hub
+    
+    def __getstate__(self):
+        """Picklable state (see checkpoint.py): bare components, no observers"""
+        state = self.__dict__.copy()
+        if self.hub is not None:
+            state['hub'] = None
+            for name in ('tlb', 'swap_space', 'page_table', 'replacer'):
+                if state[name] is not None:
+                    state[name] = state[name].target
+        return state
+    
+    def access_page(self, page_num, is_write=False, is_fetch=False):
+        """Access a page - main simulation logic
+        
+        Every access sets the page's referenced bit, even on a TLB hit, and
+        a write sets its dirty bit, so it is written back to swap when
+        evicted; clean victims are dropped without a swap-out. is_fetch
+        marks an instruction fetch, which a TLBHierarchy serves from its
+        L1 instruction TLB.
+        
+        TLB and page-table hits are passed to the replacer as well as
+        faults, so recency and frequency replacers see every reference and
+        Optimal stays at the right point in the trace. FIFO ignores hits;
+        the clock-style replacers see them through the referenced bit.
+        """
         self.total_accesses += 1
         
         result = {
             'page': page_num,
+            'write': is_write,
             'tlb_hit': False,
             'page_fault': False,
             'victim': None,
-            'frame': None
+            'frame': None,
+            'victim_dirty': False,
+            'walk_levels': 0,
+            'tlb_evicted': None,
+            'tick': False
         }
         
         # Check TLB
-        frame = self.tlb.lookup(page_num)
+        frame = self.tlb.lookup(page_num, is_fetch)
         if frame is not None:
             result['tlb_hit'] = True
             result['frame'] = frame
+            self.replacer.access(page_num)
+            self.page_table.touch(page_num, is_write)
+            self._tick_if_due(result)
             return result
         
         # Check page table
         frame = self.page_table.get_frame(page_num)
+        levels = result['walk_levels'] = self.page_table.last_walk_levels
         if frame is not None:
+            key = (levels, False, False)
+            self.miss_classes[key] = self.miss_classes.get(key, 0) + 1
             result['frame'] = frame
-            self.tlb.insert(page_num, frame)
+            result['tlb_evicted'] = self.tlb.insert(page_num, frame, is_fetch)
+            self.replacer.access(page_num)
+            self.page_table.touch(page_num, is_write)
+            self._tick_if_due(result)
             return result
         
         # Page fault
         result['page_fault'] = True
         self.page_faults += 1
+        frame, result['victim'], result['victim_dirty'] = self._handle_fault(page_num)
+        key = (levels, True, result['victim_dirty'])
+        self.miss_classes[key] = self.miss_classes.get(key, 0) + 1
+        result['frame'] = frame
+        result['tlb_evicted'] = self.tlb.insert(page_num, frame, is_fetch)
+        self.page_table.touch(page_num, is_write)
+        self._tick_if_due(result)
+        return result
+    
+    def _tick_if_due(self, result):
+        if self.tick_interval and self.total_accesses % self.tick_interval == 0:
+            self.tick()
+            result['tick'] = True
+    
+    def tick(self):
+        """Periodic clock tick: let the replacer sample reference bits, then clear them"""
+        self.ticks += 1
+        self.replacer.tick()
+        clear_referenced = self.page_table.clear_referenced
+        for page in self.frame_of:
+            clear_referenced(page)
+    
+    def access_many(self, pages, record=True, counts=None, writes=None):
+        """Access a sequence of pages in one call
         
-        # Page replacement
+        Same simulation and counters as calling access_page for each page,
+        without building a result dict per reference. With record=True,
+        returns (outcomes, frames, victims) arrays: outcome codes TLB_HIT,
+        PAGE_HIT or PAGE_FAULT, the frame used, and the evicted page or -1.
+        With record=False only the counters are updated and get_metrics()
+        is returned.
+        
+        counts, if given, says pages[i] is referenced counts[i] times in a
+        row (see preprocess.collapse_runs). Only the first reference of a
+        run is simulated; the repeats are TLB hits on a resident page and
+        are credited in bulk, so counters stay exact. Records are then per
+        run.
+        
+        writes, if given, holds flags alongside pages: WRITE for writes,
+        FETCH for instruction fetches (see trace_reader); for runs, a run
+        is a write if any of its references is. Ticks fall on the same
+        accesses as with access_page.
+        """
+        n = len(pages)
+        if record:
+            outcomes = array('b', [PAGE_FAULT]) * n
+            frames = array('q', [-1]) * n
+            victims = array('q', [-1]) * n
+        
+        tlb = self.tlb
+        # The plain TLB is probed inline; other TLB models count their own hits
+        fast_tlb = type(tlb) is TLB
+        if fast_tlb:
+            tlb_entries = tlb.entries
+            tlb_touch = tlb_entries.move_to_end
+        tlb_lookup = tlb.lookup
+        tlb_insert = tlb.insert
+        page_table = self.page_table
+        get_frame = page_table.get_frame
+        touch = page_table.touch
+        replacer_access = self.replacer.access
+        replacer_repeat = self.replacer.repeat
+        handle_fault = self._handle_fault
+        miss_classes = self.miss_classes
+        tick_interval = self.tick_interval
+        base = self.total_accesses
+        next_tick = (base // tick_interval + 1) * tick_interval if tick_interval else 0
+        tlb_hits = 0
+        faults = 0
+        repeats = 0
+        done = 0
+        fetch = 0
+        
+        try:
+            for i, page in enumerate(pages):
+                done = i + 1
+                if fast_tlb:
+                    frame = tlb_entries.get(page)
+                    if frame is not None:
+                        tlb_touch(page)
+                else:
+                    fetch = writes is not None and writes[i] & FETCH
+                    frame = tlb_lookup(page, fetch)
+                if frame is not None:
+                    tlb_hits += 1
+                    replacer_access(page)
+                    outcome = TLB_HIT
+                else:
+                    frame = get_frame(page)
+                    if frame is not None:
+                        tlb_insert(page, frame, fetch)
+                        replacer_access(page)
+                        outcome = PAGE_HIT
+                        key = (page_table.last_walk_levels, False, False)
+                    else:
+                        faults += 1
+                        levels = page_table.last_walk_levels
+                        frame, victim, victim_dirty = handle_fault(page)
+                        tlb_insert(page, frame, fetch)
+                        outcome = PAGE_FAULT
+                        key = (levels, True, victim_dirty)
+                        if record and victim is not None:
+                            victims[i] = victim
+                    miss_classes[key] = miss_classes.get(key, 0) + 1
+                
+                if writes is not None:
+                    touch(page, writes[i] & WRITE)
+                else:
+                    touch(page)
+                
+                if counts is not None:
+                    extra = counts[i] - 1
+                    if extra > 0:
+                        replacer_repeat(page, extra)
+                        repeats += extra
+                        if not fast_tlb:
+                            tlb.credit_hits(extra, fetch)
+                
+                if tick_interval:
+                    now = base + done + repeats
+                    while next_tick <= now:
+                        self.tick()
+                        if next_tick < now:
+                            # The run goes on referencing the page after this tick
+                            touch(page)
+                        next_tick += tick_interval
+                
+                if record:
+                    outcomes[i] = outcome
+                    frames[i] = frame
+        finally:
+            self.total_accesses += done + repeats
+            self.page_faults += faults
+            if fast_tlb:
+                tlb.hits += tlb_hits + repeats
+                tlb.misses += done - tlb_hits
+        
+        if record:
+            return outcomes, frames, victims
+        return self.get_metrics()
+    
+    def _handle_fault(self, page_num):
+        """Load page into a frame, evicting if needed
+        
+        Returns (frame, victim, victim_dirty). Only dirty victims are
+        written to swap.
+        """
         victim, _ = self.replacer.access(page_num)
+        victim_dirty = False
         
         if victim is not None:
-            result['victim'] = victim
-            victim_frame = self._find_page_frame(victim)
-            if victim_frame is not None:
+            frame = self._find_page_frame(victim)
+            if frame is None:
+                raise OutOfFramesError(f"Victim page {victim} is not resident")
+            victim_dirty = self.page_table.is_dirty(victim)
+            if victim_dirty:
                 self.swap_space.swap_out(victim)
-                self.physical_memory[victim_frame] = page_num
-                result['frame'] = victim_frame
-                self.page_table.remove(victim)
-                self.page_table.insert(page_num, victim_frame)
+                self.dirty_evictions += 1
+            else:
+                self.clean_evictions += 1
+            del self.frame_of[victim]
+            self.page_table.remove(victim)
+            self.tlb.invalidate(victim)
         else:
-            # Find empty frame
             frame = self._find_empty_frame()
-            self.physical_memory[frame] = page_num
-            result['frame'] = frame
-            self.page_table.insert(page_num, frame)
         
-        self.swap_space.swap_in(page_num)
-        self.tlb.insert(page_num, result['frame'])
+        self.physical_memory[frame] = page_num
+        self.frame_of[page_num] = frame
+        self.page_table.insert(page_num, frame)
         
-        return result
+        swap = self.swap_space
+        swap.swap_in(page_num)
+        if swap.swap_full() and swap.release(page_num):
+            # Memory holds the only copy now, so an eviction must write it back
+            self.page_table.mark_dirty(page_num)
+        return frame, victim, victim_dirty
+    
+    def _init_frames(self):
+        """Create empty frame table, reverse map and free-frame stack"""
+        self.physical_memory = [None] * self.num_frames  # frame -> page
+        self.frame_of = {}                               # page -> frame
+        # Popped from the end, so frames fill from 0 upwards
+        self.free_frames = list(range(self.num_frames - 1, -1, -1))
     
     def _find_empty_frame(self):
-        """Find first empty frame"""
-        for i in range(self.num_frames):
-            if self.physical_memory[i] is None:
-                return i
-        return 0
+        """Take a frame from the free stack"""
+        if not self.free_frames:
+            raise OutOfFramesError(f"All {self.num_frames} frames are in use")
+        return self.free_frames.pop()
     
     def _find_page_frame(self, page_num):
         """Find which frame contains page"""
-        for i in range(self.num_frames):
-            if self.physical_memory[i] == page_num:
-                return i
-        return None
+        return self.frame_of.get(page_num)
     
     def reset(self):
         """Reset all components"""
-        self.physical_memory = [None] * self.num_frames
-        self.page_table = PageTable()
+        self._init_frames()
+        self.page_table = self._create_page_table()
+        if self.hub is not None:
+            self.page_table = ObservedPageTable(self.page_table, self.hub)
         self.tlb.clear()
         self.swap_space.clear()
         self.page_faults = 0
         self.total_accesses = 0
+        self.clean_evictions = 0
+        self.dirty_evictions = 0
+        self.miss_classes = {}
+        self.ticks = 0
         self.replacer = None
     
     def get_metrics(self):
         """Get performance metrics"""
-        return {
+        metrics = {
             'page_faults': self.page_faults,
             'total_accesses': self.total_accesses,
             'fault_rate': (self.page_faults / self.total_accesses * 100) if self.total_accesses > 0 else 0,
@@ -115,5 +392,20 @@ class MemoryManager:
             'tlb_misses': self.tlb.misses,
             'tlb_hit_ratio': (self.tlb.hits / (self.tlb.hits + self.tlb.misses) * 100) if (self.tlb.hits + self.tlb.misses) > 0 else 0,
             'swap_ins': self.swap_space.swap_in_count,
-            'swap_outs': self.swap_space.swap_out_count
+            'swap_outs': self.swap_space.swap_out_count,
+            'clean_evictions': self.clean_evictions,
+            'dirty_evictions': self.dirty_evictions,
+            'page_table_walks': self.page_table.walks,
+            'walk_steps': self.page_table.walk_steps,
+            'avg_walk_levels': (self.page_table.walk_steps / self.page_table.walks) if self.page_table.walks > 0 else 0,
+            'walk_bytes_touched': self.page_table.bytes_touched,
+            'page_table_bytes': self.page_table.memory_bytes(),
+            'ticks': self.ticks
         }
+        # Victim-selection work of reference-bit approximations (CLOCK, NRU, ...);
+        # 0 for replacers that do not scan, so every run reports the same keys
+        metrics['replacer_scans'] = getattr(self.replacer, 'scans', 0)
+        metrics.update(self.tlb.level_stats())
+        metrics.update(self.swap_space.io_stats())
+        metrics.update(self.timing.summarize(self.tlb.hits, self.miss_classes))
+        return metrics
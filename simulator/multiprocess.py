@@ -0,0 +1,452 @@
+"""
+Multi-process simulation
+
+Several address spaces share one set of physical frames. Each process has
+its own page table; the frame table, free-frame stack, swap device and TLB
+are shared. References come as interleaved (pid, page) pairs, and a change
+of pid is a context switch: the TLB is flushed, or with an ASID-tagged
+TLBHierarchy only retagged.
+
+Replacement is global (one replacer over every resident page, so processes
+steal frames from each other) or local (each process replaces within its
+own quota of frames). Global replacers key pages as page << PID_BITS | pid.
+The 'ws' and 'pff' policies have no fixed quota: an allocator from
+working_set resizes each resident set as the process runs, and when no
+frame is free the faulting process gives up its least recently used page.
+
+With a working-set window every process's working set is tracked, and a
+ThrashingDetector watches their combined size against num_frames.
+"""
+
+from array import array
+
+from .memory_manager import OutOfFramesError, TLB_HIT, PAGE_HIT, PAGE_FAULT
+from .page_replacement import get_replacer
+from .page_table import PageTable, CompactPageTable, MultiLevelPageTable
+from .swap_space import SwapSpace
+from .timing import TimingModel
+from .tlb import TLB
+from .trace_reader import WRITE, FETCH, iter_tagged_chunks
+from .working_set import WorkingSet, WorkingSetAllocator, PFFAllocator, ThrashingDetector
+
+PID_BITS = 20
+PID_MASK = (1 << PID_BITS) - 1
+POLICIES = ('global', 'local', 'ws', 'pff')
+
+class Process:
+    """One simulated address space"""
+    def __init__(self, pid, page_table, replacer=None, quota=None):
+        self.pid = pid
+        self.page_table = page_table
+        # Own replacer and frame quota under local replacement
+        self.replacer = replacer
+        self.quota = quota
+        self.frame_of = {}          # resident page -> frame
+        self.working_set = None     # WorkingSet when tracking is on
+        self.last_fault = 0         # Virtual time of the last fault (PFF)
+        self.accesses = 0
+        self.page_faults = 0
+        self.peak_resident = 0
+    
+    def get_metrics(self):
+        """Per-process counters"""
+        return {
+            'pid': self.pid,
+            'accesses': self.accesses,
+            'page_faults': self.page_faults,
+            'fault_rate': (self.page_faults / self.accesses * 100) if self.accesses > 0 else 0,
+            'resident': len(self.frame_of),
+            'peak_resident': self.peak_resident,
+            'quota': self.quota,
+            'wss': len(self.working_set) if self.working_set is not None else None
+        }
+
+class _GlobalBits:
+    """Referenced/dirty bits of (page, pid) keys, for a replacer spanning every process"""
+    def __init__(self, processes):
+        self.processes = processes
+    
+    def _lookup(self, key):
+        return self.processes[key & PID_MASK].page_table, key >> PID_BITS
+    
+    def is_referenced(self, key):
+        page_table, page = self._lookup(key)
+        return page_table.is_referenced(page)
+    
+    def clear_referenced(self, key):
+        page_table, page = self._lookup(key)
+        page_table.clear_referenced(page)
+    
+    def is_dirty(self, key):
+        page_table, page = self._lookup(key)
+        return page_table.is_dirty(page)
+
+class MultiProcessManager:
+    """Virtual memory manager for many processes over shared frames"""
+    def __init__(self, num_frames=16, page_size=4096, tlb_size=8, algorithm='LRU',
+                 policy='global', quota=None, quotas=None, page_table_levels=None,
+                 compact_page_table=False, swap_space=None, timing=None, tlb=None,
+                 tick_interval=0, window=None, pff_threshold=None, sample_interval=1000,
+                 on_thrashing=None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown replacement policy: {policy}")
+        if policy == 'local' and quota is None and not quotas:
+            raise ValueError("Local replacement needs a per-process frame quota")
+        if policy == 'ws':
+            self.allocator = WorkingSetAllocator(window)
+        elif policy == 'pff':
+            self.allocator = PFFAllocator(pff_threshold)
+        else:
+            self.allocator = None
+        self.num_frames = num_frames
+        self.page_size = page_size
+        self.algorithm = algorithm
+        self.policy = policy
+        # Frames per process under local replacement; quotas overrides per pid
+        self.quota = quota
+        self.quotas = dict(quotas or {})
+        self.page_table_levels = page_table_levels
+        self.compact_page_table = compact_page_table
+        # Clear referenced bits every this many accesses (0: never)
+        self.tick_interval = tick_interval
+        # Working-set window in references (None: no tracking)
+        self.window = window
+        self.sample_interval = sample_interval
+        self.on_thrashing = on_thrashing
+        if window is not None or self.allocator is not None:
+            # Keep the untracked path free of per-reference checks
+            self._reference = self._tracked_reference
+        
+        # Shared components
+        self.tlb = tlb if tlb is not None else TLB(tlb_size)
+        self.swap_space = swap_space if swap_space is not None else SwapSpace()
+        self.timing = timing if timing is not None else TimingModel()
+        self._init_state()
+    
+    def _init_state(self):
+        self.physical_memory = [None] * self.num_frames  # frame -> page << PID_BITS | pid
+        self.free_frames = list(range(self.num_frames - 1, -1, -1))
+        self.processes = {}
+        self.assigned_frames = 0    # Sum of local quotas handed out
+        self.current_pid = None
+        self.context_switches = 0
+        self.tlb_flushes = 0        # Switches that flushed rather than retagged the TLB
+        self.page_faults = 0
+        self.total_accesses = 0
+        self.clean_evictions = 0
+        self.dirty_evictions = 0
+        self.miss_classes = {}
+        self.ticks = 0
+        self.released_pages = 0     # Pages an allocator took back
+        self.detector = None
+        if self.window is not None:
+            self.detector = ThrashingDetector(self.num_frames, self.sample_interval,
+                                              self.on_thrashing)
+        self.future = {}            # pid -> that process's page references (Optimal)
+        self.replacer = None
+    
+    def _create_page_table(self):
+        """Create flat or multi-level page table"""
+        if self.page_table_levels:
+            return MultiLevelPageTable(self.page_table_levels)
+        if self.compact_page_table:
+            return CompactPageTable()
+        return PageTable()
+    
+    def initialize_replacer(self, pids=None, pages=None):
+        """Initialize page replacement; pids/pages give the whole trace for Optimal"""
+        future_refs = None
+        if pids is not None and self.algorithm == 'Optimal':
+            if self.policy == 'global':
+                future_refs = [(page << PID_BITS) | pid for pid, page in zip(pids, pages)]
+            else:
+                self.future = {}
+                for pid, page in zip(pids, pages):
+                    self.future.setdefault(pid, []).append(page)
+        if self.policy == 'global':
+            self.replacer = get_replacer(self.algorithm, self.num_frames, future_refs,
+                                         page_table=_GlobalBits(self.processes))
+    
+    def get_process(self, pid):
+        """Process pid, created on its first reference"""
+        process = self.processes.get(pid)
+        if process is not None:
+            return process
+        if not 0 <= pid <= PID_MASK:
+            raise ValueError(f"PID {pid} is outside 0..{PID_MASK}")
+        
+        page_table = self._create_page_table()
+        if self.policy == 'local':
+            quota = self.quotas.get(pid, self.quota)
+            if quota is None or quota < 1:
+                raise ValueError(f"No frame quota for process {pid}")
+            if self.assigned_frames + quota > self.num_frames:
+                raise OutOfFramesError(
+                    f"Quota of {quota} frames for process {pid} exceeds the "
+                    f"{self.num_frames - self.assigned_frames} unassigned frames")
+            self.assigned_frames += quota
+            replacer = get_replacer(self.algorithm, quota, self.future.get(pid),
+                                    page_table=page_table)
+            process = Process(pid, page_table, replacer, quota)
+        elif self.allocator is not None:
+            process = Process(pid, page_table, WorkingSet())
+        else:
+            process = Process(pid, page_table)
+        if self.window is not None:
+            process.working_set = WorkingSet(self.window)
+        self.processes[pid] = process
+        return process
+    
+    def _switch_to(self, pid):
+        """Context switch to pid if another process was running"""
+        if self.current_pid is not None:
+            self.context_switches += 1
+            if not getattr(self.tlb, 'use_asid', False):
+                self.tlb_flushes += 1
+        self.current_pid = pid
+        self.tlb.switch(pid)
+    
+    def _reference(self, pid, page_num, is_write, is_fetch):
+        """Simulate one reference, returns (outcome, frame, victim key or None, victim_dirty)"""
+        if pid != self.current_pid:
+            self._switch_to(pid)
+        process = self.get_process(pid)
+        process.accesses += 1
+        self.total_accesses += 1
+        key = (page_num << PID_BITS) | pid
+        replacer = self.replacer if self.policy == 'global' else process.replacer
+        replacer_key = key if self.policy == 'global' else page_num
+        page_table = process.page_table
+        
+        frame = self.tlb.lookup(page_num, is_fetch)
+        if frame is not None:
+            replacer.access(replacer_key)
+            page_table.touch(page_num, is_write)
+            return TLB_HIT, frame, None, False
+        
+        frame = page_table.get_frame(page_num)
+        levels = page_table.last_walk_levels
+        if frame is not None:
+            self._count_miss((levels, False, False))
+            self.tlb.insert(page_num, frame, is_fetch)
+            replacer.access(replacer_key)
+            page_table.touch(page_num, is_write)
+            return PAGE_HIT, frame, None, False
+        
+        process.page_faults += 1
+        self.page_faults += 1
+        frame, victim, victim_dirty = self._handle_fault(process, page_num, replacer, replacer_key)
+        self._count_miss((levels, True, victim_dirty))
+        self.tlb.insert(page_num, frame, is_fetch)
+        page_table.touch(page_num, is_write)
+        return PAGE_FAULT, frame, victim, victim_dirty
+    
+    def _tracked_reference(self, pid, page_num, is_write, is_fetch):
+        """_reference plus working-set tracking and allocator trimming"""
+        result = MultiProcessManager._reference(self, pid, page_num, is_write, is_fetch)
+        process = self.processes[pid]
+        working_set = process.working_set
+        if working_set is not None:
+            size = len(working_set)
+            working_set.reference(page_num)
+            self.detector.update(len(working_set) - size)
+        if self.allocator is not None:
+            self._release(process, self.allocator.after_reference(process))
+        return result
+    
+    def tick(self):
+        """Periodic clock tick: replacers sample reference bits, then they are cleared"""
+        self.ticks += 1
+        if self.policy == 'global':
+            self.replacer.tick()
+        for process in self.processes.values():
+            if process.replacer is not None:
+                process.replacer.tick()
+            clear_referenced = process.page_table.clear_referenced
+            for page in process.frame_of:
+                clear_referenced(page)
+    
+    def _count_miss(self, key):
+        self.miss_classes[key] = self.miss_classes.get(key, 0) + 1
+    
+    def _handle_fault(self, process, page_num, replacer, replacer_key):
+        """Load page into a frame, evicting if needed
+        
+        Returns (frame, victim key, victim_dirty); the victim may belong to
+        another process under global replacement or when an allocator reclaims.
+        """
+        victim, _ = replacer.access(replacer_key)
+        if victim is not None and self.policy == 'local':
+            victim = (victim << PID_BITS) | process.pid
+        if self.allocator is not None:
+            self._release(process, self.allocator.on_fault(process))
+            if not self.free_frames:
+                victim = self._reclaim(process)
+        
+        victim_dirty = False
+        if victim is not None:
+            owner = self.processes[victim & PID_MASK]
+            frame, victim_dirty = self._evict(owner, victim >> PID_BITS)
+        else:
+            if not self.free_frames:
+                raise OutOfFramesError(f"All {self.num_frames} frames are in use")
+            frame = self.free_frames.pop()
+        
+        key = (page_num << PID_BITS) | process.pid
+        self.physical_memory[frame] = key
+        process.frame_of[page_num] = frame
+        if len(process.frame_of) > process.peak_resident:
+            process.peak_resident = len(process.frame_of)
+        process.page_table.insert(page_num, frame)
+        swap = self.swap_space
+        swap.swap_in(key)
+        if swap.swap_full() and swap.release(key):
+            # Memory holds the only copy now, so an eviction must write it back
+            process.page_table.mark_dirty(page_num)
+        return frame, victim, victim_dirty
+    
+    def _evict(self, owner, page_num):
+        """Unmap a resident page of owner, writing it back if dirty; returns (frame, dirty)"""
+        frame = owner.frame_of.pop(page_num, None)
+        if frame is None:
+            raise OutOfFramesError(f"Victim page {page_num} of process {owner.pid} is not resident")
+        dirty = owner.page_table.is_dirty(page_num)
+        if dirty:
+            self.swap_space.swap_out((page_num << PID_BITS) | owner.pid)
+            self.dirty_evictions += 1
+        else:
+            self.clean_evictions += 1
+        owner.page_table.remove(page_num)
+        self.tlb.invalidate(page_num, owner.pid)
+        return frame, dirty
+    
+    def _release(self, process, pages):
+        """Return pages an allocator trimmed from a resident set to the free frames"""
+        for page in pages:
+            frame, _ = self._evict(process, page)
+            self.physical_memory[frame] = None
+            self.free_frames.append(frame)
+            self.released_pages += 1
+    
+    def _reclaim(self, process):
+        """Pick a victim key when an allocator wants a frame and none is free
+        
+        The faulting process gives up its least recently used page; a process
+        with nothing resident takes one from the largest resident set.
+        """
+        owner = process
+        if not process.frame_of:
+            owner = max(self.processes.values(), key=lambda p: len(p.frame_of))
+            if not owner.frame_of:
+                raise OutOfFramesError(f"All {self.num_frames} frames are in use")
+        return (owner.replacer.pop_oldest() << PID_BITS) | owner.pid
+    
+    def access_page(self, pid, page_num, is_write=False, is_fetch=False):
+        """Access a page of process pid, returns a result dict like MemoryManager's"""
+        outcome, frame, victim, victim_dirty = self._reference(pid, page_num, is_write, is_fetch)
+        if self.tick_interval and self.total_accesses % self.tick_interval == 0:
+            self.tick()
+        return {
+            'pid': pid,
+            'page': page_num,
+            'write': is_write,
+            'tlb_hit': outcome == TLB_HIT,
+            'page_fault': outcome == PAGE_FAULT,
+            'frame': frame,
+            'victim_pid': (victim & PID_MASK) if victim is not None else None,
+            'victim': (victim >> PID_BITS) if victim is not None else None,
+            'victim_dirty': victim_dirty
+        }
+    
+    def access_many(self, pids, pages, writes=None, record=False):
+        """Access interleaved (pid, page) references
+        
+        writes optionally holds trace flags (WRITE, FETCH). With record=True,
+        returns (outcomes, frames) arrays; otherwise get_metrics().
+        """
+        if record:
+            outcomes = array('b', [PAGE_FAULT]) * len(pages)
+            frames = array('q', [-1]) * len(pages)
+        reference = self._reference
+        tick_interval = self.tick_interval
+        for i, (pid, page) in enumerate(zip(pids, pages)):
+            flags = writes[i] if writes is not None else 0
+            outcome, frame, _, _ = reference(pid, page, flags & WRITE, flags & FETCH)
+            if tick_interval and self.total_accesses % tick_interval == 0:
+                self.tick()
+            if record:
+                outcomes[i] = outcome
+                frames[i] = frame
+        if record:
+            return outcomes, frames
+        return self.get_metrics()
+    
+    def run_file(self, path):
+        """Simulate a tagged trace file, returns get_metrics()"""
+        if self.algorithm == 'Optimal':
+            # Optimal needs every future reference up front
+            pids, pages, writes = array('q'), array('q'), bytearray()
+            for chunk in iter_tagged_chunks(path):
+                pids.extend(chunk[0])
+                pages.extend(chunk[1])
+                writes.extend(chunk[2])
+            self.initialize_replacer(pids, pages)
+            return self.access_many(pids, pages, writes)
+        self.initialize_replacer()
+        for pids, pages, writes in iter_tagged_chunks(path):
+            self.access_many(pids, pages, writes)
+        return self.get_metrics()
+    
+    def reset(self):
+        """Reset all components"""
+        self.tlb.clear()
+        self.swap_space.clear()
+        self._init_state()
+    
+    def wss_history(self):
+        """Combined working-set size every sample_interval references"""
+        return list(self.detector.samples) if self.detector is not None else []
+    
+    def process_metrics(self):
+        """Faults and residency of every process, by pid"""
+        return [self.processes[pid].get_metrics() for pid in sorted(self.processes)]
+    
+    def get_metrics(self):
+        """Get performance metrics summed over all processes"""
+        tables = [p.page_table for p in self.processes.values()]
+        walks = sum(t.walks for t in tables)
+        walk_steps = sum(t.walk_steps for t in tables)
+        tlb_lookups = self.tlb.hits + self.tlb.misses
+        metrics = {
+            'processes': len(self.processes),
+            'context_switches': self.context_switches,
+            'tlb_flushes': self.tlb_flushes,
+            'page_faults': self.page_faults,
+            'total_accesses': self.total_accesses,
+            'fault_rate': (self.page_faults / self.total_accesses * 100) if self.total_accesses > 0 else 0,
+            'tlb_hits': self.tlb.hits,
+            'tlb_misses': self.tlb.misses,
+            'tlb_hit_ratio': (self.tlb.hits / tlb_lookups * 100) if tlb_lookups > 0 else 0,
+            'swap_ins': self.swap_space.swap_in_count,
+            'swap_outs': self.swap_space.swap_out_count,
+            'clean_evictions': self.clean_evictions,
+            'dirty_evictions': self.dirty_evictions,
+            'page_table_walks': walks,
+            'walk_steps': walk_steps,
+            'avg_walk_levels': (walk_steps / walks) if walks > 0 else 0,
+            'walk_bytes_touched': sum(t.bytes_touched for t in tables),
+            'page_table_bytes': sum(t.memory_bytes() for t in tables),
+            'ticks': self.ticks
+        }
+        replacers = [self.replacer] if self.policy == 'global' else \
+            [p.replacer for p in self.processes.values()]
+        metrics['replacer_scans'] = sum(getattr(r, 'scans', 0) for r in replacers)
+        if self.allocator is not None:
+            metrics['released_pages'] = self.released_pages
+        if self.detector is not None:
+            metrics.update(self.detector.get_metrics())
+        metrics.update(self.tlb.level_stats())
+        metrics.update(self.swap_space.io_stats())
+        metrics.update(self.timing.summarize(self.tlb.hits, self.miss_classes,
+                                             self.context_switches, self.tlb_flushes))
+        return metrics
@@ -0,0 +1,277 @@
+"""
+Observer hooks for the simulation hot path
+
+MemoryManager.add_observer wraps the TLB, page table, replacer and swap
+device in thin proxies that report what happens inside them; the last
+remove_observer unwraps them again. Until an observer is added, the
+manager runs on the bare components, so an unobserved run pays nothing.
+
+Observers get on_event(kind, page, arg) for every event below, and those
+with timed = True also get on_phase(phase, seconds) for each call into a
+component ('tlb', 'page_table', 'replacer', 'swap').
+
+    TLB_HIT_EVENT    page, frame
+    TLB_MISS_EVENT   page, -1
+    TLB_EVICT_EVENT  evicted page, page inserted in its place
+    WALK_EVENT       page, levels walked
+    FAULT_EVENT      page, levels walked
+    VICTIM_EVENT     victim page, 1 if dirty else 0
+    SWAP_IN_EVENT    page, -1
+    SWAP_OUT_EVENT   page, -1
+"""
+
+import struct
+import time
+
+TLB_HIT_EVENT = 0
+TLB_MISS_EVENT = 1
+TLB_EVICT_EVENT = 2
+WALK_EVENT = 3
+FAULT_EVENT = 4
+VICTIM_EVENT = 5
+SWAP_IN_EVENT = 6
+SWAP_OUT_EVENT = 7
+
+EVENT_NAMES = {
+    TLB_HIT_EVENT: 'tlb_hit',
+    TLB_MISS_EVENT: 'tlb_miss',
+    TLB_EVICT_EVENT: 'tlb_evict',
+    WALK_EVENT: 'walk',
+    FAULT_EVENT: 'fault',
+    VICTIM_EVENT: 'victim',
+    SWAP_IN_EVENT: 'swap_in',
+    SWAP_OUT_EVENT: 'swap_out'
+}
+
+PHASES = ('tlb', 'page_table', 'replacer', 'swap')
+
+class Observer:
+    """Base observer; override what you need"""
+    timed = False               # Whether on_phase should be called
+    
+    def on_event(self, kind, page, arg):
+        """One simulation event"""
+    
+    def on_phase(self, phase, seconds):
+        """Time spent in one call into a component"""
+
+class ObserverHub:
+    """Fans events out to the registered observers"""
+    def __init__(self):
+        self.observers = []
+        self.timed = False
+    
+    def add(self, observer):
+        self.observers.append(observer)
+        self.timed = any(o.timed for o in self.observers)
+    
+    def remove(self, observer):
+        self.observers.remove(observer)
+        self.timed = any(o.timed for o in self.observers)
+    
+    def emit(self, kind, page, arg=-1):
+        for observer in self.observers:
+            observer.on_event(kind, page, arg)
+    
+    def phase(self, name, seconds):
+        for observer in self.observers:
+            if observer.timed:
+                observer.on_phase(name, seconds)
+
+class _Proxy:
+    """Forwards everything it does not instrument to the wrapped component"""
+    def __init__(self, target, hub):
+        self.target = target
+        self.hub = hub
+    
+    def __getattr__(self, name):
+        return getattr(self.target, name)
+
+class ObservedTLB(_Proxy):
+    """TLB (or TLBHierarchy) reporting hits, misses and evictions"""
+    def __init__(self, target, hub):
+        super().__init__(target, hub)
+        self.last = (-1, -1)        # Last translation, for credited repeat hits
+    
+    def lookup(self, page_num, fetch=False):
+        hub = self.hub
+        if hub.timed:
+            start = time.perf_counter()
+            frame = self.target.lookup(page_num, fetch)
+            hub.phase('tlb', time.perf_counter() - start)
+        else:
+            frame = self.target.lookup(page_num, fetch)
+        if frame is not None:
+            self.last = (page_num, frame)
+            hub.emit(TLB_HIT_EVENT, page_num, frame)
+        else:
+            hub.emit(TLB_MISS_EVENT, page_num)
+        return frame
+    
+    def insert(self, page_num, frame_num, fetch=False):
+        hub = self.hub
+        if hub.timed:
+            start = time.perf_counter()
+            evicted = self.target.insert(page_num, frame_num, fetch)
+            hub.phase('tlb', time.perf_counter() - start)
+        else:
+            evicted = self.target.insert(page_num, frame_num, fetch)
+        self.last = (page_num, frame_num)
+        if evicted is not None:
+            hub.emit(TLB_EVICT_EVENT, evicted, page_num)
+        return evicted
+    
+    def credit_hits(self, count, fetch=False):
+        """Repeated hits of a collapsed run; a plain TLB just adds them up"""
+        target = self.target
+        if hasattr(target, 'credit_hits'):
+            target.credit_hits(count, fetch)
+        else:
+            target.hits += count
+        page_num, frame = self.last
+        for _ in range(count):
+            self.hub.emit(TLB_HIT_EVENT, page_num, frame)
+
+class ObservedPageTable(_Proxy):
+    """Page table reporting walks and the faults they end in"""
+    def get_frame(self, page_num):
+        hub = self.hub
+        target = self.target
+        if hub.timed:
+            start = time.perf_counter()
+            frame = target.get_frame(page_num)
+            hub.phase('page_table', time.perf_counter() - start)
+        else:
+            frame = target.get_frame(page_num)
+        hub.emit(WALK_EVENT, page_num, target.last_walk_levels)
+        if frame is None:
+            hub.emit(FAULT_EVENT, page_num, target.last_walk_levels)
+        return frame
+
+class ObservedReplacer(_Proxy):
+    """Replacer reporting the victims it selects"""
+    def __init__(self, target, hub, page_table):
+        super().__init__(target, hub)
+        self.page_table = page_table
+    
+    def access(self, page_num):
+        hub = self.hub
+        if hub.timed:
+            start = time.perf_counter()
+            victim, is_fault = self.target.access(page_num)
+            hub.phase('replacer', time.perf_counter() - start)
+        else:
+            victim, is_fault = self.target.access(page_num)
+        if victim is not None:
+            hub.emit(VICTIM_EVENT, victim, 1 if self.page_table.is_dirty(victim) else 0)
+        return victim, is_fault
+    
+    def repeat(self, page_num, times):
+        hub = self.hub
+        if hub.timed:
+            start = time.perf_counter()
+            self.target.repeat(page_num, times)
+            hub.phase('replacer', time.perf_counter() - start)
+        else:
+            self.target.repeat(page_num, times)
+
+class ObservedSwap(_Proxy):
+    """Swap device reporting page traffic"""
+    def swap_out(self, page_num, data=None):
+        hub = self.hub
+        if hub.timed:
+            start = time.perf_counter()
+            self.target.swap_out(page_num, data)
+            hub.phase('swap', time.perf_counter() - start)
+        else:
+            self.target.swap_out(page_num, data)
+        hub.emit(SWAP_OUT_EVENT, page_num)
+    
+    def swap_in(self, page_num):
+        hub = self.hub
+        if hub.timed:
+            start = time.perf_counter()
+            data = self.target.swap_in(page_num)
+            hub.phase('swap', time.perf_counter() - start)
+        else:
+            data = self.target.swap_in(page_num)
+        hub.emit(SWAP_IN_EVENT, page_num)
+        return data
+
+class CounterSink(Observer):
+    """Counts events by kind"""
+    def __init__(self):
+        self.counts = [0] * len(EVENT_NAMES)
+    
+    def on_event(self, kind, page, arg):
+        self.counts[kind] += 1
+    
+    def get_counts(self):
+        """Event counts by name"""
+        return {EVENT_NAMES[kind]: count for kind, count in enumerate(self.counts)}
+
+class PhaseTimer(Observer):
+    """Wall time and call counts per component"""
+    timed = True
+    
+    def __init__(self):
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.calls = dict.fromkeys(PHASES, 0)
+    
+    def on_phase(self, phase, seconds):
+        self.seconds[phase] += seconds
+        self.calls[phase] += 1
+    
+    def report(self):
+        """Seconds, calls and share of the timed total for each phase"""
+        total = sum(self.seconds.values())
+        return {
+            phase: {
+                'seconds': self.seconds[phase],
+                'calls': self.calls[phase],
+                'share': (self.seconds[phase] / total * 100) if total > 0 else 0
+            }
+            for phase in PHASES
+        }
+
+# kind, page, arg as little-endian byte + two int64
+RECORD = struct.Struct('<bqq')
+
+class BinaryTraceSink(Observer):
+    """Appends every event to a file as a fixed 17-byte record
+    
+    Records are buffered and written every buffer_events events; call
+    close() (or use as a context manager) to write the rest.
+    """
+    def __init__(self, path, buffer_events=4096):
+        self.file = open(path, 'wb')
+        self.buffer = bytearray()
+        self.limit = buffer_events * RECORD.size
+        self.events = 0
+    
+    def on_event(self, kind, page, arg):
+        self.buffer += RECORD.pack(kind, page, arg)
+        self.events += 1
+        if len(self.buffer) >= self.limit:
+            self.flush()
+    
+    def flush(self):
+        self.file.write(self.buffer)
+        self.buffer.clear()
+    
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+def read_binary_trace(path):
+    """Yield (kind, page, arg) records from a BinaryTraceSink file"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    yield from RECORD.iter_unpack(data)
@@ -1,10 +1,15 @@
-from collections import OrderedDict, defaultdict
+import heapq
+from collections import OrderedDict, deque
+
+from .page_table import PageTable
 
 class FIFOReplacer:
     """FIFO Page Replacement"""
     def __init__(self, num_frames):
         self.num_frames = num_frames
-        self.frames = []
+        # Arrival order; hits do not reorder. An OrderedDict rather than a
+        # list, so the hit check and eviction are O(1) instead of O(frames)
+        self.frames = OrderedDict()
     
     def access(self, page_num):
         """Access page, returns (victim, is_fault)"""
@@ -13,10 +18,16 @@ class FIFOReplacer:
         
         victim = None
         if len(self.frames) >= self.num_frames:
-            victim = self.frames.pop(0)
+            victim, _ = self.frames.popitem(last=False)
         
-        self.frames.append(page_num)
+        self.frames[page_num] = True
         return victim, True
+    
+    def repeat(self, page_num, times):
+        """Repeated hits leave arrival order unchanged"""
+    
+    def tick(self):
+        """No reference bits to sample"""
 
 class LRUReplacer:
     """LRU Page Replacement"""
@@ -36,80 +47,820 @@ class LRUReplacer:
         
         self.frames[page_num] = True
         return victim, True
+    
+    def repeat(self, page_num, times):
+        """Page is already most recently used; nothing changes"""
+    
+    def tick(self):
+        """No reference bits to sample"""
+
+class _FreqBucket:
+    """Node in LFU's frequency list; holds pages in recency order, each
+    mapped to the time of its last access"""
+    __slots__ = ('freq', 'pages', 'prev', 'next')
+    
+    def __init__(self, freq):
+        self.freq = freq
+        self.pages = OrderedDict()
+        self.prev = self
+        self.next = self
 
 class LFUReplacer:
-    """LFU Page Replacement"""
-    def __init__(self, num_frames):
+    """LFU Page Replacement
+    
+    Frequency buckets form a doubly linked list in increasing count order,
+    so hits and evictions are O(1). Pages within a bucket are kept in LRU
+    order; tie_break='MRU' evicts the most recent page of the lowest bucket
+    instead. With keep_history, counts of evicted pages are remembered (up to
+    history_size pages, by default four times num_frames) and restored when
+    the page is loaded again. With decay_interval, all counts are halved
+    every that many accesses.
+    """
+    def __init__(self, num_frames, keep_history=False, history_size=None,
+                 decay_interval=0, tie_break='LRU'):
         self.num_frames = num_frames
-        self.frames = set()
-        self.frequency = defaultdict(int)
+        self.keep_history = keep_history
+        self.history_size = history_size if history_size is not None else 4 * num_frames
+        self.decay_interval = decay_interval
+        self.tie_break = tie_break
+        
+        self.head = _FreqBucket(0)  # Sentinel; head.next has the lowest count
+        self.buckets = {}           # freq -> bucket
+        self.frames = {}            # resident page -> bucket
+        self.history = OrderedDict()  # evicted page -> count
+        self.accesses = 0
+    
+    @property
+    def frequency(self):
+        """Current count of every resident page"""
+        return {page: bucket.freq for page, bucket in self.frames.items()}
+    
+    def _bucket_after(self, prev, freq):
+        """Get bucket for freq, creating it right after prev if missing"""
+        bucket = self.buckets.get(freq)
+        if bucket is None:
+            bucket = _FreqBucket(freq)
+            bucket.prev = prev
+            bucket.next = prev.next
+            prev.next.prev = bucket
+            prev.next = bucket
+            self.buckets[freq] = bucket
+        return bucket
+    
+    def _unlink_if_empty(self, bucket):
+        """Drop bucket from the list once its last page leaves"""
+        if not bucket.pages:
+            bucket.prev.next = bucket.next
+            bucket.next.prev = bucket.prev
+            del self.buckets[bucket.freq]
+    
+    def _find_prev(self, freq, start=None):
+        """Last bucket with count below freq (walks up from start, by default the low end)"""
+        prev = self.head if start is None else start
+        while prev.next is not self.head and prev.next.freq < freq:
+            prev = prev.next
+        return prev
+    
+    def _place(self, page_num, freq, prev=None):
+        """Put page into the bucket for freq"""
+        if prev is None:
+            prev = self._find_prev(freq)
+        bucket = self._bucket_after(prev, freq)
+        bucket.pages[page_num] = self.accesses
+        self.frames[page_num] = bucket
     
     def access(self, page_num):
         """Access page, returns (victim, is_fault)"""
-        if page_num in self.frames:
-            self.frequency[page_num] += 1
+        self.accesses += 1
+        if self.decay_interval and self.accesses % self.decay_interval == 0:
+            self.decay()
+        
+        bucket = self.frames.get(page_num)
+        if bucket is not None:
+            del bucket.pages[page_num]
+            target = self._bucket_after(bucket, bucket.freq + 1)
+            target.pages[page_num] = self.accesses
+            self.frames[page_num] = target
+            self._unlink_if_empty(bucket)
             return None, False
         
         victim = None
         if len(self.frames) >= self.num_frames:
-            victim = min(self.frames, key=lambda x: self.frequency[x])
-            self.frames.remove(victim)
-            del self.frequency[victim]
+            victim = self._evict()
         
-        self.frames.add(page_num)
-        self.frequency[page_num] = 1
+        freq = 1
+        if self.keep_history:
+            freq += self.history.pop(page_num, 0)
+        self._place(page_num, freq, self.head if freq == 1 else None)
         return victim, True
+    
+    def repeat(self, page_num, times):
+        """Record further consecutive accesses to a resident page
+        
+        The count moves up by times in one step; only accesses that fall
+        on a decay are replayed one by one.
+        """
+        while times:
+            if self.decay_interval:
+                # Accesses left before the next one that decays
+                step = min(times, self.decay_interval - 1 - self.accesses % self.decay_interval)
+            else:
+                step = times
+            if step:
+                self._bump(page_num, step)
+                times -= step
+            if times:
+                self.access(page_num)
+                times -= 1
+    
+    def _bump(self, page_num, times):
+        """Add times accesses to a resident page's count"""
+        self.accesses += times
+        bucket = self.frames[page_num]
+        del bucket.pages[page_num]
+        freq = bucket.freq + times
+        target = self._bucket_after(self._find_prev(freq, bucket), freq)
+        target.pages[page_num] = self.accesses
+        self.frames[page_num] = target
+        self._unlink_if_empty(bucket)
+    
+    def tick(self):
+        """No reference bits to sample"""
+    
+    def _evict(self):
+        """Remove and return a page from the lowest-count bucket"""
+        bucket = self.head.next
+        victim, _ = bucket.pages.popitem(last=(self.tie_break == 'MRU'))
+        del self.frames[victim]
+        self._unlink_if_empty(bucket)
+        
+        if self.keep_history:
+            self.history[victim] = bucket.freq
+            if len(self.history) > self.history_size:
+                self.history.popitem(last=False)
+        return victim
+    
+    def decay(self):
+        """Halve every count; buckets that merge keep their pages in last-access order"""
+        groups = []                 # (halved count, pages of the buckets merging into it)
+        bucket = self.head.next
+        while bucket is not self.head:
+            freq = max(1, bucket.freq // 2)
+            if groups and groups[-1][0] == freq:
+                groups[-1][1].append(bucket.pages)
+            else:
+                groups.append((freq, [bucket.pages]))
+            bucket = bucket.next
+        
+        self.head = _FreqBucket(0)
+        self.buckets = {}
+        self.frames = {}
+        tail = self.head
+        for freq, merged in groups:
+            # Counts stay non-decreasing, so buckets are appended in order
+            tail = self._bucket_after(tail, freq)
+            # Each bucket is already ordered by access time
+            for page, stamp in heapq.merge(*(pages.items() for pages in merged),
+                                           key=lambda item: item[1]):
+                tail.pages[page] = stamp
+                self.frames[page] = tail
+        
+        for page in list(self.history):
+            freq = self.history[page] // 2
+            if freq:
+                self.history[page] = freq
+            else:
+                del self.history[page]
 
 class OptimalReplacer:
     """Optimal Page Replacement"""
     def __init__(self, num_frames, future_refs=None):
         self.num_frames = num_frames
-        self.frames = set()
         self.future_refs = future_refs or []
         self.current_index = 0
+        self.next_use = self._build_next_use(self.future_refs)
+        self.future_length = len(self.next_use)
+        # Resident pages -> position of their next reference
+        self.frames = {}
+        # Max-heap on next use; stale entries are skipped lazily
+        self.heap = []
+    
+    @staticmethod
+    def _build_next_use(refs):
+        """Next occurrence of each reference, in one backward pass"""
+        never = len(refs)
+        next_use = [never] * never
+        last_seen = {}
+        for i in range(never - 1, -1, -1):
+            page = refs[i]
+            next_use[i] = last_seen.get(page, never)
+            last_seen[page] = i
+        return next_use
+    
+    def _next_use_of(self, page_num):
+        """Position of the next reference to page after the current one"""
+        i = self.current_index
+        if i < len(self.next_use) and self.future_refs[i] == page_num:
+            return self.next_use[i]
+        # Reference is off the known trace: no future use can be predicted
+        return len(self.next_use)
+    
+    def _push(self, page_num):
+        """Record page's next use and index it in the heap"""
+        next_use = self._next_use_of(page_num)
+        self.frames[page_num] = next_use
+        heapq.heappush(self.heap, (-next_use, page_num))
+        if len(self.heap) > 4 * self.num_frames + 64:
+            self.heap = [(-n, p) for p, n in self.frames.items()]
+            heapq.heapify(self.heap)
     
     def access(self, page_num):
         """Access page, returns (victim, is_fault)"""
         if page_num in self.frames:
+            self._push(page_num)
             self.current_index += 1
             return None, False
         
         victim = None
         if len(self.frames) >= self.num_frames:
             victim = self._find_optimal_victim()
-            self.frames.remove(victim)
+            del self.frames[victim]
         
-        self.frames.add(page_num)
+        self._push(page_num)
         self.current_index += 1
         return victim, True
     
+    def repeat(self, page_num, times):
+        """Record further consecutive accesses to a resident page"""
+        if times:
+            # Only the last reference of the run decides the next use
+            self.current_index += times - 1
+            self._push(page_num)
+            self.current_index += 1
+    
+    def tick(self):
+        """No reference bits to sample"""
+    
+    def __getstate__(self):
+        """Pickled without the trace; set_future rebinds it after loading"""
+        state = self.__dict__.copy()
+        state['future_refs'] = []
+        state['next_use'] = []
+        state['future_length'] = len(self.next_use)
+        return state
+    
+    def set_future(self, future_refs, next_use=None):
+        """Bind the trace being simulated (next_use is rebuilt unless given)"""
+        self.future_refs = future_refs
+        self.next_use = next_use if next_use is not None else self._build_next_use(future_refs)
+        self.future_length = len(self.next_use)
+    
     def _find_optimal_victim(self):
         """Find page that won't be used for longest time"""
-        future = self.future_refs[self.current_index + 1:]
-        farthest = -1
+        heap = self.heap
+        while True:
+            neg_next, page = heapq.heappop(heap)
+            if self.frames.get(page) == -neg_next:
+                return page
+
+class ARCReplacer:
+    """Adaptive Replacement Cache
+    
+    T1 holds pages seen once recently, T2 pages seen at least twice; B1 and
+    B2 remember pages recently evicted from each. A hit in a ghost list
+    moves the target size p of T1 towards the list that would have kept
+    the page. Ghost lists are bounded so at most 2 * num_frames pages are
+    tracked.
+    """
+    def __init__(self, num_frames):
+        self.num_frames = num_frames
+        self.p = 0                  # Target size of T1
+        self.t1 = OrderedDict()     # Resident, seen once (LRU first)
+        self.t2 = OrderedDict()     # Resident, seen more than once
+        self.b1 = OrderedDict()     # Ghosts evicted from T1
+        self.b2 = OrderedDict()     # Ghosts evicted from T2
+    
+    @property
+    def frames(self):
+        """Resident pages"""
+        return list(self.t1) + list(self.t2)
+    
+    def _replace(self, in_b2):
+        """Evict from T1 or T2 according to p, remembering the victim"""
+        if self.t1 and (len(self.t1) > self.p or (in_b2 and len(self.t1) == self.p)):
+            victim, _ = self.t1.popitem(last=False)
+            self.b1[victim] = True
+        else:
+            victim, _ = self.t2.popitem(last=False)
+            self.b2[victim] = True
+        return victim
+    
+    def access(self, page_num):
+        """Access page, returns (victim, is_fault)"""
+        c = self.num_frames
+        if page_num in self.t2:
+            self.t2.move_to_end(page_num)
+            return None, False
+        if page_num in self.t1:
+            del self.t1[page_num]
+            self.t2[page_num] = True
+            return None, False
+        
+        full = len(self.t1) + len(self.t2) >= c
         victim = None
+        if page_num in self.b1:
+            self.p = min(c, self.p + max(len(self.b2) // len(self.b1), 1))
+            del self.b1[page_num]
+            if full:
+                victim = self._replace(False)
+            self.t2[page_num] = True
+            return victim, True
+        if page_num in self.b2:
+            self.p = max(0, self.p - max(len(self.b1) // len(self.b2), 1))
+            del self.b2[page_num]
+            if full:
+                victim = self._replace(True)
+            self.t2[page_num] = True
+            return victim, True
         
-        for page in self.frames:
-            try:
-                next_use = future.index(page)
-            except ValueError:
-                return page
-            
-            if next_use > farthest:
-                farthest = next_use
-                victim = page
+        if len(self.t1) + len(self.b1) >= c:
+            if len(self.t1) < c:
+                self.b1.popitem(last=False)
+                if full:
+                    victim = self._replace(False)
+            else:
+                victim, _ = self.t1.popitem(last=False)
+        elif full:
+            if len(self.t1) + len(self.t2) + len(self.b1) + len(self.b2) >= 2 * c:
+                self.b2.popitem(last=False)
+            victim = self._replace(False)
+        self.t1[page_num] = True
+        return victim, True
+    
+    def repeat(self, page_num, times):
+        """A second hit promotes a T1 page to T2; later ones change nothing"""
+        if times:
+            self.access(page_num)
+    
+    def tick(self):
+        """No reference bits to sample"""
+
+class TwoQReplacer:
+    """2Q Page Replacement
+    
+    New pages enter the FIFO A1in; pages evicted from it are remembered in
+    the ghost FIFO A1out, and only a reference found there admits a page
+    to the LRU main queue Am. A one-pass scan therefore cycles through
+    A1in without disturbing Am.
+    """
+    def __init__(self, num_frames, kin=0.25, kout=0.5):
+        self.num_frames = num_frames
+        self.kin = max(1, int(num_frames * kin))
+        self.kout = max(1, int(num_frames * kout))
+        self.a1in = OrderedDict()   # Resident FIFO (oldest first)
+        self.a1out = OrderedDict()  # Ghost FIFO
+        self.am = OrderedDict()     # Resident LRU
+    
+    @property
+    def frames(self):
+        """Resident pages"""
+        return list(self.a1in) + list(self.am)
+    
+    def _reclaim(self):
+        """Free a frame if memory is full, returns the victim or None"""
+        if len(self.a1in) + len(self.am) < self.num_frames:
+            return None
+        if len(self.a1in) > self.kin or not self.am:
+            victim, _ = self.a1in.popitem(last=False)
+            self.a1out[victim] = True
+            if len(self.a1out) > self.kout:
+                self.a1out.popitem(last=False)
+        else:
+            victim, _ = self.am.popitem(last=False)
+        return victim
+    
+    def access(self, page_num):
+        """Access page, returns (victim, is_fault)"""
+        if page_num in self.am:
+            self.am.move_to_end(page_num)
+            return None, False
+        if page_num in self.a1in:
+            return None, False
+        
+        victim = self._reclaim()
+        if page_num in self.a1out:
+            del self.a1out[page_num]
+            self.am[page_num] = True
+        else:
+            self.a1in[page_num] = True
+        return victim, True
+    
+    def repeat(self, page_num, times):
+        """Repeated hits leave both queues unchanged"""
+    
+    def tick(self):
+        """No reference bits to sample"""
+
+class LIRSReplacer:
+    """Low Inter-reference Recency Set Page Replacement
+    
+    Pages with a short reuse distance are LIR and stay resident; the rest
+    are HIR and only a small share of frames (hir_ratio) holds them, in
+    the FIFO queue Q. The recency stack S orders LIR and recently seen HIR
+    pages, and always has a LIR page at the bottom. Non-resident HIR pages
+    kept in S are capped at ghost_ratio * num_frames.
+    """
+    LIR = 0
+    HIR = 1
+    
+    def __init__(self, num_frames, hir_ratio=0.01, ghost_ratio=2):
+        self.num_frames = num_frames
+        self.hir_size = min(max(1, int(num_frames * hir_ratio)), num_frames - 1)
+        self.lir_size = num_frames - self.hir_size
+        self.ghost_size = max(1, int(num_frames * ghost_ratio))
+        self.stack = OrderedDict()      # S: page -> True (bottom first)
+        self.queue = OrderedDict()      # Q: resident HIR pages (front first)
+        self.status = {}                # page -> LIR/HIR, for pages in S or Q
+        self.nonresident = OrderedDict()  # HIR pages in S that were evicted
+        self.lir_count = 0
+        self.resident = 0
+    
+    @property
+    def frames(self):
+        """Resident pages"""
+        return [p for p in self.status if p not in self.nonresident]
+    
+    def _prune(self):
+        """Pop HIR pages off the bottom of S until a LIR page is there"""
+        stack = self.stack
+        while stack:
+            bottom = next(iter(stack))
+            if self.status[bottom] == self.LIR:
+                break
+            del stack[bottom]
+            if bottom in self.nonresident:
+                del self.nonresident[bottom]
+                del self.status[bottom]
+    
+    def _demote_bottom(self):
+        """Turn the bottom LIR page of S into a resident HIR page"""
+        bottom, _ = self.stack.popitem(last=False)
+        self.status[bottom] = self.HIR
+        self.queue[bottom] = True
+        self.lir_count -= 1
+        self._prune()
+    
+    def _promote(self, page_num):
+        """Make page LIR at the top of S, demoting the bottom LIR page"""
+        self.stack.pop(page_num, None)
+        self.stack[page_num] = True
+        self.status[page_num] = self.LIR
+        self.lir_count += 1
+        self._demote_bottom()
+    
+    def _evict(self):
+        """Evict the front of Q, returns the victim"""
+        if not self.queue:
+            self._demote_bottom()
+        victim, _ = self.queue.popitem(last=False)
+        self.resident -= 1
+        if victim in self.stack:
+            self.nonresident[victim] = True
+            if len(self.nonresident) > self.ghost_size:
+                old, _ = self.nonresident.popitem(last=False)
+                del self.stack[old]
+                del self.status[old]
+        else:
+            del self.status[victim]
+        return victim
+    
+    def access(self, page_num):
+        """Access page, returns (victim, is_fault)"""
+        stack = self.stack
+        state = self.status.get(page_num)
         
-        return victim if victim else list(self.frames)[0]
+        if state == self.LIR:
+            was_bottom = next(iter(stack)) == page_num
+            stack.move_to_end(page_num)
+            if was_bottom:
+                self._prune()
+            return None, False
+        
+        if state == self.HIR and page_num not in self.nonresident:
+            del self.queue[page_num]
+            if page_num in stack:
+                self._promote(page_num)
+            else:
+                stack[page_num] = True
+                self.queue[page_num] = True
+            return None, False
+        
+        victim = None
+        if self.resident >= self.num_frames:
+            victim = self._evict()
+        self.resident += 1
+        
+        if page_num in self.nonresident:
+            del self.nonresident[page_num]
+            self._promote(page_num)
+        elif self.lir_count < self.lir_size:
+            # Warm-up: the first pages fill the LIR set
+            stack[page_num] = True
+            self.status[page_num] = self.LIR
+            self.lir_count += 1
+        else:
+            stack[page_num] = True
+            self.status[page_num] = self.HIR
+            self.queue[page_num] = True
+        return victim, True
+    
+    def repeat(self, page_num, times):
+        """A second hit promotes a HIR page to LIR; later ones change nothing"""
+        if times:
+            self.access(page_num)
+    
+    def tick(self):
+        """No reference bits to sample"""
 
-def get_replacer(algorithm, num_frames, future_refs=None):
-    """Factory function to get replacer"""
+class _ReferenceBitReplacer:
+    """Base for replacers driven by page-table referenced and dirty bits
+    
+    MemoryManager sets the bits on every access and clears referenced bits
+    on each tick; these replacers only read them (CLOCK-style sweeps also
+    clear them). Without a page_table the replacer keeps a private one and
+    sets the bits itself, so it can be driven on its own too.
+    """
+    def __init__(self, num_frames, page_table=None):
+        self.num_frames = num_frames
+        self.own_table = page_table is None
+        self.page_table = PageTable() if page_table is None else page_table
+        self.scans = 0              # Pages examined while choosing victims
+        self.bits_cleared = 0       # Referenced bits cleared while choosing victims
+    
+    def _hit(self, page_num):
+        if self.own_table:
+            self.page_table.touch(page_num)
+    
+    def _load(self, page_num):
+        if self.own_table:
+            self.page_table.insert(page_num, 0)
+            self.page_table.touch(page_num)
+    
+    def _drop(self, page_num):
+        if self.own_table:
+            self.page_table.remove(page_num)
+    
+    def repeat(self, page_num, times):
+        """Referenced bit is already set; nothing changes"""
+    
+    def tick(self):
+        """Periodic tick, called before referenced bits are cleared"""
+        self._sample()
+        if self.own_table:
+            for page in self.frames:
+                self.page_table.clear_referenced(page)
+    
+    def _sample(self):
+        """Read bits at a tick (subclasses)"""
+
+class ClockReplacer(_ReferenceBitReplacer):
+    """CLOCK Page Replacement
+    
+    Frames form a ring swept by a hand: a referenced page has its bit
+    cleared and is skipped, the first unreferenced page is the victim.
+    """
+    def __init__(self, num_frames, page_table=None):
+        super().__init__(num_frames, page_table)
+        self.ring = []              # Pages in clock order
+        self.slot_of = {}           # page -> ring index
+        self.hand = 0
+    
+    @property
+    def frames(self):
+        """Resident pages"""
+        return list(self.slot_of)
+    
+    def access(self, page_num):
+        """Access page, returns (victim, is_fault)"""
+        if page_num in self.slot_of:
+            self._hit(page_num)
+            return None, False
+        
+        victim = None
+        if len(self.ring) < self.num_frames:
+            self.slot_of[page_num] = len(self.ring)
+            self.ring.append(page_num)
+        else:
+            slot = self._sweep()
+            victim = self.ring[slot]
+            del self.slot_of[victim]
+            self._drop(victim)
+            self.ring[slot] = page_num
+            self.slot_of[page_num] = slot
+            self.hand = (slot + 1) % len(self.ring)
+        self._load(page_num)
+        return victim, True
+    
+    def _sweep(self):
+        """Advance the hand to the victim's slot, clearing referenced bits"""
+        page_table = self.page_table
+        ring = self.ring
+        hand = self.hand
+        while True:
+            self.scans += 1
+            page = ring[hand]
+            if not page_table.is_referenced(page):
+                return hand
+            page_table.clear_referenced(page)
+            self.bits_cleared += 1
+            hand = (hand + 1) % len(ring)
+
+class SecondChanceReplacer(ClockReplacer):
+    """Enhanced second-chance Page Replacement
+    
+    A CLOCK sweep that also looks at the dirty bit, preferring pages that
+    are neither referenced nor dirty, then unreferenced dirty pages, so
+    clean pages are evicted before ones that need a write-back.
+    """
+    def _sweep(self):
+        """Find the victim's slot in up to two rounds of two passes
+        
+        The first pass looks for an unreferenced clean page without
+        clearing bits; the second for an unreferenced dirty page, clearing
+        referenced bits as it goes, so the next round always succeeds.
+        """
+        page_table = self.page_table
+        ring = self.ring
+        n = len(ring)
+        hand = self.hand
+        while True:
+            for _ in range(n):
+                self.scans += 1
+                page = ring[hand]
+                if not page_table.is_referenced(page) and not page_table.is_dirty(page):
+                    return hand
+                hand = (hand + 1) % n
+            for _ in range(n):
+                self.scans += 1
+                page = ring[hand]
+                if not page_table.is_referenced(page):
+                    return hand
+                page_table.clear_referenced(page)
+                self.bits_cleared += 1
+                hand = (hand + 1) % n
+
+class NRUReplacer(_ReferenceBitReplacer):
+    """Not Recently Used Page Replacement
+    
+    Pages fall in four classes by (referenced, dirty); the victim is the
+    oldest page of the lowest non-empty class. Pages are refiled at every
+    tick. Between ticks bits are only ever set, so a page found filed too
+    low is moved up when examined and eviction stays amortized O(1).
+    """
+    def __init__(self, num_frames, page_table=None):
+        super().__init__(num_frames, page_table)
+        self.classes = [deque() for _ in range(4)]
+        self.filed = {}             # resident page -> class it is filed in
+    
+    @property
+    def frames(self):
+        """Resident pages"""
+        return list(self.filed)
+    
+    def _class_of(self, page_num):
+        return (2 if self.page_table.is_referenced(page_num) else 0) + \
+            (1 if self.page_table.is_dirty(page_num) else 0)
+    
+    def access(self, page_num):
+        """Access page, returns (victim, is_fault)"""
+        if page_num in self.filed:
+            self._hit(page_num)
+            return None, False
+        
+        victim = None
+        if len(self.filed) >= self.num_frames:
+            victim = self._evict()
+            self._drop(victim)
+        # Being accessed, the page is at least referenced
+        self.filed[page_num] = 2
+        self.classes[2].append(page_num)
+        self._load(page_num)
+        return victim, True
+    
+    def _evict(self):
+        """Remove and return the oldest page of the lowest class"""
+        for cls, queue in enumerate(self.classes):
+            while queue:
+                page = queue.popleft()
+                if self.filed.get(page) != cls:
+                    continue        # Evicted or refiled since
+                self.scans += 1
+                actual = self._class_of(page)
+                if actual == cls:
+                    del self.filed[page]
+                    return page
+                self.filed[page] = actual
+                self.classes[actual].append(page)
+    
+    def _sample(self):
+        """Refile every page as unreferenced, as its bit is about to be cleared"""
+        classes = [deque() for _ in range(4)]
+        filed = {}
+        for queue in self.classes:
+            for page in queue:
+                # Skip stale entries of evicted or already refiled pages
+                if page in self.filed and page not in filed:
+                    cls = 1 if self.page_table.is_dirty(page) else 0
+                    filed[page] = cls
+                    classes[cls].append(page)
+        self.classes = classes
+        self.filed = filed
+
+class AgingReplacer(_ReferenceBitReplacer):
+    """Aging Page Replacement
+    
+    Each page has a counter_bits-wide shift register. At every tick it is
+    shifted right and the page's referenced bit enters at the top; the
+    victim is the page with the smallest counter, oldest first on ties.
+    Pages are bucketed by counter value, so eviction looks at no more than
+    2**counter_bits buckets and a tick costs one step per resident page.
+    New pages start as if referenced in the current interval.
+    """
+    def __init__(self, num_frames, page_table=None, counter_bits=8):
+        super().__init__(num_frames, page_table)
+        self.top = 1 << (counter_bits - 1)
+        self.counter = {}           # resident page -> counter
+        self.buckets = {}           # counter -> OrderedDict of pages
+    
+    @property
+    def frames(self):
+        """Resident pages"""
+        return list(self.counter)
+    
+    def _file(self, page_num, value):
+        self.counter[page_num] = value
+        bucket = self.buckets.get(value)
+        if bucket is None:
+            bucket = self.buckets[value] = OrderedDict()
+        bucket[page_num] = True
+    
+    def access(self, page_num):
+        """Access page, returns (victim, is_fault)"""
+        if page_num in self.counter:
+            self._hit(page_num)
+            return None, False
+        
+        victim = None
+        if len(self.counter) >= self.num_frames:
+            self.scans += 1
+            value = min(self.buckets)
+            bucket = self.buckets[value]
+            victim, _ = bucket.popitem(last=False)
+            if not bucket:
+                del self.buckets[value]
+            del self.counter[victim]
+            self._drop(victim)
+        self._file(page_num, self.top)
+        self._load(page_num)
+        return victim, True
+    
+    def _sample(self):
+        """Shift every counter, entering the referenced bit at the top"""
+        old = self.buckets
+        self.buckets = {}
+        is_referenced = self.page_table.is_referenced
+        for value in sorted(old):
+            for page in old[value]:
+                self._file(page, (value >> 1) | (self.top if is_referenced(page) else 0))
+
+def get_replacer(algorithm, num_frames, future_refs=None, page_table=None, **options):
+    """Factory function to get replacer
+    
+    page_table supplies the referenced and dirty bits for CLOCK,
+    SecondChance, NRU and Aging. Extra keyword options are passed to
+    replacers that take them (LFU, Aging).
+    """
     if algorithm == 'FIFO':
         return FIFOReplacer(num_frames)
     elif algorithm == 'LRU':
         return LRUReplacer(num_frames)
     elif algorithm == 'LFU':
-        return LFUReplacer(num_frames)
+        return LFUReplacer(num_frames, **options)
     elif algorithm == 'Optimal':
         return OptimalReplacer(num_frames, future_refs)
+    elif algorithm == 'ARC':
+        return ARCReplacer(num_frames)
+    elif algorithm == '2Q':
+        return TwoQReplacer(num_frames)
+    elif algorithm == 'LIRS':
+        return LIRSReplacer(num_frames)
+    elif algorithm == 'CLOCK':
+        return ClockReplacer(num_frames, page_table)
+    elif algorithm == 'SecondChance':
+        return SecondChanceReplacer(num_frames, page_table)
+    elif algorithm == 'NRU':
+        return NRUReplacer(num_frames, page_table)
+    elif algorithm == 'Aging':
+        return AgingReplacer(num_frames, page_table, **options)
     else:
         return LRUReplacer(num_frames)
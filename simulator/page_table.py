@@ -1,17 +1,35 @@
+from array import array
+
+# Flag bits packed below the frame number in array-backed entries
+VALID = 1
+DIRTY = 2
+REFERENCED = 4
+FLAG_BITS = 3
+
 class PageTableEntry:
     """Single page table entry"""
     def __init__(self):
         self.valid = False
         self.frame_number = None
         self.dirty = False
+        self.referenced = False
 
 class PageTable:
     """Simple page table"""
+    ENTRY_SIZE = 8
+    
     def __init__(self):
         self.table = {}
+        self.walks = 0
+        self.walk_steps = 0
+        self.bytes_touched = 0
+        self.last_walk_levels = 1
     
     def get_frame(self, page_num):
         """Get frame number for page"""
+        self.walks += 1
+        self.walk_steps += 1
+        self.bytes_touched += self.ENTRY_SIZE
         if page_num in self.table and self.table[page_num].valid:
             return self.table[page_num].frame_number
         return None
@@ -22,12 +40,44 @@ class PageTable:
             self.table[page_num] = PageTableEntry()
         self.table[page_num].valid = True
         self.table[page_num].frame_number = frame_num
+        self.table[page_num].dirty = False
+        self.table[page_num].referenced = False
     
     def remove(self, page_num):
         """Remove page mapping"""
         if page_num in self.table:
             self.table[page_num].valid = False
     
+    def mark_dirty(self, page_num):
+        """Set the dirty bit of a mapped page"""
+        entry = self.table.get(page_num)
+        if entry is not None and entry.valid:
+            entry.dirty = True
+    
+    def is_dirty(self, page_num):
+        """True if a mapped page has been written"""
+        entry = self.table.get(page_num)
+        return entry is not None and entry.valid and entry.dirty
+    
+    def touch(self, page_num, write=False):
+        """Set the referenced bit (and the dirty bit for a write) of a mapped page"""
+        entry = self.table.get(page_num)
+        if entry is not None and entry.valid:
+            entry.referenced = True
+            if write:
+                entry.dirty = True
+    
+    def is_referenced(self, page_num):
+        """True if a mapped page was accessed since its bit was last cleared"""
+        entry = self.table.get(page_num)
+        return entry is not None and entry.valid and entry.referenced
+    
+    def clear_referenced(self, page_num):
+        """Clear the referenced bit of a page"""
+        entry = self.table.get(page_num)
+        if entry is not None:
+            entry.referenced = False
+    
     def get_all_mappings(self):
         """Get all valid page-to-frame mappings"""
         mappings = []
@@ -35,3 +85,381 @@ class PageTable:
             if entry.valid:
                 mappings.append((page, entry.frame_number))
         return mappings
+    
+    def memory_bytes(self):
+        """Size of the table if stored as one entry per page seen"""
+        return len(self.table) * self.ENTRY_SIZE
+    
+    def __getstate__(self):
+        """Picklable state (see checkpoint.py) with the entries packed
+        
+        Every page ever seen keeps an entry, so pickling one object per
+        entry would make snapshots of long runs slow. Unmapped entries only
+        record that their page was seen; their other fields are never read.
+        """
+        state = self.__dict__.copy()
+        state['table'] = (array('q', self.table),
+                          [(page, entry.frame_number, entry.dirty, entry.referenced)
+                           for page, entry in self.table.items() if entry.valid])
+        return state
+    
+    def __setstate__(self, state):
+        pages, mapped = state['table']
+        table = {page: PageTableEntry() for page in pages}
+        for page, frame_num, dirty, referenced in mapped:
+            entry = table[page]
+            entry.valid = True
+            entry.frame_number = frame_num
+            entry.dirty = dirty
+            entry.referenced = referenced
+        state['table'] = table
+        self.__dict__.update(state)
+
+class CompactPageTable:
+    """Page table packed into typed arrays
+    
+    Entries live in an open-addressing hash table made of two array('q')s:
+    page numbers and packed values (frame number shifted left by 3 over the
+    valid, dirty and referenced bits). Removing a mapping frees its slot and
+    the arrays shrink as the table empties, so memory tracks the number of
+    mapped pages rather than every page ever seen. A key of -1 marks an
+    empty slot, so negative page numbers raise ValueError.
+    """
+    ENTRY_SIZE = 8
+    MIN_BITS = 3
+    
+    def __init__(self):
+        self.count = 0
+        self._allocate(self.MIN_BITS)
+        self.walks = 0
+        self.walk_steps = 0
+        self.bytes_touched = 0
+        self.last_walk_levels = 1
+    
+    def _allocate(self, bits):
+        """Create empty slot arrays with 2**bits slots"""
+        self.bits = bits
+        self.mask = (1 << bits) - 1
+        self.keys = array('q', [-1]) * (1 << bits)
+        self.values = array('q', [0]) * (1 << bits)
+    
+    def _slot(self, page_num):
+        """Home slot of page (Fibonacci hashing)"""
+        return ((page_num * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> (64 - self.bits)
+    
+    def _find(self, page_num):
+        """Slot holding page, or -1"""
+        if page_num < 0:
+            raise ValueError(f"Negative page number: {page_num}")
+        keys = self.keys
+        mask = self.mask
+        i = self._slot(page_num)
+        while True:
+            key = keys[i]
+            if key == page_num:
+                return i
+            if key < 0:
+                return -1
+            i = (i + 1) & mask
+    
+    def _resize(self, bits):
+        """Rehash every entry into 2**bits slots"""
+        old = [(k, v) for k, v in zip(self.keys, self.values) if k >= 0]
+        self._allocate(bits)
+        keys = self.keys
+        mask = self.mask
+        for key, value in old:
+            i = self._slot(key)
+            while keys[i] >= 0:
+                i = (i + 1) & mask
+            keys[i] = key
+            self.values[i] = value
+    
+    def get_frame(self, page_num):
+        """Get frame number for page"""
+        self.walks += 1
+        self.walk_steps += 1
+        self.bytes_touched += self.ENTRY_SIZE
+        i = self._find(page_num)
+        if i < 0:
+            return None
+        value = self.values[i]
+        if not value & VALID:
+            return None
+        return value >> FLAG_BITS
+    
+    def insert(self, page_num, frame_num):
+        """Insert page to frame mapping"""
+        i = self._find(page_num)
+        if i < 0:
+            # Keep load factor at or below 1/2
+            if (self.count + 1) * 2 > len(self.keys):
+                self._resize(self.bits + 1)
+            i = self._slot(page_num)
+            while self.keys[i] >= 0:
+                i = (i + 1) & self.mask
+            self.keys[i] = page_num
+            self.count += 1
+        self.values[i] = (frame_num << FLAG_BITS) | VALID
+    
+    def mark_dirty(self, page_num):
+        """Set the dirty bit of a mapped page"""
+        i = self._find(page_num)
+        if i >= 0:
+            self.values[i] |= DIRTY
+    
+    def is_dirty(self, page_num):
+        """True if a mapped page has been written"""
+        i = self._find(page_num)
+        return i >= 0 and bool(self.values[i] & DIRTY)
+    
+    def touch(self, page_num, write=False):
+        """Set the referenced bit (and the dirty bit for a write) of a mapped page"""
+        i = self._find(page_num)
+        if i >= 0:
+            self.values[i] |= (REFERENCED | DIRTY) if write else REFERENCED
+    
+    def is_referenced(self, page_num):
+        """True if a mapped page was accessed since its bit was last cleared"""
+        i = self._find(page_num)
+        return i >= 0 and bool(self.values[i] & REFERENCED)
+    
+    def clear_referenced(self, page_num):
+        """Clear the referenced bit of a page"""
+        i = self._find(page_num)
+        if i >= 0:
+            self.values[i] &= ~REFERENCED
+    
+    def remove(self, page_num):
+        """Remove page mapping and reclaim its slot"""
+        i = self._find(page_num)
+        if i < 0:
+            return
+        keys = self.keys
+        values = self.values
+        mask = self.mask
+        # Backward-shift deletion keeps probe chains intact without tombstones
+        j = i
+        while True:
+            j = (j + 1) & mask
+            key = keys[j]
+            if key < 0:
+                break
+            home = self._slot(key)
+            if (j - home) & mask >= (j - i) & mask:
+                keys[i] = key
+                values[i] = values[j]
+                i = j
+        keys[i] = -1
+        values[i] = 0
+        self.count -= 1
+        
+        # Shrink once the table is at most 1/8 full
+        if self.bits > self.MIN_BITS and self.count * 8 <= len(keys):
+            self._resize(self.bits - 1)
+    
+    def get_all_mappings(self):
+        """Get all valid page-to-frame mappings"""
+        mappings = []
+        for page, value in zip(self.keys, self.values):
+            if page >= 0 and value & VALID:
+                mappings.append((page, value >> FLAG_BITS))
+        mappings.sort()
+        return mappings
+    
+    def memory_bytes(self):
+        """Bytes held by the slot arrays"""
+        return (len(self.keys) + len(self.values)) * self.keys.itemsize
+
+class MultiLevelPageTable:
+    """Hierarchical (radix) page table
+    
+    level_bits gives how many bits of the page number each level indexes,
+    from the root down, e.g. (9, 9, 9, 9) for a 48-bit address space with
+    4 KB pages. Lower-level tables are allocated on first use and freed when
+    their last mapping is removed. Every table is an array('q'): directory
+    entries hold the id of the next table, leaf entries the frame number
+    packed above the flag bits, and -1 marks an empty entry.
+    """
+    ENTRY_SIZE = 8
+    
+    def __init__(self, level_bits=(10, 10)):
+        if not 2 <= len(level_bits) <= 5:
+            raise ValueError("Page table must have 2 to 5 levels")
+        if any(bits < 1 for bits in level_bits):
+            raise ValueError("Each level must index at least one bit")
+        
+        self.level_bits = tuple(level_bits)
+        self.levels = len(self.level_bits)
+        self.vpn_bits = sum(self.level_bits)
+        self.shifts = [sum(self.level_bits[i + 1:]) for i in range(self.levels)]
+        self.masks = [(1 << bits) - 1 for bits in self.level_bits]
+        
+        self.tables = []                               # table id -> array('q')
+        self.used = []                                 # table id -> non-empty entries
+        self.free_ids = [[] for _ in range(self.levels)]
+        self.table_bytes = 0
+        self.root = self._alloc(0)
+        
+        # Walk accounting
+        self.walks = 0
+        self.walk_steps = 0
+        self.bytes_touched = 0
+        self.last_walk_levels = 0
+    
+    def _alloc(self, level):
+        """Allocate an empty table for level, returns its id"""
+        size = 1 << self.level_bits[level]
+        table = array('q', [-1]) * size
+        self.table_bytes += size * self.ENTRY_SIZE
+        if self.free_ids[level]:
+            table_id = self.free_ids[level].pop()
+            self.tables[table_id] = table
+            self.used[table_id] = 0
+        else:
+            table_id = len(self.tables)
+            self.tables.append(table)
+            self.used.append(0)
+        return table_id
+    
+    def _free(self, table_id, level):
+        """Release an empty table"""
+        self.table_bytes -= len(self.tables[table_id]) * self.ENTRY_SIZE
+        self.tables[table_id] = None
+        self.free_ids[level].append(table_id)
+    
+    def _check(self, page_num):
+        if page_num < 0 or page_num >> self.vpn_bits:
+            raise ValueError(f"Page {page_num} is outside the {self.vpn_bits}-bit page number space")
+    
+    def get_frame(self, page_num):
+        """Walk the table for page, returns frame number or None"""
+        self._check(page_num)
+        tables = self.tables
+        table_id = self.root
+        steps = 0
+        entry = -1
+        for shift, mask in zip(self.shifts, self.masks):
+            steps += 1
+            entry = tables[table_id][(page_num >> shift) & mask]
+            if entry < 0:
+                break
+            table_id = entry
+        
+        self.walks += 1
+        self.walk_steps += steps
+        self.bytes_touched += steps * self.ENTRY_SIZE
+        self.last_walk_levels = steps
+        return entry >> FLAG_BITS if entry >= 0 else None
+    
+    def insert(self, page_num, frame_num):
+        """Insert page to frame mapping, allocating tables as needed"""
+        self._check(page_num)
+        table_id = self.root
+        last = self.levels - 1
+        for level in range(last):
+            table = self.tables[table_id]
+            index = (page_num >> self.shifts[level]) & self.masks[level]
+            child = table[index]
+            if child < 0:
+                child = self._alloc(level + 1)
+                table[index] = child
+                self.used[table_id] += 1
+            table_id = child
+        
+        leaf = self.tables[table_id]
+        index = page_num & self.masks[last]
+        if leaf[index] < 0:
+            self.used[table_id] += 1
+        leaf[index] = (frame_num << FLAG_BITS) | VALID
+    
+    def _leaf_slot(self, page_num):
+        """(leaf table, index) of page's entry, or None if unmapped"""
+        table_id = self.root
+        for level in range(self.levels - 1):
+            table_id = self.tables[table_id][(page_num >> self.shifts[level]) & self.masks[level]]
+            if table_id < 0:
+                return None
+        leaf = self.tables[table_id]
+        index = page_num & self.masks[-1]
+        return (leaf, index) if leaf[index] >= 0 else None
+    
+    def mark_dirty(self, page_num):
+        """Set the dirty bit of a mapped page"""
+        self._check(page_num)
+        slot = self._leaf_slot(page_num)
+        if slot:
+            leaf, index = slot
+            leaf[index] |= DIRTY
+    
+    def is_dirty(self, page_num):
+        """True if a mapped page has been written"""
+        self._check(page_num)
+        slot = self._leaf_slot(page_num)
+        return bool(slot) and bool(slot[0][slot[1]] & DIRTY)
+    
+    def touch(self, page_num, write=False):
+        """Set the referenced bit (and the dirty bit for a write) of a mapped page"""
+        self._check(page_num)
+        slot = self._leaf_slot(page_num)
+        if slot:
+            leaf, index = slot
+            leaf[index] |= (REFERENCED | DIRTY) if write else REFERENCED
+    
+    def is_referenced(self, page_num):
+        """True if a mapped page was accessed since its bit was last cleared"""
+        self._check(page_num)
+        slot = self._leaf_slot(page_num)
+        return bool(slot) and bool(slot[0][slot[1]] & REFERENCED)
+    
+    def clear_referenced(self, page_num):
+        """Clear the referenced bit of a page"""
+        self._check(page_num)
+        slot = self._leaf_slot(page_num)
+        if slot:
+            leaf, index = slot
+            leaf[index] &= ~REFERENCED
+    
+    def remove(self, page_num):
+        """Remove page mapping, freeing tables that become empty"""
+        self._check(page_num)
+        path = []
+        table_id = self.root
+        for level in range(self.levels):
+            index = (page_num >> self.shifts[level]) & self.masks[level]
+            entry = self.tables[table_id][index]
+            if entry < 0:
+                return
+            path.append((table_id, index))
+            table_id = entry
+        
+        for level in range(self.levels - 1, -1, -1):
+            table_id, index = path[level]
+            self.tables[table_id][index] = -1
+            self.used[table_id] -= 1
+            if self.used[table_id] or level == 0:
+                break
+            self._free(table_id, level)
+    
+    def get_all_mappings(self):
+        """Get all valid page-to-frame mappings"""
+        mappings = []
+        stack = [(self.root, 0, 0)]
+        while stack:
+            table_id, level, prefix = stack.pop()
+            table = self.tables[table_id]
+            bits = self.level_bits[level]
+            for index, entry in enumerate(table):
+                if entry < 0:
+                    continue
+                page = (prefix << bits) | index
+                if level == self.levels - 1:
+                    mappings.append((page, entry >> FLAG_BITS))
+                else:
+                    stack.append((entry, level + 1, page))
+        mappings.sort()
+        return mappings
+    
+    def memory_bytes(self):
+        """Bytes held by all allocated tables"""
+        return self.table_bytes
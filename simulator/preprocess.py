@@ -0,0 +1,90 @@
+"""
+Bulk trace preprocessing
+
+Address-to-page conversion and collapsing of repeated references are done
+over whole chunks, with NumPy when it is installed and plain arrays
+otherwise. A run of consecutive references to one page costs the
+simulator a single access plus a count: every repeat is a guaranteed TLB
+hit on a resident page.
+"""
+
+import sys
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def page_shift(page_size):
+    """log2(page_size), or None if page_size is not a power of two"""
+    if page_size > 0 and page_size & (page_size - 1) == 0:
+        return page_size.bit_length() - 1
+    return None
+
+def pages_from_addresses(addresses, page_size):
+    """Convert a sequence of byte addresses to an array('q') of page numbers"""
+    shift = page_shift(page_size)
+    if np is not None:
+        addrs = np.asarray(addresses, dtype=np.uint64)
+        pages = addrs >> np.uint64(shift) if shift is not None else addrs // np.uint64(page_size)
+        return array('q', pages.astype(np.int64).tobytes())
+    if shift is not None:
+        return array('q', (addr >> shift for addr in addresses))
+    return array('q', (addr // page_size for addr in addresses))
+
+def pages_from_bytes(buf, page_size):
+    """Decode raw little-endian uint64 addresses into page numbers"""
+    if np is not None:
+        return pages_from_addresses(np.frombuffer(buf, dtype='<u8'), page_size)
+    addrs = array('Q')
+    addrs.frombytes(buf)
+    if sys.byteorder != 'little':
+        addrs.byteswap()
+    return pages_from_addresses(addrs, page_size)
+
+def collapse_runs(pages, writes=None):
+    """Collapse consecutive repeats, returns (pages, counts, writes) arrays
+    
+    If write flags are given, a run's flags are the OR of its references'
+    (a run is a write when any of its references is); otherwise the
+    returned writes is None.
+    """
+    n = len(pages)
+    if n == 0:
+        return array('q'), array('q'), (bytearray() if writes is not None else None)
+    
+    if np is not None:
+        p = np.frombuffer(pages, dtype=np.int64) if isinstance(pages, array) else np.asarray(pages, dtype=np.int64)
+        starts = np.concatenate(([0], np.flatnonzero(p[1:] != p[:-1]) + 1))
+        counts = np.diff(np.append(starts, n))
+        run_writes = None
+        if writes is not None:
+            w = np.frombuffer(bytes(writes), dtype=np.uint8) if not isinstance(writes, np.ndarray) else writes
+            run_writes = bytearray(np.bitwise_or.reduceat(w, starts).astype(np.uint8).tobytes())
+        return (array('q', p[starts].tobytes()), array('q', counts.astype(np.int64).tobytes()),
+                run_writes)
+    
+    run_pages = array('q')
+    run_counts = array('q')
+    run_writes = bytearray() if writes is not None else None
+    current = pages[0]
+    count = 0
+    written = 0
+    for i, page in enumerate(pages):
+        if page != current:
+            run_pages.append(current)
+            run_counts.append(count)
+            if run_writes is not None:
+                run_writes.append(written)
+            current = page
+            count = 0
+            written = 0
+        count += 1
+        if writes is not None:
+            written |= writes[i]
+    run_pages.append(current)
+    run_counts.append(count)
+    if run_writes is not None:
+        run_writes.append(written)
+    return run_pages, run_counts, run_writes
@@ -0,0 +1,220 @@
+"""
+File-backed swap device
+
+A preallocated swap file is split into page_size slots and memory-mapped.
+Pages are given slots from a free list; their contents are written and
+read through memoryview slices of the mapping, so a page read does not
+copy. Optional batching groups queued write-outs by slot and issues each
+run of adjacent slots as one write, to measure how clustering changes
+I/O operations and seek distance.
+
+Once more than half the slots are in use, the memory managers release a
+page's slot when it is swapped back in and mark the page dirty instead, so
+slots stay bound to pages that are not resident (as Linux does when swap
+is filling up).
+"""
+
+import itertools
+import mmap
+import os
+import tempfile
+
+class SwapFullError(RuntimeError):
+    """Raised when every swap slot is in use"""
+
+class SwapFile:
+    """Swap device backed by a memory-mapped file of page-sized slots"""
+    def __init__(self, path=None, num_slots=1024, page_size=4096, batch_size=0):
+        self.num_slots = num_slots
+        self.page_size = page_size
+        # Queue this many write-outs before issuing them together (0: write immediately)
+        self.batch_size = batch_size
+        
+        self.temporary = path is None
+        self.path = path
+        self._open()
+        
+        self._reset_state()
+    
+    def _open(self):
+        """Create (or truncate) the swap file and map it"""
+        if self.temporary:
+            fd, self.path = tempfile.mkstemp(prefix='vmsim-swap-')
+            os.close(fd)
+        self.file = open(self.path, 'w+b')
+        self.file.truncate(self.num_slots * self.page_size)
+        self.map = mmap.mmap(self.file.fileno(), self.num_slots * self.page_size)
+        self.view = memoryview(self.map)
+    
+    def _reset_state(self):
+        self.slot_of = {}                                   # page -> slot
+        self.free_slots = list(range(self.num_slots - 1, -1, -1))
+        self.pending = {}                                   # slot -> data awaiting write
+        self.swap_in_count = 0
+        self.swap_out_count = 0
+        self.slots_released = 0
+        # I/O accounting
+        self.bytes_written = 0
+        self.bytes_read = 0
+        self.write_ops = 0
+        self.read_ops = 0
+        self.seek_distance = 0                              # Total |slot jump| between ops, in slots
+        self.sequential_ops = 0                             # Ops starting right after the previous one
+        self.head = 0                                       # Slot after the last op
+    
+    def _allocate(self, page_num):
+        """Slot for page, allocating one if it has none"""
+        slot = self.slot_of.get(page_num)
+        if slot is None:
+            if not self.free_slots:
+                raise SwapFullError(f"All {self.num_slots} swap slots are in use")
+            slot = self.free_slots.pop()
+            self.slot_of[page_num] = slot
+        return slot
+    
+    def _io(self, slot, slots):
+        """Account one I/O operation covering slots slots from slot"""
+        self.seek_distance += abs(slot - self.head)
+        if slot == self.head:
+            self.sequential_ops += 1
+        self.head = slot + slots
+    
+    def _slot_view(self, slot, slots=1):
+        start = slot * self.page_size
+        return self.view[start:start + slots * self.page_size]
+    
+    def swap_out(self, page_num, data=None):
+        """Swap page to disk, returns its slot
+        
+        data, if given, is the page contents (any bytes-like of page_size
+        bytes); without it only the I/O is accounted.
+        """
+        slot = self._allocate(page_num)
+        self.swap_out_count += 1
+        if self.batch_size:
+            self.pending[slot] = data
+            if len(self.pending) >= self.batch_size:
+                self.flush()
+        else:
+            self._write_run(slot, [data])
+        return slot
+    
+    def _write_run(self, slot, datas):
+        """Write pages into consecutive slots as one operation"""
+        for i, data in enumerate(datas):
+            if data is not None:
+                self._slot_view(slot + i)[:] = data
+        self.write_ops += 1
+        self.bytes_written += len(datas) * self.page_size
+        self._io(slot, len(datas))
+    
+    def flush(self):
+        """Issue queued write-outs, one write per run of adjacent slots"""
+        if not self.pending:
+            return
+        slots = sorted(self.pending)
+        run_start = slots[0]
+        run = [self.pending[run_start]]
+        for slot in slots[1:]:
+            if slot == run_start + len(run):
+                run.append(self.pending[slot])
+            else:
+                self._write_run(run_start, run)
+                run_start = slot
+                run = [self.pending[slot]]
+        self._write_run(run_start, run)
+        self.pending.clear()
+    
+    def swap_in(self, page_num):
+        """Swap page from disk
+        
+        Returns a read-only memoryview of the page's slot (no copy), or
+        None if the page has never been swapped out.
+        """
+        self.swap_in_count += 1
+        slot = self.slot_of.get(page_num)
+        if slot is None:
+            return None
+        if slot in self.pending:
+            self.flush()
+        self.read_ops += 1
+        self.bytes_read += self.page_size
+        self._io(slot, 1)
+        return self._slot_view(slot).toreadonly()
+    
+    def release(self, page_num):
+        """Free page's slot (its disk copy is no longer needed), returns whether it had one"""
+        slot = self.slot_of.pop(page_num, None)
+        if slot is None:
+            return False
+        self.pending.pop(slot, None)
+        self.free_slots.append(slot)
+        self.slots_released += 1
+        return True
+    
+    def swap_full(self):
+        """Whether more than half the slots are in use"""
+        return len(self.free_slots) * 2 < self.num_slots
+    
+    def clear(self):
+        """Clear swap space"""
+        self._reset_state()
+    
+    def get_pages_on_disk(self, start=0):
+        """Get list of pages in swap, in the order they first arrived"""
+        if start:
+            return list(itertools.islice(self.slot_of, start, None))
+        return list(self.slot_of.keys())
+    
+    def io_stats(self):
+        """I/O volume and locality counters
+        
+        Queued write-outs are not flushed (that would change the batching
+        being measured); they are counted in swap_pending_writes instead.
+        """
+        ops = self.write_ops + self.read_ops
+        return {
+            'swap_bytes_written': self.bytes_written,
+            'swap_bytes_read': self.bytes_read,
+            'swap_write_ops': self.write_ops,
+            'swap_pending_writes': len(self.pending),
+            'swap_read_ops': self.read_ops,
+            'swap_slots_used': len(self.slot_of),
+            'swap_slots_released': self.slots_released,
+            'swap_avg_seek': (self.seek_distance / ops) if ops > 0 else 0,
+            'swap_sequential_ratio': (self.sequential_ops / ops * 100) if ops > 0 else 0
+        }
+    
+    def __getstate__(self):
+        """Slot map, counters and the contents of occupied slots, for checkpoints
+        
+        Loading reopens the file (a fresh one if temporary) and writes the
+        slots back.
+        """
+        state = {k: v for k, v in self.__dict__.items() if k not in ('file', 'map', 'view')}
+        state['pending'] = {slot: None if data is None else bytes(data)
+                             for slot, data in self.pending.items()}
+        contents = {}
+        for slot in self.slot_of.values():
+            data = bytes(self._slot_view(slot)).rstrip(b'\0')
+            if data:
+                contents[slot] = data
+        state['contents'] = contents
+        return state
+    
+    def __setstate__(self, state):
+        contents = state.pop('contents')
+        self.__dict__.update(state)
+        self._open()
+        for slot, data in contents.items():
+            start = slot * self.page_size
+            self.view[start:start + len(data)] = data
+    
+    def close(self):
+        """Unmap and close the swap file (deleting it if temporary)"""
+        self.flush()
+        self.view.release()
+        self.map.close()
+        self.file.close()
+        if self.temporary:
+            os.unlink(self.path)
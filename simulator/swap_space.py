@@ -1,3 +1,5 @@
+import itertools
+
 class SwapSpace:
     """Simulates disk swap space"""
     def __init__(self):
@@ -15,12 +17,26 @@ class SwapSpace:
         self.swap_in_count += 1
         return self.disk.get(page_num, None)
     
+    def release(self, page_num):
+        """Drop page's disk copy, returns whether it had one"""
+        return self.disk.pop(page_num, None) is not None
+    
+    def swap_full(self):
+        """Whether swap-ins should free their copy (never: the store is unbounded)"""
+        return False
+    
     def clear(self):
         """Clear swap space"""
         self.disk.clear()
         self.swap_in_count = 0
         self.swap_out_count = 0
     
-    def get_pages_on_disk(self):
-        """Get list of pages in swap"""
+    def io_stats(self):
+        """I/O counters beyond swap_in/swap_out (none for the in-memory store)"""
+        return {}
+    
+    def get_pages_on_disk(self, start=0):
+        """Get list of pages in swap, in the order they first arrived"""
+        if start:
+            return list(itertools.islice(self.disk, start, None))
         return list(self.disk.keys())
@@ -0,0 +1,235 @@
+"""
+Parallel parameter sweeps
+
+Runs every combination of algorithm x frame count x TLB size over one
+trace on a process pool. The decoded trace is placed in shared memory
+once and every worker maps it, instead of each task receiving a pickled
+copy. Finished configurations are appended to a JSON-lines results file
+as they arrive, so an interrupted sweep picks up where it stopped. Each
+row records the trace file (path, size, modification time) and page size
+it was run with, so a resume against a changed trace starts afresh.
+
+    python -m simulator.sweep trace.txt -a FIFO,LRU -f 16,64,256 -t 8,16 -o sweep.jsonl --csv sweep.csv
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+from .memory_manager import MemoryManager
+from .trace_reader import FORMATS, read_references
+
+CONFIG_KEYS = ('algorithm', 'num_frames', 'tlb_size')
+# Fields identifying the trace and settings shared by every row of a sweep
+TRACE_KEYS = ('trace', 'trace_format', 'trace_size', 'trace_mtime', 'page_size')
+
+# Per-worker views of the shared trace, set by _attach_trace
+_trace = None
+_writes = None
+_trace_shm = None
+
+def _attach_trace(name, length):
+    """Pool initializer: map the shared trace into this worker
+    
+    The segment holds length int64 page numbers followed by length
+    write-flag bytes.
+    """
+    global _trace, _writes, _trace_shm
+    _trace_shm = shared_memory.SharedMemory(name=name)
+    _trace = _trace_shm.buf[:length * 8].cast('q')
+    _writes = _trace_shm.buf[length * 8:length * 9]
+
+def _run_config(config, options):
+    """Simulate one configuration over the shared trace"""
+    mm = MemoryManager(
+        num_frames=config['num_frames'],
+        tlb_size=config['tlb_size'],
+        algorithm=config['algorithm'],
+        **options
+    )
+    mm.initialize_replacer(_trace)
+    mm.access_many(_trace, record=False, writes=_writes)
+    row = dict(config)
+    row.update(mm.get_metrics())
+    return row
+
+def trace_identity(path, trace_format='pages'):
+    """Fields telling a trace file apart from others (and from itself once changed)"""
+    stat = os.stat(path)
+    return {
+        'trace': os.path.abspath(path),
+        'trace_format': trace_format,
+        'trace_size': stat.st_size,
+        'trace_mtime': stat.st_mtime_ns
+    }
+
+class SweepRunner:
+    """Runs a grid of configurations over one trace in parallel
+    
+    trace (see trace_identity) is recorded in every row; rows of the
+    results file that do not match it or the page size are not reused.
+    """
+    def __init__(self, pages, algorithms, frame_counts, tlb_sizes,
+                 workers=None, results_path=None, writes=None, trace=None, **options):
+        self.pages = pages
+        self.writes = writes
+        self.algorithms = list(algorithms)
+        self.frame_counts = list(frame_counts)
+        self.tlb_sizes = list(tlb_sizes)
+        self.workers = workers or os.cpu_count()
+        self.results_path = results_path
+        # Passed to every MemoryManager (page_size, page_table_levels, ...)
+        self.options = options
+        self.identity = dict.fromkeys(TRACE_KEYS)
+        self.identity.update(trace or {})
+        self.identity['page_size'] = options.get('page_size', 4096)
+        self.results = []
+    
+    def configs(self):
+        """All configurations in the grid"""
+        return [
+            dict(self.identity, algorithm=a, num_frames=f, tlb_size=t)
+            for a, f, t in itertools.product(self.algorithms, self.frame_counts, self.tlb_sizes)
+        ]
+    
+    @staticmethod
+    def _key(row):
+        return tuple(row.get(k) for k in TRACE_KEYS + CONFIG_KEYS)
+    
+    def _load_completed(self):
+        """Rows already in the results file, and the byte offset where they end
+        
+        Reading stops at the first line that is not a complete JSON row,
+        such as a partial last line from an interrupted run.
+        """
+        if not self.results_path or not os.path.exists(self.results_path):
+            return [], 0
+        rows = []
+        end = 0
+        with open(self.results_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                if line.strip():
+                    try:
+                        rows.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        break
+                end += len(line)
+        return rows, end
+    
+    def run(self):
+        """Run outstanding configurations, yielding each result row as it finishes"""
+        rows, end = self._load_completed()
+        wanted = {self._key(c) for c in self.configs()}
+        self.results = [row for row in rows if self._key(row) in wanted]
+        done = {self._key(row) for row in self.results}
+        pending = [c for c in self.configs() if self._key(c) not in done]
+        if self.results_path and os.path.exists(self.results_path):
+            # Drop anything after the last complete row before appending
+            with open(self.results_path, 'r+b') as f:
+                f.truncate(end)
+        if not pending:
+            return
+        
+        n = len(self.pages)
+        shm = shared_memory.SharedMemory(create=True, size=max(n * 9, 1))
+        out = open(self.results_path, 'a') if self.results_path else None
+        try:
+            shm.buf[:n * 8] = array('q', self.pages).tobytes()
+            if self.writes is not None:
+                shm.buf[n * 8:n * 9] = bytes(self.writes)
+            else:
+                shm.buf[n * 8:n * 9] = bytes(n)
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(pending)),
+                                     initializer=_attach_trace,
+                                     initargs=(shm.name, len(self.pages))) as pool:
+                futures = [pool.submit(_run_config, c, self.options) for c in pending]
+                for future in as_completed(futures):
+                    row = future.result()
+                    self.results.append(row)
+                    if out:
+                        out.write(json.dumps(row) + '\n')
+                        out.flush()
+                    yield row
+        finally:
+            if out:
+                out.close()
+            shm.close()
+            shm.unlink()
+    
+    def run_all(self):
+        """Run the sweep to completion, returns the result table"""
+        for _ in self.run():
+            pass
+        return self.table()
+    
+    def table(self):
+        """Result rows sorted by configuration"""
+        order = {a: i for i, a in enumerate(self.algorithms)}
+        return sorted(self.results, key=lambda r: (order.get(r['algorithm'], len(order)),
+                                                   r['algorithm'], r['num_frames'], r['tlb_size']))
+
+def write_table(rows, path):
+    """Write result rows as one CSV table
+    
+    The columns are every key of any row, in first-seen order; a row
+    lacking one (e.g. a counter only some configurations report) leaves
+    it empty.
+    """
+    if not rows:
+        return
+    fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def _int_list(text):
+    return [int(x) for x in text.split(',')]
+
+def main(argv=None):
+    """Run a sweep from command-line arguments"""
+    parser = argparse.ArgumentParser(prog='python -m simulator.sweep',
+                                     description='Parallel sweep over algorithm x frames x TLB size.')
+    parser.add_argument('trace', help='trace file')
+    parser.add_argument('-i', '--trace-format', choices=FORMATS, default='pages')
+    parser.add_argument('-a', '--algorithms', default='FIFO,LRU,LFU,Optimal',
+                        help='comma-separated algorithms')
+    parser.add_argument('-f', '--frames', type=_int_list, default=[4, 8, 16, 32],
+                        help='comma-separated frame counts')
+    parser.add_argument('-t', '--tlb-sizes', type=_int_list, default=[8],
+                        help='comma-separated TLB sizes')
+    parser.add_argument('-p', '--page-size', type=int, default=4096)
+    parser.add_argument('-j', '--workers', type=int, help='worker processes (default: all cores)')
+    parser.add_argument('-o', '--results', help='JSON-lines results file; existing rows are skipped')
+    parser.add_argument('--csv', help='write the final table to this CSV file')
+    args = parser.parse_args(argv)
+    
+    pages, writes = read_references(args.trace, args.trace_format, args.page_size)
+    runner = SweepRunner(
+        pages, args.algorithms.split(','), args.frames, args.tlb_sizes,
+        workers=args.workers, results_path=args.results, writes=writes,
+        trace=trace_identity(args.trace, args.trace_format), page_size=args.page_size
+    )
+    for row in runner.run():
+        if not args.results:
+            print(json.dumps(row))
+        else:
+            print(f"done {row['algorithm']} frames={row['num_frames']} tlb={row['tlb_size']}")
+    if args.csv:
+        try:
+            write_table(runner.table(), args.csv)
+        except OSError as e:
+            print(f"Could not write {args.csv}: {e}", file=sys.stderr)
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,102 @@
+"""
+Timing model
+
+Turns what each access did (TLB lookup, page-table walk levels, fault,
+dirty write-back) into simulated time. MemoryManager counts accesses by
+latency class, so component times, effective access time (EAT) and
+latency percentiles are exact without storing per-access latencies.
+
+Context switches (MultiProcessManager) cost switch_ns each, plus flush_ns
+when the TLB is flushed rather than retagged. They count towards total
+time and EAT but not towards the per-access latency percentiles.
+"""
+
+# Percentiles reported by TimingModel.summarize
+PERCENTILES = (50, 90, 99, 99.9)
+
+class TimingModel:
+    """Configurable per-component access costs, in nanoseconds"""
+    def __init__(self, tlb_ns=1, memory_ns=100, walk_level_ns=100,
+                 swap_in_ns=8000000, swap_out_ns=8000000, switch_ns=2000, flush_ns=100):
+        self.tlb_ns = tlb_ns
+        self.memory_ns = memory_ns
+        self.walk_level_ns = walk_level_ns
+        self.swap_in_ns = swap_in_ns
+        self.swap_out_ns = swap_out_ns
+        self.switch_ns = switch_ns
+        self.flush_ns = flush_ns
+    
+    def latency(self, walk_levels=0, fault=False, dirty=False):
+        """Latency of one access
+        
+        Every access pays a TLB lookup and the memory access itself; a TLB
+        miss adds one memory reference per walked level, a fault adds a
+        swap-in and a dirty victim a swap-out.
+        """
+        time = self.tlb_ns + self.memory_ns + walk_levels * self.walk_level_ns
+        if fault:
+            time += self.swap_in_ns
+            if dirty:
+                time += self.swap_out_ns
+        return time
+    
+    def summarize(self, tlb_hits, miss_classes, switches=None, flushes=0):
+        """Time metrics for tlb_hits TLB hits plus the misses in miss_classes
+        
+        miss_classes maps (walk_levels, fault, victim_dirty) to the number
+        of accesses of that kind. With switches (context switches, of which
+        flushes flushed the TLB) the switch costs are added as well.
+        """
+        histogram = {}
+        accesses = tlb_hits
+        walk_steps = faults = dirty = 0
+        if tlb_hits:
+            histogram[self.latency()] = tlb_hits
+        for (levels, fault, victim_dirty), count in miss_classes.items():
+            accesses += count
+            walk_steps += levels * count
+            if fault:
+                faults += count
+                if victim_dirty:
+                    dirty += count
+            time = self.latency(levels, fault, victim_dirty)
+            histogram[time] = histogram.get(time, 0) + count
+        
+        components = {
+            'time_tlb_ns': accesses * self.tlb_ns,
+            'time_memory_ns': accesses * self.memory_ns,
+            'time_walk_ns': walk_steps * self.walk_level_ns,
+            'time_swap_in_ns': faults * self.swap_in_ns,
+            'time_swap_out_ns': dirty * self.swap_out_ns
+        }
+        if switches is not None:
+            components['time_switch_ns'] = switches * self.switch_ns
+            components['time_flush_ns'] = flushes * self.flush_ns
+        total = sum(components.values())
+        
+        metrics = {
+            'total_time_ns': total,
+            'eat_ns': (total / accesses) if accesses > 0 else 0
+        }
+        metrics.update(components)
+        for p, value in zip(PERCENTILES, self._percentiles(histogram, accesses)):
+            metrics[f'latency_p{p:g}_ns'] = value
+        metrics['latency_max_ns'] = max(histogram) if histogram else 0
+        return metrics
+    
+    @staticmethod
+    def _percentiles(histogram, total):
+        """Nearest-rank percentiles of a latency -> count histogram"""
+        values = []
+        latencies = sorted(histogram.items())
+        for p in PERCENTILES:
+            rank = max(1, -(-total * p // 100))   # ceil(total * p / 100)
+            seen = 0
+            value = 0
+            for time, count in latencies:
+                seen += count
+                value = time
+                if seen >= rank:
+                    break
+            values.append(value if total else 0)
+        return values
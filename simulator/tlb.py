@@ -1,3 +1,5 @@
+import random
+from array import array
 from collections import OrderedDict
 
 class TLB:
@@ -5,11 +7,12 @@ class TLB:
     def __init__(self, size=8):
         self.size = size
         self.entries = OrderedDict()
+        self.asid = 0               # Address space whose entries are cached
         self.hits = 0
         self.misses = 0
     
-    def lookup(self, page_num):
-        """Look up page in TLB"""
+    def lookup(self, page_num, fetch=False):
+        """Look up page in TLB (fetch is ignored: one TLB serves all accesses)"""
         if page_num in self.entries:
             self.hits += 1
             self.entries.move_to_end(page_num)  # LRU
@@ -18,21 +21,253 @@ class TLB:
             self.misses += 1
             return None
     
-    def insert(self, page_num, frame_num):
-        """Insert into TLB"""
+    def insert(self, page_num, frame_num, fetch=False):
+        """Insert into TLB, returns the page evicted to make room (or None)"""
+        evicted = None
         if page_num in self.entries:
             self.entries.move_to_end(page_num)
         else:
             if len(self.entries) >= self.size:
-                self.entries.popitem(last=False)
+                evicted, _ = self.entries.popitem(last=False)
             self.entries[page_num] = frame_num
+        return evicted
+    
+    def invalidate(self, page_num, asid=None):
+        """Drop page's entry, if cached (asid: only if it is the current space)"""
+        if asid is None or asid == self.asid:
+            self.entries.pop(page_num, None)
+    
+    def switch(self, asid):
+        """Context switch: an untagged TLB is flushed"""
+        self.entries.clear()
+        self.asid = asid
     
     def clear(self):
         """Clear TLB"""
         self.entries.clear()
+        self.asid = 0
         self.hits = 0
         self.misses = 0
     
     def get_entries(self):
         """Get all TLB entries"""
         return list(self.entries.items())
+    
+    def level_stats(self):
+        """Per-level counters (a single level has none beyond hits/misses)"""
+        return {}
+
+class SetAssociativeTLB:
+    """One N-way set-associative TLB level
+    
+    Slots live in flat array('q')s of sets * ways entries (page tag, ASID,
+    frame and a replacement stamp), so a 1.5k-entry level costs a few
+    arrays rather than per-entry objects. A set is searched with
+    array.index, which scans its ways in C. policy is 'LRU', 'FIFO' or
+    'Random'. A tag of -1 marks an empty slot, so negative page numbers
+    raise ValueError.
+    """
+    POLICIES = ('LRU', 'FIFO', 'Random')
+    
+    def __init__(self, entries=64, ways=4, policy='LRU', seed=0):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown TLB policy: {policy}")
+        if entries < ways or entries % ways:
+            raise ValueError(f"{entries} entries cannot be split into {ways}-way sets")
+        self.entries_count = entries
+        self.ways = ways
+        self.sets = entries // ways
+        self.policy = policy
+        self.random = random.Random(seed)
+        
+        self.tags = array('q', [-1]) * entries
+        self.asids = array('q', [0]) * entries
+        self.frames = array('q', [-1]) * entries
+        self.stamps = array('q', [0]) * entries
+        self.clock = 0
+        self.hits = 0
+        self.misses = 0
+    
+    def _find(self, page_num, asid):
+        """Slot holding (page, asid), or -1"""
+        if page_num < 0:
+            raise ValueError(f"Negative page number: {page_num}")
+        base = (page_num % self.sets) * self.ways
+        end = base + self.ways
+        tags = self.tags
+        while True:
+            try:
+                i = tags.index(page_num, base, end)
+            except ValueError:
+                return -1
+            if self.asids[i] == asid:
+                return i
+            base = i + 1
+    
+    def lookup(self, page_num, asid=0):
+        """Look up page, returns frame number or None"""
+        i = self._find(page_num, asid)
+        if i < 0:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self.policy == 'LRU':
+            self.clock += 1
+            self.stamps[i] = self.clock
+        return self.frames[i]
+    
+    def insert(self, page_num, frame_num, asid=0):
+        """Insert translation, returns the page evicted from its set (or None)"""
+        i = self._find(page_num, asid)
+        evicted = None
+        if i < 0:
+            base = (page_num % self.sets) * self.ways
+            end = base + self.ways
+            try:
+                i = self.tags.index(-1, base, end)
+            except ValueError:
+                if self.policy == 'Random':
+                    i = base + self.random.randrange(self.ways)
+                else:
+                    stamps = self.stamps[base:end]
+                    i = base + stamps.index(min(stamps))
+                evicted = self.tags[i]
+            self.tags[i] = page_num
+            self.asids[i] = asid
+        elif self.policy != 'LRU':
+            # Re-inserting a cached page does not renew it under FIFO/Random
+            self.frames[i] = frame_num
+            return None
+        self.frames[i] = frame_num
+        self.clock += 1
+        self.stamps[i] = self.clock
+        return evicted
+    
+    def invalidate(self, page_num, asid=0):
+        """Drop page's entry, if cached"""
+        i = self._find(page_num, asid)
+        if i >= 0:
+            self.tags[i] = -1
+    
+    def flush(self, asid=None):
+        """Drop every entry, or only those tagged with asid"""
+        if asid is None:
+            self.tags = array('q', [-1]) * self.entries_count
+            return
+        tags = self.tags
+        for i, tag_asid in enumerate(self.asids):
+            if tag_asid == asid:
+                tags[i] = -1
+    
+    def clear(self):
+        """Empty the level and reset its counters"""
+        self.flush()
+        self.clock = 0
+        self.hits = 0
+        self.misses = 0
+    
+    def get_entries(self, asid=None):
+        """(page, frame) of valid entries, optionally only for one ASID"""
+        return [(tag, frame) for tag, tag_asid, frame in zip(self.tags, self.asids, self.frames)
+                if tag >= 0 and (asid is None or tag_asid == asid)]
+
+class TLBHierarchy:
+    """Split L1 instruction/data TLBs backed by a shared L2 TLB
+    
+    A lookup tries the L1 for its access type, then the L2, filling the L1
+    on an L2 hit; a page-table walk result is inserted into both. hits
+    counts translations found at any level and misses those that needed a
+    walk, matching TLB. With use_asid, entries are tagged with the current
+    address-space id and a context switch only changes the tag; without
+    it a switch flushes every level.
+    """
+    def __init__(self, l1_entries=64, l1_ways=4, l2_entries=1536, l2_ways=12,
+                 l1_policy='LRU', l2_policy='LRU', use_asid=False):
+        self.l1i = SetAssociativeTLB(l1_entries, l1_ways, l1_policy)
+        self.l1d = SetAssociativeTLB(l1_entries, l1_ways, l1_policy)
+        self.l2 = SetAssociativeTLB(l2_entries, l2_ways, l2_policy)
+        self.size = l2_entries
+        self.use_asid = use_asid
+        self.asid = 0               # Current address space
+        self.tag = 0                # ASID entries are tagged with (0 without use_asid)
+        self.flushes = 0
+        self.hits = 0
+        self.misses = 0
+    
+    def lookup(self, page_num, fetch=False):
+        """Look up page, returns frame number or None"""
+        l1 = self.l1i if fetch else self.l1d
+        frame = l1.lookup(page_num, self.tag)
+        if frame is None:
+            frame = self.l2.lookup(page_num, self.tag)
+            if frame is None:
+                self.misses += 1
+                return None
+            l1.insert(page_num, frame, self.tag)
+        self.hits += 1
+        return frame
+    
+    def credit_hits(self, count, fetch=False):
+        """Count repeated hits on the entry just looked up"""
+        (self.l1i if fetch else self.l1d).hits += count
+        self.hits += count
+    
+    def insert(self, page_num, frame_num, fetch=False):
+        """Insert translation into L2 and the L1 for the access type
+        
+        Returns the page evicted from the L1, if any; it may still be
+        cached in the L2.
+        """
+        self.l2.insert(page_num, frame_num, self.tag)
+        return (self.l1i if fetch else self.l1d).insert(page_num, frame_num, self.tag)
+    
+    def invalidate(self, page_num, asid=None):
+        """Drop page's entries at every level (asid: of that space, default current)"""
+        if asid is None:
+            tag = self.tag
+        elif self.use_asid:
+            tag = asid
+        elif asid == self.asid:
+            tag = 0
+        else:
+            return                  # Untagged entries all belong to the current space
+        for level in (self.l1i, self.l1d, self.l2):
+            level.invalidate(page_num, tag)
+    
+    def switch(self, asid):
+        """Context switch to address space asid"""
+        if asid == self.asid:
+            return
+        self.asid = asid
+        if self.use_asid:
+            self.tag = asid
+        else:
+            self.flushes += 1
+            for level in (self.l1i, self.l1d, self.l2):
+                level.flush()
+    
+    def clear(self):
+        """Clear all levels"""
+        for level in (self.l1i, self.l1d, self.l2):
+            level.clear()
+        self.asid = 0
+        self.tag = 0
+        self.flushes = 0
+        self.hits = 0
+        self.misses = 0
+    
+    def get_entries(self):
+        """Translations cached at any level for the current address space"""
+        entries = dict(self.l2.get_entries(self.tag))
+        for level in (self.l1i, self.l1d):
+            entries.update(level.get_entries(self.tag))
+        return list(entries.items())
+    
+    def level_stats(self):
+        """Hit and miss counters per level"""
+        stats = {}
+        for name, level in (('l1i', self.l1i), ('l1d', self.l1d), ('l2', self.l2)):
+            stats[f'tlb_{name}_hits'] = level.hits
+            stats[f'tlb_{name}_misses'] = level.misses
+        stats['tlb_flushes'] = self.flushes
+        return stats
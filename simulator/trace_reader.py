@@ -0,0 +1,193 @@
+"""
+Streaming trace readers
+
+Traces are memory-mapped and decoded lazily, so arbitrarily large files
+are processed in fixed-size chunks of page numbers and write flags.
+
+Supported formats:
+    pages   - page numbers, comma or whitespace separated, '#' comments;
+              a trailing 'w' marks a write (e.g. "3w"), 'r' a read
+    addr    - one byte address per line (hex with 0x, or decimal),
+              optionally followed by R or W
+    lackey  - Valgrind lackey output ('I', 'L', 'S', 'M' records)
+    bin64   - raw little-endian uint64 byte addresses
+
+Multi-process traces use the 'tagged' format, read with iter_tagged_chunks:
+one reference per line as "PID PAGE", where PAGE may carry the 'w'/'r'
+suffix of the pages format, e.g. "12 3w".
+"""
+
+import mmap
+from array import array
+
+from .preprocess import pages_from_bytes
+
+FORMATS = ('pages', 'addr', 'lackey', 'bin64')
+TAGGED = 'tagged'
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# Per-reference flag bits carried in the writes bytearray
+WRITE = 1
+FETCH = 2       # Instruction fetch (lackey 'I' records)
+
+class TraceFormatError(ValueError):
+    """Raised on a malformed trace record"""
+
+def _map_file(f):
+    """Memory-map an open file read-only (empty files map to b'')"""
+    try:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        return b''
+
+def _page_converter(page_size):
+    """Return a function mapping a byte address to its page number"""
+    if page_size & (page_size - 1) == 0:
+        shift = page_size.bit_length() - 1
+        return lambda addr: addr >> shift
+    return lambda addr: addr // page_size
+
+def _text_records(buf, fmt):
+    """Yield (value, flags) from a text trace, one line at a time"""
+    pos = 0
+    end = len(buf)
+    lineno = 0
+    while pos < end:
+        nl = buf.find(b'\n', pos)
+        if nl < 0:
+            nl = end
+        line = buf[pos:nl]
+        pos = nl + 1
+        lineno += 1
+        try:
+            if fmt == 'pages':
+                line = line.split(b'#', 1)[0]
+                for tok in line.replace(b',', b' ').split():
+                    flag = tok[-1:].lower()
+                    if flag in (b'r', b'w'):
+                        yield int(tok[:-1]), flag == b'w'
+                    else:
+                        yield int(tok), False
+            elif fmt == 'lackey':
+                # e.g. "I  04016f30,3" or " S 04225f48,8"; '==pid==' lines are headers
+                parts = line.split()
+                if len(parts) != 2 or parts[0] not in (b'I', b'L', b'S', b'M'):
+                    continue
+                kind = parts[0]
+                flags = FETCH if kind == b'I' else (WRITE if kind in (b'S', b'M') else 0)
+                yield int(parts[1].split(b',', 1)[0], 16), flags
+            else:
+                parts = line.split(b'#', 1)[0].split()
+                if not parts:
+                    continue
+                flag = parts[1].upper() if len(parts) > 1 else b'R'
+                if flag not in (b'R', b'W'):
+                    raise ValueError(f"bad access flag {flag!r}")
+                yield int(parts[0], 0), flag == b'W'
+        except ValueError as e:
+            raise TraceFormatError(f"line {lineno}: {e}") from None
+
+def iter_chunks(path, fmt='pages', page_size=4096, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield (pages, writes) chunks from a trace file
+    
+    pages is an array('q') of page numbers and writes a bytearray of flags:
+    WRITE for write references, FETCH for instruction fetches. Address formats are converted to pages with
+    page_size; the 'pages' format is passed through unchanged.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown trace format: {fmt}")
+    to_page = _page_converter(page_size)
+    
+    with open(path, 'rb') as f:
+        buf = _map_file(f)
+        try:
+            if fmt == 'bin64':
+                yield from _binary_chunks(buf, page_size, chunk_size)
+                return
+            
+            pages = array('q')
+            writes = bytearray()
+            for value, flags in _text_records(buf, fmt):
+                pages.append(value if fmt == 'pages' else to_page(value))
+                writes.append(flags)
+                if len(pages) >= chunk_size:
+                    yield pages, writes
+                    pages = array('q')
+                    writes = bytearray()
+            if pages:
+                yield pages, writes
+        finally:
+            if isinstance(buf, mmap.mmap):
+                buf.close()
+
+def _binary_chunks(buf, page_size, chunk_size):
+    """Decode raw uint64 addresses into page chunks"""
+    if len(buf) % 8:
+        raise TraceFormatError(f"binary trace length {len(buf)} is not a multiple of 8")
+    step = chunk_size * 8
+    for start in range(0, len(buf), step):
+        pages = pages_from_bytes(buf[start:start + step], page_size)
+        yield pages, bytearray(len(pages))
+
+def iter_tagged_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield (pids, pages, writes) chunks from a tagged multi-process trace"""
+    with open(path, 'rb') as f:
+        buf = _map_file(f)
+        try:
+            pids = array('q')
+            pages = array('q')
+            writes = bytearray()
+            pos = 0
+            end = len(buf)
+            lineno = 0
+            while pos < end:
+                nl = buf.find(b'\n', pos)
+                if nl < 0:
+                    nl = end
+                parts = buf[pos:nl].split(b'#', 1)[0].split()
+                pos = nl + 1
+                lineno += 1
+                if not parts:
+                    continue
+                try:
+                    if len(parts) != 2:
+                        raise ValueError(f"expected 'PID PAGE', got {b' '.join(parts)!r}")
+                    pid, page = parts
+                    flag = page[-1:].lower()
+                    if flag in (b'r', b'w'):
+                        page = page[:-1]
+                    pid = int(pid)
+                    page = int(page)
+                except ValueError as e:
+                    raise TraceFormatError(f"line {lineno}: {e}") from None
+                pids.append(pid)
+                pages.append(page)
+                writes.append(WRITE if flag == b'w' else 0)
+                if len(pages) >= chunk_size:
+                    yield pids, pages, writes
+                    pids = array('q')
+                    pages = array('q')
+                    writes = bytearray()
+            if pages:
+                yield pids, pages, writes
+        finally:
+            if isinstance(buf, mmap.mmap):
+                buf.close()
+
+def iter_references(path, fmt='pages', page_size=4096, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield (page, is_write) for every reference in a trace"""
+    for pages, writes in iter_chunks(path, fmt, page_size, chunk_size):
+        yield from zip(pages, (bool(flags & WRITE) for flags in writes))
+
+def read_pages(path, fmt='pages', page_size=4096):
+    """Load all page numbers of a trace into one compact array"""
+    return read_references(path, fmt, page_size)[0]
+
+def read_references(path, fmt='pages', page_size=4096):
+    """Load a whole trace as (pages array, writes bytearray)"""
+    pages = array('q')
+    writes = bytearray()
+    for chunk, chunk_writes in iter_chunks(path, fmt, page_size):
+        pages.extend(chunk)
+        writes.extend(chunk_writes)
+    return pages, writes
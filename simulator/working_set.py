@@ -0,0 +1,171 @@
+"""
+Working-set tracking
+
+The working set W(t, delta) of a reference stream is the set of pages
+referenced in its last delta references. Keeping pages in recency order
+with the time of their last reference makes the window incremental: a
+reference moves its page to the tail, and pages whose last reference has
+slid out of the window are popped from the head, O(1) amortized.
+
+The allocators size each process's resident set at run time instead of
+giving it a fixed frame count: the working-set allocator keeps exactly the
+working set resident, the page-fault-frequency allocator grows or trims
+the set depending on how often the process faults.
+"""
+
+from array import array
+from collections import OrderedDict
+
+class WorkingSet:
+    """Pages referenced in the last `window` references of one stream
+    
+    With window=None pages never expire on their own; the set is then a
+    process's resident set, trimmed by an allocator, and access() lets it
+    stand in for the process's replacer.
+    """
+    def __init__(self, window=None):
+        if window is not None and window < 1:
+            raise ValueError("Working-set window must be at least one reference")
+        self.window = window
+        self.time = 0
+        self.last_ref = OrderedDict()   # page -> time of last reference, oldest first
+    
+    def __len__(self):
+        return len(self.last_ref)
+    
+    def __contains__(self, page_num):
+        return page_num in self.last_ref
+    
+    def access(self, page_num):
+        """Record a reference, returns (None, is_fault) like a replacer that never evicts"""
+        self.time += 1
+        last_ref = self.last_ref
+        is_fault = page_num not in last_ref
+        if not is_fault:
+            last_ref.move_to_end(page_num)
+        last_ref[page_num] = self.time
+        return None, is_fault
+    
+    def reference(self, page_num):
+        """Record a reference, returns the pages that left the working set"""
+        self.access(page_num)
+        if self.window is None:
+            return []
+        return self.expire(self.time - self.window)
+    
+    def expire(self, horizon):
+        """Drop and return the pages last referenced at or before time horizon"""
+        last_ref = self.last_ref
+        expired = []
+        for page, time in last_ref.items():
+            if time > horizon:
+                break
+            expired.append(page)
+        for page in expired:
+            del last_ref[page]
+        return expired
+    
+    def pop_oldest(self):
+        """Drop and return the least recently referenced page"""
+        return self.last_ref.popitem(last=False)[0]
+    
+    def tick(self):
+        """No periodic work; the window slides on access"""
+
+class WorkingSetAllocator:
+    """Working-set policy: a page stays resident while it is in its process's working set"""
+    def __init__(self, window):
+        if window is None or window < 1:
+            raise ValueError("The working-set allocator needs a window of at least one reference")
+        self.window = window
+    
+    def on_fault(self, process):
+        """Pages to release before a fault is served"""
+        return []
+    
+    def after_reference(self, process):
+        """Pages that slid out of the window on this reference"""
+        resident = process.replacer
+        return resident.expire(resident.time - self.window)
+
+class PFFAllocator:
+    """Page-fault-frequency policy
+    
+    A fault that comes within threshold references of the process's
+    previous fault grows the resident set by one frame. After a longer
+    gap the process is faulting rarely, so pages not referenced since the
+    previous fault are released first.
+    """
+    def __init__(self, threshold):
+        if threshold is None or threshold < 1:
+            raise ValueError("The PFF allocator needs a threshold of at least one reference")
+        self.threshold = threshold
+    
+    def on_fault(self, process):
+        """Pages to release before a fault is served"""
+        resident = process.replacer
+        last_fault = process.last_fault
+        process.last_fault = resident.time
+        if resident.time - last_fault <= self.threshold:
+            return []
+        return resident.expire(last_fault - 1)
+    
+    def after_reference(self, process):
+        """Pages to release after a reference"""
+        return []
+
+class ThrashingDetector:
+    """Compares the combined working-set size with the frames available
+    
+    update() is given the change in the total after every reference. While
+    the total exceeds num_frames the workload cannot keep its working sets
+    resident; each such stretch is one episode, and on_thrashing (if set)
+    is called with (time, total) when an episode starts. The total is
+    sampled every sample_interval references for a WSS-over-time series.
+    """
+    def __init__(self, num_frames, sample_interval=1000, on_thrashing=None):
+        self.num_frames = num_frames
+        self.sample_interval = sample_interval
+        self.on_thrashing = on_thrashing
+        self.time = 0
+        self.total = 0
+        self.peak = 0
+        self.total_sum = 0
+        self.thrashing = False
+        self.thrashing_refs = 0
+        self.episodes = []              # [start, end or None, peak total]
+        self.samples = array('q')       # total WSS every sample_interval references
+    
+    def update(self, delta):
+        """Account one reference that changed the total working-set size by delta"""
+        self.time += 1
+        total = self.total = self.total + delta
+        self.total_sum += total
+        if total > self.peak:
+            self.peak = total
+        
+        if total > self.num_frames:
+            self.thrashing_refs += 1
+            if not self.thrashing:
+                self.thrashing = True
+                self.episodes.append([self.time, None, total])
+                if self.on_thrashing is not None:
+                    self.on_thrashing(self.time, total)
+            elif total > self.episodes[-1][2]:
+                self.episodes[-1][2] = total
+        elif self.thrashing:
+            self.thrashing = False
+            self.episodes[-1][1] = self.time
+        
+        if self.time % self.sample_interval == 0:
+            self.samples.append(total)
+    
+    def get_metrics(self):
+        """Working-set and thrashing counters"""
+        return {
+            'wss': self.total,
+            'wss_avg': (self.total_sum / self.time) if self.time > 0 else 0,
+            'wss_peak': self.peak,
+            'thrashing_refs': self.thrashing_refs,
+            'thrashing_episodes': len(self.episodes)
+        }
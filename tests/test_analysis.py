@@ -0,0 +1,76 @@
+"""Single-pass miss-ratio curves against direct simulation"""
+
+import random
+
+import pytest
+
+from simulator import analysis
+from simulator.analysis import DEFAULT_MAX_FRAMES, FenwickTree, miss_ratio_curves
+from simulator.memory_manager import MemoryManager
+
+def _trace(seed, length=1500, pages=30):
+    rng = random.Random(seed)
+    refs = []
+    while len(refs) < length:
+        if rng.random() < 0.2:
+            start = rng.randrange(pages)
+            refs.extend(range(start, min(pages, start + rng.randrange(2, 12))))
+        else:
+            refs.append(rng.randrange(rng.choice([5, pages])))
+    return refs[:length]
+
+def _faults(algorithm, refs, num_frames):
+    manager = MemoryManager(num_frames=num_frames, algorithm=algorithm)
+    manager.initialize_replacer(refs)
+    return manager.access_many(refs, record=False)['page_faults']
+
+def test_fenwick_prefix_sums():
+    rng = random.Random(1)
+    tree = FenwickTree(50)
+    values = [0] * 51
+    for _ in range(300):
+        i = rng.randint(1, 50)
+        delta = rng.randint(-3, 3)
+        tree.add(i, delta)
+        values[i] += delta
+        j = rng.randint(0, 50)
+        assert tree.prefix(j) == sum(values[1:j + 1])
+
+@pytest.mark.parametrize('seed', range(4))
+def test_curves_match_simulation(seed):
+    refs = _trace(seed)
+    curves = miss_ratio_curves(refs)
+    assert curves['frames'] == list(range(1, len(set(refs)) + 1))
+    assert curves['total_accesses'] == len(refs)
+    for k in curves['frames']:
+        assert curves['lru_faults'][k - 1] == _faults('LRU', refs, k), f"LRU, {k} frames"
+        assert curves['opt_faults'][k - 1] == _faults('Optimal', refs, k), f"OPT, {k} frames"
+    # Past the distinct page count only cold misses remain
+    assert curves['lru_faults'][-1] == curves['opt_faults'][-1] == len(set(refs))
+
+def test_curves_with_explicit_max_frames():
+    refs = _trace(7, pages=60)
+    curves = miss_ratio_curves(refs, max_frames=12)
+    assert curves['frames'] == list(range(1, 13))
+    for k in (1, 5, 12):
+        assert curves['lru_faults'][k - 1] == _faults('LRU', refs, k)
+        assert curves['opt_faults'][k - 1] == _faults('Optimal', refs, k)
+
+def test_default_max_frames_caps_the_curves(monkeypatch):
+    refs = _trace(8, pages=40)
+    monkeypatch.setattr(analysis, 'DEFAULT_MAX_FRAMES', 10)
+    curves = miss_ratio_curves(refs)
+    assert curves['frames'] == list(range(1, 11))
+    # The capped OPT stack is still exact for every size it reports
+    for k in curves['frames']:
+        assert curves['opt_faults'][k - 1] == _faults('Optimal', refs, k)
+        assert curves['lru_faults'][k - 1] == _faults('LRU', refs, k)
+
+def test_default_cap_on_a_large_trace():
+    rng = random.Random(9)
+    refs = [rng.randrange(DEFAULT_MAX_FRAMES + 100) for _ in range(3000)]
+    curves = miss_ratio_curves(refs)
+    assert len(curves['frames']) == DEFAULT_MAX_FRAMES
+    for k in (1, DEFAULT_MAX_FRAMES // 2, DEFAULT_MAX_FRAMES):
+        assert curves['lru_faults'][k - 1] == _faults('LRU', refs, k)
+        assert curves['opt_faults'][k - 1] == _faults('Optimal', refs, k)
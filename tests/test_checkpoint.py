@@ -0,0 +1,141 @@
+"""Saving, restoring and rewinding simulator state"""
+
+import random
+from array import array
+
+import pytest
+
+from simulator.checkpoint import (Checkpointer, SnapshotHistory, load_state, restore_state,
+                                  rewind, save_state)
+from simulator.memory_manager import MemoryManager
+from simulator.swap_file import SwapFile
+from simulator.timing import TimingModel
+from simulator.tlb import TLBHierarchy
+
+ALGORITHMS = ['FIFO', 'LRU', 'LFU', 'Optimal', 'ARC', '2Q', 'LIRS',
+              'CLOCK', 'SecondChance', 'NRU', 'Aging']
+
+def _trace(seed, length=400):
+    rng = random.Random(seed)
+    refs = array('q', [rng.randint(0, 40) if rng.random() < 0.3 else rng.randint(0, 8)
+                       for _ in range(length)])
+    writes = bytearray(rng.random() < 0.3 for _ in refs)
+    return refs, writes
+
+def _state(manager):
+    return (manager.get_metrics(), sorted(manager.page_table.get_all_mappings()),
+            manager.tlb.get_entries(), list(manager.physical_memory))
+
+def _run(manager, refs, writes, start, end):
+    for i in range(start, end):
+        manager.access_page(refs[i], bool(writes[i]))
+
+@pytest.mark.parametrize('swap_file', [False, True])
+@pytest.mark.parametrize('algorithm', ALGORITHMS)
+def test_restored_run_continues_identically(algorithm, swap_file):
+    refs, writes = _trace(ALGORITHMS.index(algorithm))
+    
+    def make():
+        swap = SwapFile(num_slots=64, batch_size=3) if swap_file else None
+        manager = MemoryManager(num_frames=5, tlb=TLBHierarchy(4, 2, 8, 2), algorithm=algorithm,
+                                tick_interval=4, compact_page_table=True, swap_space=swap)
+        manager.initialize_replacer(refs)
+        return manager
+    
+    original = make()
+    _run(original, refs, writes, 0, 150)
+    data = save_state(original)
+    loaded = load_state(data, refs)
+    restored = make()
+    _run(restored, refs, writes, 0, 10)
+    restore_state(restored, data, refs)
+    managers = (original, loaded, restored)
+    for manager in managers:
+        _run(manager, refs, writes, 150, len(refs))
+    assert _state(original) == _state(loaded) == _state(restored)
+    if swap_file:
+        for manager in managers:
+            manager.swap_space.close()
+
+@pytest.mark.parametrize('algorithm', ALGORITHMS)
+def test_rewind(algorithm):
+    refs, writes = _trace(ALGORITHMS.index(algorithm) + 50, 300)
+    manager = MemoryManager(num_frames=4, tlb_size=2, algorithm=algorithm)
+    manager.initialize_replacer(refs)
+    history = SnapshotHistory(interval=37)
+    history.record(manager, 0)
+    states = []
+    for i, page in enumerate(refs):
+        manager.access_page(page, bool(writes[i]))
+        if history.due(i + 1):
+            history.record(manager, i + 1)
+        states.append(_state(manager))
+    for step in random.Random(algorithm).sample(range(1, len(refs) + 1), 20):
+        start = rewind(manager, history, step, refs, writes)
+        assert step - start < 37
+        assert _state(manager) == states[step - 1]
+
+def test_snapshot_budget_thins_history():
+    refs, writes = _trace(1, 2000)
+    manager = MemoryManager(num_frames=4, algorithm='LRU')
+    manager.initialize_replacer(refs)
+    history = SnapshotHistory(interval=10, budget=20000)
+    history.record(manager, 0)
+    for i, page in enumerate(refs):
+        manager.access_page(page, bool(writes[i]))
+        if history.due(i + 1):
+            history.record(manager, i + 1)
+    assert history.bytes_used() <= 20000
+    assert history.interval > 10
+    assert history.nearest(len(refs))[0] > len(refs) - 2 * history.interval
+
+def test_checkpointer_rejects_other_settings(tmp_path):
+    path = str(tmp_path / 'run.ckpt')
+    refs, writes = _trace(2)
+    manager = MemoryManager(num_frames=4, algorithm='LRU', tick_interval=5)
+    manager.initialize_replacer(refs)
+    _run(manager, refs, writes, 0, 100)
+    Checkpointer(path).save(manager, 100, trace='trace.txt')
+    
+    assert Checkpointer(path).position() == 100
+    for options in (dict(num_frames=5), dict(tick_interval=0), dict(compact_page_table=True),
+                    dict(tlb=TLBHierarchy()), dict(timing=TimingModel(swap_in_ns=1000)),
+                    dict(timing=TimingModel(flush_ns=0)), dict(swap_space=SwapFile(num_slots=64))):
+        other = MemoryManager(**dict(dict(num_frames=4, algorithm='LRU', tick_interval=5), **options))
+        other.initialize_replacer(refs)
+        with pytest.raises(ValueError):
+            Checkpointer(path).load(other, 'trace.txt')
+        if 'swap_space' in options:
+            other.swap_space.close()
+    with pytest.raises(ValueError):
+        Checkpointer(path).load(manager, 'other.txt')
+    
+    same = MemoryManager(num_frames=4, algorithm='LRU', tick_interval=5)
+    same.initialize_replacer(refs)
+    assert Checkpointer(path).load(same, 'trace.txt') == 100
+    assert _state(same) == _state(manager)
+    assert Checkpointer(str(tmp_path / 'missing.ckpt')).load(same) is None
+
+def test_checkpointer_checks_swap_file_settings(tmp_path):
+    path = str(tmp_path / 'run.ckpt')
+    refs, writes = _trace(3)
+    
+    def make(**options):
+        manager = MemoryManager(num_frames=4, algorithm='LRU',
+                                swap_space=SwapFile(**dict(dict(num_slots=64), **options)))
+        manager.initialize_replacer(refs)
+        return manager
+    
+    manager = make(batch_size=4)
+    _run(manager, refs, writes, 0, 100)
+    Checkpointer(path).save(manager, 100)
+    for options in (dict(), dict(batch_size=4, num_slots=128)):
+        other = make(**options)
+        with pytest.raises(ValueError, match='swap'):
+            Checkpointer(path).load(other)
+        other.swap_space.close()
+    same = make(batch_size=4)
+    assert Checkpointer(path).load(same) == 100
+    assert _state(same) == _state(manager)
+    for m in (manager, same):
+        m.swap_space.close()
@@ -0,0 +1,100 @@
+"""EventLog ring buffer and CSV export"""
+
+import csv
+import random
+
+import pytest
+
+from simulator import cli
+from simulator.event_log import EventLog, MESSAGE
+from simulator.memory_manager import MemoryManager
+
+def _fill(log, seed, length=500):
+    """Log a run in mixed append/extend batches, returns every record logged"""
+    rng = random.Random(seed)
+    manager = MemoryManager(num_frames=4, tlb_size=2)
+    refs = [rng.randint(0, 9) for _ in range(length)]
+    manager.initialize_replacer(refs)
+    logged = []
+    step = 0
+    while step < length:
+        if rng.random() < 0.2:
+            log.add_message(step, f"message {step}")
+            logged.append((step, -1, MESSAGE, -1, -1))
+        chunk = refs[step:step + rng.randint(1, 30)]
+        outcomes, frames, victims = manager.access_many(chunk)
+        if rng.random() < 0.5:
+            log.extend(step, chunk, outcomes, frames, victims)
+        else:
+            for i, page in enumerate(chunk):
+                log.append(step + i, page, outcomes[i], frames[i], victims[i])
+        logged.extend(zip(range(step, step + len(chunk)), chunk, outcomes, frames, victims))
+        step += len(chunk)
+    return logged
+
+@pytest.mark.parametrize('capacity', [1, 7, 50, 1000])
+def test_ring_buffer_keeps_latest(capacity, tmp_path):
+    path = str(tmp_path / 'events.csv')
+    log = EventLog(capacity)
+    log.start_export(path)
+    logged = _fill(log, capacity)
+    log.stop_export()
+    
+    assert len(log) == min(capacity, len(logged))
+    kept = logged[-len(log):]
+    for seq, record in zip(range(log.first_seq, log.total), kept):
+        assert log.record(seq) == record
+        if record[2] == MESSAGE:
+            assert log.format_record(seq) == f"message {record[0]}"
+    assert set(log.messages) <= set(range(log.first_seq, log.total))
+    assert list(log.matching({2})) == [seq for seq in range(log.first_seq, log.total)
+                                       if log.record(seq)[2] == 2]
+    
+    with open(path, newline='') as f:
+        rows = list(csv.reader(f))[1:]
+    assert [int(row[0]) for row in rows] == [record[0] for record in logged]
+
+def test_resumed_export_continues_file(tmp_path):
+    full = str(tmp_path / 'full.csv')
+    log = EventLog(100)
+    log.start_export(full)
+    logged = _fill(log, 1)
+    log.stop_export()
+    with open(full, 'rb') as f:
+        content = f.read()
+    
+    # An interrupted run: the rows up to step 200, then half a row
+    resumed = str(tmp_path / 'resumed.csv')
+    lines = content.splitlines(keepends=True)
+    kept = [line for i, line in enumerate(lines) if i == 0 or int(line.split(b',')[0]) < 200]
+    with open(resumed, 'wb') as f:
+        f.write(b''.join(kept) + lines[len(kept)][:5])
+    
+    log = EventLog(100)
+    log.start_export(resumed, 200)
+    for record in logged:
+        if record[0] >= 200:
+            if record[2] == MESSAGE:
+                log.add_message(record[0], f"message {record[0]}")
+            else:
+                log.append(*record)
+    log.stop_export()
+    with open(resumed, 'rb') as f:
+        assert f.read() == content
+
+def test_cli_closes_an_empty_export(tmp_path, monkeypatch):
+    # An EventLog with no records is falsy; the export must still be closed
+    closed = []
+    
+    class TrackedLog(EventLog):
+        def stop_export(self):
+            closed.append(self.export_file is not None)
+            super().stop_export()
+    
+    monkeypatch.setattr(cli, 'EventLog', TrackedLog)
+    trace = tmp_path / 'empty.txt'
+    trace.write_text('')
+    events = tmp_path / 'events.csv'
+    cli.main([str(trace), '--event-log', str(events), '-o', str(tmp_path / 'out.txt')])
+    assert closed[-1]
+    assert events.read_text().splitlines() == ['step,page,event,frame,victim,message']
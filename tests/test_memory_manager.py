@@ -0,0 +1,116 @@
+"""access_many against access_page, over every replacer and component"""
+
+import random
+from array import array
+
+import pytest
+
+from simulator.memory_manager import MemoryManager, PAGE_FAULT, PAGE_HIT, TLB_HIT
+from simulator.page_replacement import get_replacer
+from simulator.preprocess import collapse_runs
+from simulator.tlb import TLBHierarchy
+from simulator.trace_reader import FETCH, WRITE
+
+ALGORITHMS = ['FIFO', 'LRU', 'LFU', 'Optimal', 'ARC', '2Q', 'LIRS',
+              'CLOCK', 'SecondChance', 'NRU', 'Aging']
+
+CONFIGS = {
+    'plain': {},
+    'compact': dict(compact_page_table=True),
+    'multilevel': dict(page_table_levels=[4, 4]),
+    'ticks': dict(tick_interval=7),
+    'hierarchy': dict(tlb=lambda: TLBHierarchy(8, 2, 32, 4)),
+}
+
+def _make(algorithm, config, refs):
+    options = dict(config)
+    if 'tlb' in options:
+        options['tlb'] = options['tlb']()
+    manager = MemoryManager(num_frames=12, tlb_size=4, algorithm=algorithm, **options)
+    manager.initialize_replacer(refs)
+    return manager
+
+def _trace(seed, length=2000):
+    rng = random.Random(seed)
+    refs = array('q')
+    flags = bytearray()
+    while len(refs) < length:
+        # Runs share their flags and differ from their neighbours' pages,
+        # so collapsing them loses nothing
+        page = rng.randrange(60) if rng.random() < 0.3 else rng.randrange(15)
+        if refs and page == refs[-1]:
+            continue
+        count = rng.choice([1, 1, 1, 3])
+        refs.extend([page] * count)
+        flags.extend([rng.choice([0, 0, WRITE, FETCH])] * count)
+    return refs, flags
+
+def _outcome(result):
+    if result['tlb_hit']:
+        return TLB_HIT
+    return PAGE_FAULT if result['page_fault'] else PAGE_HIT
+
+@pytest.mark.parametrize('config', sorted(CONFIGS))
+@pytest.mark.parametrize('algorithm', ALGORITHMS)
+def test_access_many_matches_access_page(algorithm, config):
+    refs, flags = _trace(ALGORITHMS.index(algorithm))
+    one = _make(algorithm, CONFIGS[config], refs)
+    expected = []
+    for page, flag in zip(refs, flags):
+        result = one.access_page(page, bool(flag & WRITE), bool(flag & FETCH))
+        victim = result['victim']
+        expected.append((_outcome(result), result['frame'], -1 if victim is None else victim))
+    
+    many = _make(algorithm, CONFIGS[config], refs)
+    outcomes, frames, victims = many.access_many(refs, writes=flags)
+    assert list(zip(outcomes, frames, victims)) == expected
+    assert many.get_metrics() == one.get_metrics()
+    assert many.page_table.get_all_mappings() == one.page_table.get_all_mappings()
+
+@pytest.mark.parametrize('config', sorted(CONFIGS))
+@pytest.mark.parametrize('algorithm', ALGORITHMS)
+def test_collapsed_runs_keep_counters(algorithm, config):
+    refs, flags = _trace(ALGORITHMS.index(algorithm) + 100)
+    one = _make(algorithm, CONFIGS[config], refs)
+    one.access_many(refs, record=False, writes=flags)
+    
+    pages, counts, run_flags = collapse_runs(refs, flags)
+    runs = _make(algorithm, CONFIGS[config], refs)
+    runs.access_many(pages, record=False, counts=counts, writes=run_flags)
+    assert runs.get_metrics() == one.get_metrics()
+
+# Victim when page 4 faults after the hit on 1 in 1, 2, 3, 1, 4 with three
+# frames, and the tick interval the clock-style replacers need to see it
+HIT_VICTIMS = [
+    ('FIFO', 0, 1),             # Hits leave arrival order alone
+    ('LRU', 0, 2),              # The hit makes 1 most recent
+    ('LFU', 0, 2),              # The hit gives 1 a count of 2
+    ('Optimal', 0, 1),          # 1 is not used again, 2 and 3 are
+    ('ARC', 0, 2),              # The hit moves 1 from T1 to T2
+    ('2Q', 0, 1),               # Hits in A1in do not promote
+    ('LIRS', 0, 3),             # 3 is the only resident HIR page
+    ('CLOCK', 3, 2),            # Bits cleared at the tick, then 1 is referenced
+    ('SecondChance', 3, 2),
+    ('NRU', 3, 2),
+    ('Aging', 2, 2),            # 1 is referenced in both sampled intervals
+]
+
+@pytest.mark.parametrize('algorithm, tick_interval, victim', HIT_VICTIMS)
+def test_hits_reach_the_replacer(algorithm, tick_interval, victim):
+    refs = [1, 2, 3, 1, 4, 2, 3]
+    manager = MemoryManager(num_frames=3, tlb_size=1, algorithm=algorithm,
+                            tick_interval=tick_interval)
+    manager.initialize_replacer(refs)
+    results = [manager.access_page(page) for page in refs[:5]]
+    assert [r['page_fault'] for r in results] == [True, True, True, False, True]
+    assert results[4]['victim'] == victim
+
+@pytest.mark.parametrize('algorithm', ['FIFO', 'LRU', 'LFU', 'Optimal', 'ARC', '2Q', 'LIRS'])
+def test_replacer_sees_every_reference(algorithm):
+    # TLB hits, page-table hits and faults all reach the replacer, so it
+    # evicts exactly what it would when fed the whole reference string
+    refs, _ = _trace(7)
+    manager = _make(algorithm, {}, refs)
+    replacer = get_replacer(algorithm, 12, refs)
+    for page in refs:
+        assert manager.access_page(page)['victim'] == replacer.access(page)[0]
@@ -0,0 +1,102 @@
+"""Observer hooks: the events reported and attaching and detaching them"""
+
+import random
+
+import pytest
+
+from simulator.memory_manager import MemoryManager
+from simulator.observer import (EVENT_NAMES, BinaryTraceSink, CounterSink, ObservedTLB, Observer,
+                                PhaseTimer, read_binary_trace)
+from simulator.preprocess import collapse_runs
+
+class Recorder(Observer):
+    def __init__(self):
+        self.events = []
+    
+    def on_event(self, kind, page, arg):
+        self.events.append((EVENT_NAMES[kind], page, arg))
+
+def _manager(algorithm='LRU', num_frames=2, tlb_size=1):
+    manager = MemoryManager(num_frames=num_frames, tlb_size=tlb_size, algorithm=algorithm)
+    manager.initialize_replacer()
+    return manager
+
+def test_events_of_each_access():
+    manager = _manager()
+    recorder = Recorder()
+    manager.add_observer(recorder)
+    expected = [
+        (1, True, [('tlb_miss', 1, -1), ('walk', 1, 1), ('fault', 1, 1), ('swap_in', 1, -1)]),
+        (2, True, [('tlb_miss', 2, -1), ('walk', 2, 1), ('fault', 2, 1), ('swap_in', 2, -1),
+                   ('tlb_evict', 1, 2)]),
+        (1, False, [('tlb_miss', 1, -1), ('walk', 1, 1), ('tlb_evict', 2, 1)]),
+        (3, False, [('tlb_miss', 3, -1), ('walk', 3, 1), ('fault', 3, 1), ('victim', 2, 1),
+                    ('swap_out', 2, -1), ('swap_in', 3, -1), ('tlb_evict', 1, 3)]),
+        (3, False, [('tlb_hit', 3, 1)]),
+    ]
+    for page, write, events in expected:
+        recorder.events.clear()
+        manager.access_page(page, write)
+        assert recorder.events == events, f"page {page}"
+
+def test_counts_match_metrics():
+    rng = random.Random(1)
+    refs = [rng.randrange(rng.choice([4, 30])) for _ in range(3000)]
+    writes = bytearray(rng.random() < 0.3 for _ in refs)
+    plain = _manager('CLOCK', 8, 4)
+    observed = _manager('CLOCK', 8, 4)
+    counter = CounterSink()
+    observed.add_observer(counter)
+    # Collapsed runs go through the credited-hit path as well
+    pages, counts, run_writes = collapse_runs(refs, writes)
+    metrics = plain.access_many(pages, record=False, counts=counts, writes=run_writes)
+    assert observed.access_many(pages, record=False, counts=counts, writes=run_writes) == metrics
+    events = counter.get_counts()
+    assert events['tlb_hit'] == metrics['tlb_hits']
+    assert events['tlb_miss'] == events['walk'] == metrics['tlb_misses']
+    assert events['fault'] == events['swap_in'] == metrics['page_faults']
+    assert events['victim'] == metrics['clean_evictions'] + metrics['dirty_evictions']
+    assert events['swap_out'] == metrics['dirty_evictions']
+
+def test_detach_restores_raw_components():
+    manager = _manager()
+    raw = {name: getattr(manager, name) for name in ('tlb', 'page_table', 'replacer', 'swap_space')}
+    first, second = Recorder(), Recorder()
+    manager.add_observer(first)
+    manager.add_observer(second)
+    assert isinstance(manager.tlb, ObservedTLB)
+    for name, component in raw.items():
+        assert getattr(manager, name) is not component
+        assert getattr(manager, name).target is component
+    
+    manager.access_page(1)
+    manager.remove_observer(first)
+    assert manager.hub is not None
+    manager.access_page(2)
+    assert len(second.events) > len(first.events) > 0
+    
+    manager.remove_observer(second)
+    assert manager.hub is None
+    for name, component in raw.items():
+        assert getattr(manager, name) is component
+    seen = len(second.events)
+    manager.access_page(3)
+    assert len(second.events) == seen
+    assert manager.get_metrics()['page_faults'] == 3
+
+def test_timer_and_binary_trace(tmp_path):
+    manager = _manager('LRU', 4, 2)
+    recorder = Recorder()
+    timer = PhaseTimer()
+    path = str(tmp_path / 'events.bin')
+    with BinaryTraceSink(path, buffer_events=3) as sink:
+        for observer in (recorder, timer, sink):
+            manager.add_observer(observer)
+        for page in [1, 2, 3, 1, 4, 5, 2, 2, 6]:
+            manager.access_page(page, page % 2 == 0)
+    assert [(EVENT_NAMES[kind], page, arg) for kind, page, arg in read_binary_trace(path)] == \
+        recorder.events
+    report = timer.report()
+    assert report['tlb']['calls'] == 9 + manager.get_metrics()['tlb_misses']
+    assert report['replacer']['calls'] == 9
+    assert sum(phase['share'] for phase in report.values()) == pytest.approx(100)
@@ -0,0 +1,376 @@
+"""
+Replacers against naive reference implementations
+
+Each reference keeps its queues in plain lists and follows the published
+algorithm step by step, so it is slow but easy to check by eye. The real
+replacers must evict the same victims on the same references.
+"""
+
+import random
+
+import pytest
+
+from simulator.page_replacement import (ARCReplacer, FIFOReplacer, LFUReplacer, LIRSReplacer,
+                                        LRUReplacer, TwoQReplacer, get_replacer)
+
+class NaiveFIFO:
+    """Resident pages in arrival order"""
+    def __init__(self, num_frames):
+        self.num_frames = num_frames
+        self.frames = []
+    
+    def access(self, page):
+        if page in self.frames:
+            return None, False
+        victim = None
+        if len(self.frames) >= self.num_frames:
+            victim = self.frames.pop(0)
+        self.frames.append(page)
+        return victim, True
+
+class NaiveLRU(NaiveFIFO):
+    """Resident pages in order of last use"""
+    def access(self, page):
+        if page in self.frames:
+            self.frames.remove(page)
+            self.frames.append(page)
+            return None, False
+        return super().access(page)
+
+class NaiveLFU:
+    """Least count first, least recently used among equal counts"""
+    def __init__(self, num_frames, decay_interval=0, keep_history=False, history_size=None):
+        self.num_frames = num_frames
+        self.decay_interval = decay_interval
+        self.keep_history = keep_history
+        self.history_size = history_size if history_size is not None else 4 * num_frames
+        self.count = {}
+        self.last = {}
+        self.history = {}
+        self.history_order = []
+        self.time = 0
+    
+    @property
+    def frames(self):
+        return list(self.count)
+    
+    def access(self, page):
+        self.time += 1
+        if self.decay_interval and self.time % self.decay_interval == 0:
+            self.count = {p: max(1, c // 2) for p, c in self.count.items()}
+            self.history = {p: c // 2 for p, c in self.history.items() if c // 2}
+            self.history_order = [p for p in self.history_order if p in self.history]
+        if page in self.count:
+            self.count[page] += 1
+            self.last[page] = self.time
+            return None, False
+        victim = None
+        if len(self.count) >= self.num_frames:
+            victim = min(self.count, key=lambda p: (self.count[p], self.last[p]))
+            if self.keep_history:
+                self.history[victim] = self.count[victim]
+                if victim in self.history_order:
+                    self.history_order.remove(victim)
+                self.history_order.append(victim)
+                if len(self.history) > self.history_size:
+                    del self.history[self.history_order.pop(0)]
+            del self.count[victim]
+            del self.last[victim]
+        count = 1
+        if self.keep_history and page in self.history:
+            count += self.history.pop(page)
+            self.history_order.remove(page)
+        self.count[page] = count
+        self.last[page] = self.time
+        return victim, True
+
+class NaiveARC:
+    """ARC as in Megiddo and Modha's pseudocode, with the ghost lists bounded"""
+    def __init__(self, num_frames):
+        self.c = num_frames
+        self.p = 0
+        self.t1, self.t2, self.b1, self.b2 = [], [], [], []
+    
+    @property
+    def frames(self):
+        return self.t1 + self.t2
+    
+    def _replace(self, in_b2):
+        if self.t1 and (len(self.t1) > self.p or (in_b2 and len(self.t1) == self.p)):
+            victim = self.t1.pop(0)
+            self.b1.append(victim)
+        else:
+            victim = self.t2.pop(0)
+            self.b2.append(victim)
+        return victim
+    
+    def access(self, page):
+        c = self.c
+        if page in self.t1 or page in self.t2:
+            (self.t1 if page in self.t1 else self.t2).remove(page)
+            self.t2.append(page)
+            return None, False
+        full = len(self.t1) + len(self.t2) >= c
+        victim = None
+        if page in self.b1:
+            self.p = min(c, self.p + max(len(self.b2) // len(self.b1), 1))
+            self.b1.remove(page)
+            if full:
+                victim = self._replace(False)
+            self.t2.append(page)
+            return victim, True
+        if page in self.b2:
+            self.p = max(0, self.p - max(len(self.b1) // len(self.b2), 1))
+            self.b2.remove(page)
+            if full:
+                victim = self._replace(True)
+            self.t2.append(page)
+            return victim, True
+        if len(self.t1) + len(self.b1) >= c:
+            if len(self.t1) < c:
+                self.b1.pop(0)
+                if full:
+                    victim = self._replace(False)
+            else:
+                victim = self.t1.pop(0)
+        elif full:
+            if len(self.t1) + len(self.t2) + len(self.b1) + len(self.b2) >= 2 * c:
+                self.b2.pop(0)
+            victim = self._replace(False)
+        self.t1.append(page)
+        return victim, True
+
+class NaiveTwoQ:
+    """Full 2Q: FIFO A1in, ghost FIFO A1out, LRU Am"""
+    def __init__(self, num_frames, kin=0.25, kout=0.5):
+        self.num_frames = num_frames
+        self.kin = max(1, int(num_frames * kin))
+        self.kout = max(1, int(num_frames * kout))
+        self.a1in, self.a1out, self.am = [], [], []
+    
+    @property
+    def frames(self):
+        return self.a1in + self.am
+    
+    def access(self, page):
+        if page in self.am:
+            self.am.remove(page)
+            self.am.append(page)
+            return None, False
+        if page in self.a1in:
+            return None, False
+        victim = None
+        if len(self.a1in) + len(self.am) >= self.num_frames:
+            if len(self.a1in) > self.kin or not self.am:
+                victim = self.a1in.pop(0)
+                self.a1out.append(victim)
+                if len(self.a1out) > self.kout:
+                    self.a1out.pop(0)
+            else:
+                victim = self.am.pop(0)
+        if page in self.a1out:
+            self.a1out.remove(page)
+            self.am.append(page)
+        else:
+            self.a1in.append(page)
+        return victim, True
+
+LIR, HIR = 'LIR', 'HIR'
+
+class NaiveLIRS:
+    """LIRS with stack S and queue Q as lists (bottom and front first)"""
+    def __init__(self, num_frames, hir_ratio=0.01, ghost_ratio=2):
+        self.num_frames = num_frames
+        self.hir_size = min(max(1, int(num_frames * hir_ratio)), num_frames - 1)
+        self.lir_size = num_frames - self.hir_size
+        self.ghost_size = max(1, int(num_frames * ghost_ratio))
+        self.stack, self.queue, self.ghosts = [], [], []
+        self.status = {}
+        self.lir_count = 0
+        self.resident = 0
+    
+    @property
+    def frames(self):
+        return [p for p in self.status if p not in self.ghosts]
+    
+    def _prune(self):
+        while self.stack and self.status[self.stack[0]] == HIR:
+            bottom = self.stack.pop(0)
+            if bottom in self.ghosts:
+                self.ghosts.remove(bottom)
+                del self.status[bottom]
+    
+    def _demote_bottom(self):
+        bottom = self.stack.pop(0)
+        self.status[bottom] = HIR
+        self.queue.append(bottom)
+        self.lir_count -= 1
+        self._prune()
+    
+    def _promote(self, page):
+        if page in self.stack:
+            self.stack.remove(page)
+        self.stack.append(page)
+        self.status[page] = LIR
+        self.lir_count += 1
+        self._demote_bottom()
+    
+    def _evict(self):
+        if not self.queue:
+            self._demote_bottom()
+        victim = self.queue.pop(0)
+        self.resident -= 1
+        if victim in self.stack:
+            self.ghosts.append(victim)
+            if len(self.ghosts) > self.ghost_size:
+                old = self.ghosts.pop(0)
+                self.stack.remove(old)
+                del self.status[old]
+        else:
+            del self.status[victim]
+        return victim
+    
+    def access(self, page):
+        state = self.status.get(page)
+        if state == LIR:
+            was_bottom = self.stack[0] == page
+            self.stack.remove(page)
+            self.stack.append(page)
+            if was_bottom:
+                self._prune()
+            return None, False
+        if state == HIR and page not in self.ghosts:
+            self.queue.remove(page)
+            if page in self.stack:
+                self._promote(page)
+            else:
+                self.stack.append(page)
+                self.queue.append(page)
+            return None, False
+        victim = None
+        if self.resident >= self.num_frames:
+            victim = self._evict()
+        self.resident += 1
+        if page in self.ghosts:
+            self.ghosts.remove(page)
+            self._promote(page)
+        elif self.lir_count < self.lir_size:
+            self.stack.append(page)
+            self.status[page] = LIR
+            self.lir_count += 1
+        else:
+            self.stack.append(page)
+            self.status[page] = HIR
+            self.queue.append(page)
+        return victim, True
+
+def _trace(rng, length=1500):
+    """Hot pages mixed with occasional scans of cold ones"""
+    refs = []
+    while len(refs) < length:
+        if rng.random() < 0.1:
+            start = rng.randrange(100, 1000)
+            refs.extend(range(start, start + rng.randrange(5, 40)))
+        else:
+            refs.append(rng.randrange(rng.choice([4, 12, 40])))
+    return refs[:length]
+
+def _compare(real, naive, refs):
+    for i, page in enumerate(refs):
+        assert real.access(page) == naive.access(page), f"reference {i} (page {page})"
+        assert sorted(real.frames) == sorted(naive.frames), f"reference {i} (page {page})"
+
+@pytest.mark.parametrize('real, naive', [
+    (FIFOReplacer, NaiveFIFO),
+    (LRUReplacer, NaiveLRU),
+    (LFUReplacer, NaiveLFU),
+    (ARCReplacer, NaiveARC),
+    (TwoQReplacer, NaiveTwoQ),
+    (LIRSReplacer, NaiveLIRS),
+])
+@pytest.mark.parametrize('num_frames', [1, 2, 5, 16, 64])
+def test_matches_reference(real, naive, num_frames):
+    rng = random.Random(num_frames)
+    for _ in range(5):
+        _compare(real(num_frames), naive(num_frames), _trace(rng))
+
+@pytest.mark.parametrize('options', [
+    dict(decay_interval=3),
+    dict(decay_interval=20),
+    dict(keep_history=True),
+    dict(keep_history=True, history_size=1),
+    dict(keep_history=True, decay_interval=7, history_size=3),
+])
+def test_lfu_decay_and_history(options):
+    rng = random.Random(2)
+    for num_frames in (1, 3, 7):
+        real = LFUReplacer(num_frames, **options)
+        naive = NaiveLFU(num_frames, **options)
+        for _ in range(600):
+            page = rng.randrange(15)
+            assert real.access(page) == naive.access(page)
+        assert real.frequency == naive.count
+
+@pytest.mark.parametrize('kin, kout', [(0.25, 0.5), (0.5, 1.0), (0.1, 2.0)])
+def test_two_q_queue_sizes(kin, kout):
+    rng = random.Random(3)
+    _compare(TwoQReplacer(20, kin, kout), NaiveTwoQ(20, kin, kout), _trace(rng, 3000))
+
+@pytest.mark.parametrize('hir_ratio, ghost_ratio', [(0.1, 1), (0.3, 0.5)])
+def test_lirs_ratios(hir_ratio, ghost_ratio):
+    rng = random.Random(4)
+    _compare(LIRSReplacer(20, hir_ratio, ghost_ratio), NaiveLIRS(20, hir_ratio, ghost_ratio),
+             _trace(rng, 3000))
+
+def _belady_faults(refs, num_frames):
+    frames = set()
+    faults = 0
+    for i, page in enumerate(refs):
+        if page in frames:
+            continue
+        faults += 1
+        if len(frames) >= num_frames:
+            def next_use(p):
+                try:
+                    return refs.index(p, i + 1)
+                except ValueError:
+                    return len(refs)
+            frames.remove(max(frames, key=next_use))
+        frames.add(page)
+    return faults
+
+@pytest.mark.parametrize('num_frames', [1, 3, 8, 20])
+def test_optimal_fault_count(num_frames):
+    refs = _trace(random.Random(num_frames), 800)
+    replacer = get_replacer('Optimal', num_frames, refs)
+    faults = sum(replacer.access(page)[1] for page in refs)
+    assert faults == _belady_faults(refs, num_frames)
+
+@pytest.mark.parametrize('decay_interval', [0, 1, 3, 20])
+def test_lfu_repeat_matches_repeated_access(decay_interval):
+    rng = random.Random(decay_interval)
+    runs = LFUReplacer(4, decay_interval=decay_interval)
+    single = LFUReplacer(4, decay_interval=decay_interval)
+    for _ in range(2000):
+        page = rng.randrange(10)
+        times = rng.choice([0, 1, 5, 50])
+        assert runs.access(page) == single.access(page)
+        runs.repeat(page, times)
+        for _ in range(times):
+            single.access(page)
+        assert runs.frequency == single.frequency
+
+@pytest.mark.parametrize('algorithm', ['FIFO', 'LRU', 'LFU', 'Optimal', 'ARC', '2Q', 'LIRS'])
+def test_repeat_matches_repeated_access(algorithm):
+    rng = random.Random(5)
+    refs = _trace(rng, 1000)
+    counts = [rng.choice([1, 1, 2, 5]) for _ in refs]
+    expanded = [page for page, count in zip(refs, counts) for _ in range(count)]
+    one = get_replacer(algorithm, 8, expanded)
+    for page in expanded:
+        one.access(page)
+    runs = get_replacer(algorithm, 8, expanded)
+    for page, count in zip(refs, counts):
+        runs.access(page)
+        runs.repeat(page, count - 1)
+    assert sorted(one.frames) == sorted(runs.frames)
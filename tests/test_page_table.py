@@ -0,0 +1,115 @@
+"""Page tables against a dict of mappings"""
+
+import pickle
+import random
+
+import pytest
+
+from simulator.memory_manager import MemoryManager
+from simulator.page_table import CompactPageTable, MultiLevelPageTable, PageTable
+
+TABLES = {
+    'dict': PageTable,
+    'compact': CompactPageTable,
+    'multilevel': lambda: MultiLevelPageTable((6, 6)),
+}
+
+@pytest.mark.parametrize('kind', sorted(TABLES))
+def test_matches_dict(kind):
+    rng = random.Random(1)
+    table = TABLES[kind]()
+    mapped = {}
+    dirty = set()
+    for step in range(5000):
+        # Fill up, then drain, so tables grow, shrink and are freed
+        grow = (step // 1000) % 2 == 0
+        page = rng.randrange(4096)
+        if page in mapped and (not grow or rng.random() < 0.2):
+            table.remove(page)
+            del mapped[page]
+            dirty.discard(page)
+        elif page not in mapped and grow:
+            table.insert(page, step)
+            mapped[page] = step
+        elif page in mapped:
+            table.touch(page, write=True)
+            dirty.add(page)
+        assert table.get_frame(page) == mapped.get(page)
+        assert table.is_dirty(page) == (page in dirty)
+    assert sorted(table.get_all_mappings()) == sorted(mapped.items())
+
+@pytest.mark.parametrize('kind', sorted(TABLES))
+def test_pickle_keeps_bits(kind):
+    table = TABLES[kind]()
+    for page in range(0, 40, 3):
+        table.insert(page, page + 100)
+        table.touch(page, write=page % 2 == 0)
+    table.remove(9)
+    table.clear_referenced(12)
+    copy = pickle.loads(pickle.dumps(table))
+    assert sorted(copy.get_all_mappings()) == sorted(table.get_all_mappings())
+    for page in range(40):
+        assert copy.is_dirty(page) == table.is_dirty(page)
+        assert copy.is_referenced(page) == table.is_referenced(page)
+
+def test_multilevel_walk_cost():
+    table = MultiLevelPageTable((4, 4, 4))
+    assert table.get_frame(0x123) is None
+    assert table.last_walk_levels == 1
+    table.insert(0x123, 7)
+    assert table.get_frame(0x123) == 7
+    assert table.last_walk_levels == 3
+    # Shares the root and middle tables, misses in the leaf
+    assert table.get_frame(0x124) is None
+    assert table.last_walk_levels == 3
+    assert table.get_frame(0x133) is None
+    assert table.last_walk_levels == 2
+    assert table.walks == 4
+    assert table.walk_steps == 9
+    assert table.bytes_touched == 9 * table.ENTRY_SIZE
+
+def test_multilevel_frees_empty_tables():
+    table = MultiLevelPageTable((4, 4))
+    empty = table.memory_bytes()
+    for page in range(0, 256, 16):
+        table.insert(page, page)
+    assert table.memory_bytes() > empty
+    for page in range(0, 256, 16):
+        table.remove(page)
+    assert table.memory_bytes() == empty
+
+def test_multilevel_rejects_pages_outside_range():
+    table = MultiLevelPageTable((4, 4))
+    for page in (-1, 256):
+        with pytest.raises(ValueError):
+            table.insert(page, 1)
+        with pytest.raises(ValueError):
+            table.get_frame(page)
+
+def test_compact_table_shrinks():
+    table = CompactPageTable()
+    for page in range(1000):
+        table.insert(page, page)
+    grown = table.memory_bytes()
+    for page in range(1000):
+        table.remove(page)
+    assert table.memory_bytes() < grown
+    assert table.get_all_mappings() == []
+
+def test_compact_rejects_negative_pages():
+    table = CompactPageTable()
+    table.insert(0, 5)
+    for page in (-1, -7):
+        with pytest.raises(ValueError):
+            table.insert(page, 1)
+        with pytest.raises(ValueError):
+            table.get_frame(page)
+    assert table.get_all_mappings() == [(0, 5)]
+    
+    manager = MemoryManager(num_frames=4, algorithm='LRU', compact_page_table=True)
+    manager.initialize_replacer()
+    manager.access_page(3)
+    with pytest.raises(ValueError):
+        manager.access_page(-1)
+    with pytest.raises(ValueError):
+        manager.access_many([1, -2], record=False)
@@ -0,0 +1,48 @@
+"""Bulk preprocessing against per-reference loops"""
+
+import random
+import struct
+from array import array
+
+import pytest
+
+from simulator.preprocess import collapse_runs, page_shift, pages_from_addresses, pages_from_bytes
+
+def test_page_shift():
+    assert page_shift(4096) == 12
+    assert page_shift(1) == 0
+    assert page_shift(3000) is None
+    assert page_shift(0) is None
+
+@pytest.mark.parametrize('page_size', [1, 4096, 3000])
+def test_pages_from_addresses(page_size):
+    rng = random.Random(page_size)
+    addresses = [rng.randrange(2 ** 48) for _ in range(500)]
+    expected = [addr // page_size for addr in addresses]
+    assert list(pages_from_addresses(addresses, page_size)) == expected
+    buf = struct.pack(f'<{len(addresses)}Q', *addresses)
+    assert list(pages_from_bytes(buf, page_size)) == expected
+
+def _runs(pages, writes):
+    runs = []
+    for page, flag in zip(pages, writes):
+        if runs and runs[-1][0] == page:
+            runs[-1][1] += 1
+            runs[-1][2] |= flag
+        else:
+            runs.append([page, 1, flag])
+    return runs
+
+@pytest.mark.parametrize('seed', range(5))
+def test_collapse_runs(seed):
+    rng = random.Random(seed)
+    pages = array('q', (rng.randrange(4) for _ in range(rng.randrange(1, 300))))
+    writes = bytearray(rng.choice([0, 0, 1, 2]) for _ in pages)
+    run_pages, counts, run_writes = collapse_runs(pages, writes)
+    assert [list(run) for run in zip(run_pages, counts, run_writes)] == _runs(pages, writes)
+    assert collapse_runs(pages)[2] is None
+    assert list(collapse_runs(pages)[1]) == list(counts)
+
+def test_collapse_runs_empty():
+    assert collapse_runs(array('q')) == (array('q'), array('q'), None)
+    assert collapse_runs([], bytearray())[2] == bytearray()
@@ -0,0 +1,120 @@
+"""SwapFile storage, batching and slot reuse"""
+
+import random
+
+import pytest
+
+from simulator.memory_manager import MemoryManager
+from simulator.multiprocess import MultiProcessManager
+from simulator.swap_file import SwapFile, SwapFullError
+
+PAGE_SIZE = 64
+
+@pytest.fixture
+def swap():
+    device = SwapFile(num_slots=8, page_size=PAGE_SIZE)
+    yield device
+    device.close()
+
+def _page(value):
+    return bytes([value]) * PAGE_SIZE
+
+def test_round_trip(swap):
+    assert swap.swap_in(3) is None
+    swap.swap_out(3, _page(7))
+    swap.swap_out(4, _page(8))
+    assert bytes(swap.swap_in(3)) == _page(7)
+    swap.swap_out(3, _page(9))
+    assert bytes(swap.swap_in(3)) == _page(9)
+    assert swap.io_stats()['swap_slots_used'] == 2
+
+def test_full_and_release(swap):
+    for page in range(8):
+        swap.swap_out(page, _page(page))
+    with pytest.raises(SwapFullError):
+        swap.swap_out(8)
+    assert swap.release(2)
+    assert not swap.release(2)
+    swap.swap_out(8, _page(80))
+    assert bytes(swap.swap_in(8)) == _page(80)
+    assert swap.swap_in(2) is None
+
+def test_batching_merges_adjacent_slots():
+    unbatched = SwapFile(num_slots=16, page_size=PAGE_SIZE)
+    batched = SwapFile(num_slots=16, page_size=PAGE_SIZE, batch_size=4)
+    try:
+        for device in (unbatched, batched):
+            for page in range(8):
+                device.swap_out(page, _page(page))
+        assert unbatched.io_stats()['swap_write_ops'] == 8
+        assert batched.io_stats()['swap_write_ops'] == 2
+        for page in range(8):
+            assert bytes(batched.swap_in(page)) == _page(page)
+    finally:
+        unbatched.close()
+        batched.close()
+
+def test_stats_leave_the_batch_queued():
+    swap = SwapFile(num_slots=16, page_size=PAGE_SIZE, batch_size=4)
+    try:
+        for page in range(6):
+            swap.swap_out(page, _page(page))
+        for _ in range(2):
+            stats = swap.io_stats()
+            assert stats['swap_write_ops'] == 1
+            assert stats['swap_pending_writes'] == 2
+        # The queued pages still go out with the next two as one write
+        swap.swap_out(6, _page(6))
+        swap.swap_out(7, _page(7))
+        stats = swap.io_stats()
+        assert stats['swap_write_ops'] == 2
+        assert stats['swap_pending_writes'] == 0
+        assert stats['swap_bytes_written'] == 8 * PAGE_SIZE
+    finally:
+        swap.close()
+
+def _dirty_trace(seed, pages, length=20000):
+    rng = random.Random(seed)
+    refs = [rng.randrange(pages) for _ in range(length)]
+    writes = bytearray(rng.random() < 0.5 for _ in refs)
+    return refs, writes
+
+def test_slots_reused_under_pressure():
+    # 400 pages through 64 frames leave 336 swapped out at most, so 340
+    # slots suffice as long as pages read back give up their slots
+    refs, writes = _dirty_trace(1, 400)
+    swap = SwapFile(num_slots=340, page_size=PAGE_SIZE)
+    try:
+        manager = MemoryManager(64, algorithm='LRU', swap_space=swap)
+        manager.initialize_replacer(refs)
+        metrics = manager.access_many(refs, record=False, writes=writes)
+        assert metrics['swap_slots_used'] <= 400 - 64
+        assert metrics['swap_slots_released'] > 0
+        assert not set(swap.slot_of) & set(manager.frame_of)
+    finally:
+        swap.close()
+
+def test_slots_reused_by_many_processes():
+    # 600 pages in all; without reuse every one of them would need a slot
+    refs, writes = _dirty_trace(2, 300)
+    pids = [i % 2 for i in range(len(refs))]
+    swap = SwapFile(num_slots=560, page_size=PAGE_SIZE)
+    try:
+        manager = MultiProcessManager(64, algorithm='LRU', swap_space=swap)
+        manager.initialize_replacer(pids, refs)
+        metrics = manager.access_many(pids, refs, writes)
+        assert metrics['swap_slots_released'] > 0
+    finally:
+        swap.close()
+
+def test_no_release_with_room():
+    refs, writes = _dirty_trace(3, 6, 2000)
+    swap = SwapFile(num_slots=64, page_size=PAGE_SIZE)
+    try:
+        manager = MemoryManager(2, algorithm='LRU', swap_space=swap)
+        manager.initialize_replacer(refs)
+        metrics = manager.access_many(refs, record=False, writes=writes)
+        assert metrics['swap_slots_released'] == 0
+        assert metrics['swap_slots_used'] == 6
+    finally:
+        swap.close()
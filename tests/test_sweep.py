@@ -0,0 +1,99 @@
+"""Parameter sweeps and their CSV table"""
+
+import csv
+import random
+
+import pytest
+
+from simulator import sweep
+from simulator.memory_manager import MemoryManager
+from simulator.multiprocess import MultiProcessManager
+from simulator.trace_reader import read_references
+
+def _read_csv(path):
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+def test_write_table_takes_every_column(tmp_path):
+    path = str(tmp_path / 'table.csv')
+    sweep.write_table([{'algorithm': 'LRU', 'faults': 3},
+                       {'algorithm': 'CLOCK', 'faults': 2, 'replacer_scans': 9}], path)
+    assert _read_csv(path) == [
+        {'algorithm': 'LRU', 'faults': '3', 'replacer_scans': ''},
+        {'algorithm': 'CLOCK', 'faults': '2', 'replacer_scans': '9'},
+    ]
+
+@pytest.mark.parametrize('algorithm', ['LRU', 'CLOCK'])
+def test_metrics_always_report_scans(algorithm):
+    manager = MemoryManager(num_frames=2, algorithm=algorithm)
+    manager.initialize_replacer()
+    manager.access_many([1, 2, 3, 1], record=False)
+    assert 'replacer_scans' in manager.get_metrics()
+    processes = MultiProcessManager(4, algorithm=algorithm, policy='local', quota=2)
+    processes.initialize_replacer([0, 1], [1, 2])
+    assert 'replacer_scans' in processes.access_many([0, 1], [1, 2])
+
+def test_unwritable_csv_fails(tmp_path, capsys):
+    trace = tmp_path / 'trace.txt'
+    trace.write_text('1 2 3 1 2 4\n')
+    status = sweep.main([str(trace), '-a', 'LRU', '-f', '2', '-j', '1',
+                         '--csv', str(tmp_path / 'missing' / 'table.csv')])
+    assert status != 0
+    assert 'Could not write' in capsys.readouterr().err
+
+def _trace(tmp_path):
+    path = tmp_path / 'trace.txt'
+    rng = random.Random(1)
+    path.write_text('\n'.join(f"{rng.randrange(40)}{rng.choice(['', 'w'])}" for _ in range(3000)))
+    return str(path)
+
+def _runner(path, results=None):
+    pages, writes = read_references(path)
+    return sweep.SweepRunner(pages, ['LRU', 'CLOCK'], [4, 16], [2, 8], workers=2,
+                             results_path=results, writes=writes,
+                             trace=sweep.trace_identity(path))
+
+def test_sweep_matches_direct_runs(tmp_path):
+    path = _trace(tmp_path)
+    table = _runner(path).run_all()
+    assert [(r['algorithm'], r['num_frames'], r['tlb_size']) for r in table] == \
+        [(a, f, t) for a in ('LRU', 'CLOCK') for f in (4, 16) for t in (2, 8)]
+    # Workers read the trace and its write flags from shared memory
+    pages, writes = read_references(path)
+    for row in table:
+        manager = MemoryManager(num_frames=row['num_frames'], tlb_size=row['tlb_size'],
+                                algorithm=row['algorithm'])
+        manager.initialize_replacer(pages)
+        metrics = manager.access_many(pages, record=False, writes=writes)
+        assert {key: row[key] for key in metrics} == metrics
+    
+    csv_path = str(tmp_path / 'table.csv')
+    assert sweep.main([path, '-a', 'LRU,CLOCK', '-f', '4,16', '-t', '2,8', '-j', '2',
+                       '--csv', csv_path]) == 0
+    rows = _read_csv(csv_path)
+    assert [row['algorithm'] for row in rows] == ['LRU'] * 4 + ['CLOCK'] * 4
+    assert [int(row['page_faults']) for row in rows] == [row['page_faults'] for row in table]
+    assert [row['replacer_scans'] for row in rows[:4]] == ['0'] * 4
+
+def test_sweep_resumes(tmp_path):
+    path = _trace(tmp_path)
+    results = str(tmp_path / 'results.jsonl')
+    full = _runner(path, results).run_all()
+    
+    # Interrupted after three rows, partway through the fourth
+    with open(results) as f:
+        lines = f.readlines()
+    with open(results, 'w') as f:
+        f.writelines(lines[:3])
+        f.write(lines[3][:20])
+    runner = _runner(path, results)
+    assert len(list(runner.run())) == len(full) - 3
+    assert runner.table() == full
+    with open(results) as f:
+        assert len(f.readlines()) == len(full)
+    
+    # Nothing left to run; a changed trace starts afresh
+    assert list(_runner(path, results).run()) == []
+    with open(path, 'a') as f:
+        f.write('\n41\n')
+    assert len(list(_runner(path, results).run())) == len(full)
@@ -0,0 +1,63 @@
+"""Timing model charges on traces small enough to add up by hand"""
+
+import pytest
+
+from simulator.memory_manager import MemoryManager
+from simulator.multiprocess import MultiProcessManager
+from simulator.timing import TimingModel
+from simulator.tlb import TLBHierarchy
+
+def _timing():
+    return TimingModel(tlb_ns=1, memory_ns=10, walk_level_ns=100, swap_in_ns=1000,
+                       swap_out_ns=5000, switch_ns=2000, flush_ns=300)
+
+def test_single_process_summary():
+    manager = MemoryManager(num_frames=2, tlb_size=1, algorithm='LRU', timing=_timing())
+    manager.initialize_replacer()
+    refs = [(1, True), (2, False), (1, False), (3, True), (1, False), (1, False), (2, False)]
+    for page, write in refs:
+        manager.access_page(page, write)
+    # Faults cost 1111 (TLB, memory, one walk level, swap-in), page-table
+    # hits 111 and TLB hits 11; the last fault evicts dirty page 3 (+5000)
+    metrics = manager.get_metrics()
+    assert {k: v for k, v in metrics.items() if k.startswith(('time_', 'latency_'))} == {
+        'time_tlb_ns': 7,
+        'time_memory_ns': 70,
+        'time_walk_ns': 600,
+        'time_swap_in_ns': 4000,
+        'time_swap_out_ns': 5000,
+        'latency_p50_ns': 1111,
+        'latency_p90_ns': 6111,
+        'latency_p99_ns': 6111,
+        'latency_p99.9_ns': 6111,
+        'latency_max_ns': 6111
+    }
+    assert metrics['total_time_ns'] == 9677
+    assert metrics['eat_ns'] == pytest.approx(9677 / 7)
+
+@pytest.mark.parametrize('asid, flushes', [(False, 2), (True, 0)])
+def test_switch_and_flush_charges(asid, flushes):
+    tlb = TLBHierarchy(4, 2, 8, 2, use_asid=True) if asid else None
+    manager = MultiProcessManager(4, algorithm='LRU', timing=_timing(), tlb=tlb)
+    manager.initialize_replacer()
+    for pid, page in [(0, 1), (0, 2), (1, 1), (0, 1)]:
+        manager.access_page(pid, page)
+    metrics = manager.get_metrics()
+    assert manager.context_switches == 2
+    assert manager.tlb_flushes == flushes
+    assert metrics['time_switch_ns'] == 2 * 2000
+    assert metrics['time_flush_ns'] == flushes * 300
+    # Three faults; process 0's page 1 is still in a tagged TLB after the
+    # switch back, but has to be walked again after a flush
+    access_ns = 3 * 1111 + (111 if flushes else 11)
+    assert metrics['total_time_ns'] == access_ns + 2 * 2000 + flushes * 300
+    assert metrics['eat_ns'] == pytest.approx(metrics['total_time_ns'] / 4)
+
+def test_summary_without_switches():
+    timing = _timing()
+    metrics = timing.summarize(0, {})
+    assert metrics['total_time_ns'] == metrics['eat_ns'] == 0
+    assert 'time_switch_ns' not in metrics
+    metrics = timing.summarize(3, {(2, False, False): 1}, switches=0)
+    assert metrics['total_time_ns'] == 3 * 11 + 211
+    assert metrics['time_switch_ns'] == metrics['time_flush_ns'] == 0
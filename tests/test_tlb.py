@@ -0,0 +1,92 @@
+"""TLB models against simple references"""
+
+import random
+from collections import OrderedDict
+
+import pytest
+
+from simulator.memory_manager import MemoryManager
+from simulator.tlb import TLB, SetAssociativeTLB, TLBHierarchy
+
+@pytest.mark.parametrize('size', [1, 4, 16])
+def test_fully_associative_level_is_lru_tlb(size):
+    rng = random.Random(size)
+    level = SetAssociativeTLB(size, size, 'LRU')
+    tlb = TLB(size)
+    for _ in range(3000):
+        page = rng.randrange(40)
+        frame = level.lookup(page)
+        assert frame == tlb.lookup(page)
+        if frame is None:
+            assert level.insert(page, page * 10) == tlb.insert(page, page * 10)
+        if rng.random() < 0.05:
+            page = rng.randrange(40)
+            level.invalidate(page)
+            tlb.invalidate(page)
+    assert sorted(level.get_entries()) == sorted(tlb.get_entries())
+
+@pytest.mark.parametrize('policy', ['LRU', 'FIFO'])
+@pytest.mark.parametrize('entries, ways', [(16, 4), (64, 8), (12, 3)])
+def test_set_associative_matches_per_set_queues(policy, entries, ways):
+    rng = random.Random(entries)
+    level = SetAssociativeTLB(entries, ways, policy)
+    sets = [OrderedDict() for _ in range(entries // ways)]
+    for _ in range(5000):
+        page = rng.randrange(200)
+        cached = sets[page % len(sets)]
+        frame = level.lookup(page)
+        assert (frame is not None) == (page in cached)
+        if frame is None:
+            expected = None
+            if len(cached) >= ways:
+                expected, _ = cached.popitem(last=False)
+            cached[page] = True
+            assert level.insert(page, page) == expected
+        elif policy == 'LRU':
+            cached.move_to_end(page)
+
+def test_hierarchy_counters_add_up():
+    rng = random.Random(3)
+    tlb = TLBHierarchy(16, 4, 128, 8)
+    for _ in range(20000):
+        page = rng.randrange(3000)
+        fetch = rng.random() < 0.3
+        if tlb.lookup(page, fetch) is None:
+            tlb.insert(page, page, fetch)
+    stats = tlb.level_stats()
+    assert tlb.hits + tlb.misses == 20000
+    assert stats['tlb_l2_hits'] + stats['tlb_l2_misses'] == \
+        stats['tlb_l1i_misses'] + stats['tlb_l1d_misses']
+
+def test_hierarchy_switch():
+    tagged = TLBHierarchy(8, 2, 32, 4, use_asid=True)
+    tagged.insert(5, 1)
+    tagged.switch(2)
+    assert tagged.lookup(5) is None
+    tagged.switch(0)
+    assert tagged.lookup(5) == 1
+    assert tagged.flushes == 0
+    
+    untagged = TLBHierarchy(8, 2, 32, 4)
+    untagged.insert(5, 1)
+    untagged.switch(2)
+    untagged.switch(2)
+    assert untagged.flushes == 1
+    assert untagged.lookup(5) is None
+
+def test_negative_pages_rejected():
+    level = SetAssociativeTLB(8, 2)
+    level.insert(3, 1)
+    for call in (lambda: level.insert(-1, 2), lambda: level.lookup(-1),
+                 lambda: TLBHierarchy().lookup(-4)):
+        with pytest.raises(ValueError):
+            call()
+    assert level.get_entries() == [(3, 1)]
+    
+    manager = MemoryManager(num_frames=4, algorithm='LRU', tlb=TLBHierarchy(8, 2, 32, 4))
+    manager.initialize_replacer()
+    manager.access_page(3)
+    with pytest.raises(ValueError):
+        manager.access_page(-1)
+    with pytest.raises(ValueError):
+        manager.access_many([1, -2], record=False)
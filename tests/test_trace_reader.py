@@ -0,0 +1,115 @@
+"""Trace readers: traces written out are read back, malformed lines rejected"""
+
+import random
+import struct
+
+import pytest
+
+from simulator.preprocess import collapse_runs, pages_from_addresses
+from simulator.trace_reader import (FETCH, WRITE, TraceFormatError, iter_chunks,
+                                    iter_references, iter_tagged_chunks, read_references)
+
+def _refs(seed, length=1000):
+    """(address, flags) pairs, with instruction fetches among them"""
+    rng = random.Random(seed)
+    return [(rng.randrange(2 ** 40), rng.choice([0, 0, WRITE, FETCH])) for _ in range(length)]
+
+def _write(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data if isinstance(data, bytes) else data.encode())
+    return str(path)
+
+def _read(path, fmt, page_size=4096):
+    pages, writes = read_references(path, fmt, page_size)
+    return list(pages), list(writes)
+
+LACKEY_KINDS = {0: ' L', WRITE: ' S', FETCH: 'I '}
+
+@pytest.mark.parametrize('page_size', [4096, 3000])
+def test_formats_round_trip(tmp_path, page_size):
+    refs = _refs(page_size)
+    pages = [addr // page_size for addr, _ in refs]
+    writes = [flags & WRITE for _, flags in refs]
+    
+    text = '# page trace\n' + '\n'.join(
+        f"{page}{'w' if flag else ''}," for page, flag in zip(pages, writes))
+    assert _read(_write(tmp_path, 'p.txt', text), 'pages') == (pages, writes)
+    
+    text = '\n'.join(f"{hex(addr) if addr % 2 else addr} {'W' if flags & WRITE else 'r'}  # ref"
+                     for addr, flags in refs)
+    assert _read(_write(tmp_path, 'a.txt', text), 'addr', page_size) == (pages, writes)
+    
+    text = '==123== lackey header\n' + '\n'.join(
+        f"{LACKEY_KINDS[flags]} {addr:08x},4" for addr, flags in refs) + '\n'
+    assert _read(_write(tmp_path, 'l.txt', text), 'lackey', page_size) == \
+        (pages, [flags for _, flags in refs])
+    
+    data = struct.pack(f'<{len(refs)}Q', *(addr for addr, _ in refs))
+    assert _read(_write(tmp_path, 'b.bin', data), 'bin64', page_size) == \
+        (pages, [0] * len(refs))
+
+@pytest.mark.parametrize('fmt', ['pages', 'bin64'])
+def test_chunks_cover_the_trace(tmp_path, fmt):
+    pages = list(range(0, 2500, 3))
+    if fmt == 'pages':
+        path = _write(tmp_path, 't.txt', '\n'.join(map(str, pages)))
+    else:
+        path = _write(tmp_path, 't.bin', struct.pack(f'<{len(pages)}Q', *pages))
+    chunks = [list(chunk) for chunk, _ in iter_chunks(path, fmt, page_size=1, chunk_size=100)]
+    assert all(len(chunk) == 100 for chunk in chunks[:-1])
+    assert sum(chunks, []) == pages
+    assert [page for page, _ in iter_references(path, fmt, page_size=1)] == pages
+
+def test_tagged_round_trip(tmp_path):
+    rng = random.Random(1)
+    refs = [(rng.randrange(4), rng.randrange(500), rng.choice([0, WRITE])) for _ in range(700)]
+    text = '\n'.join(f"{pid} {page}{'w' if flag else 'r'}" for pid, page, flag in refs)
+    path = _write(tmp_path, 't.txt', '# pid page\n\n' + text)
+    read = []
+    for pids, pages, writes in iter_tagged_chunks(path, chunk_size=64):
+        read.extend(zip(pids, pages, writes))
+    assert read == refs
+
+def test_preprocessed_trace(tmp_path):
+    # A trace read back and collapsed matches preprocessing the addresses
+    rng = random.Random(2)
+    addresses = [rng.randrange(8) * 4096 + rng.randrange(4096) for _ in range(2000)]
+    path = _write(tmp_path, 'a.txt', '\n'.join(f"{addr:#x} W" for addr in addresses))
+    pages, writes = read_references(path, 'addr')
+    assert pages == pages_from_addresses(addresses, 4096)
+    run_pages, counts, run_writes = collapse_runs(pages, writes)
+    assert sum(counts) == len(addresses)
+    assert set(run_writes) == {WRITE}
+    assert [page for page, count in zip(run_pages, counts) for _ in range(count)] == list(pages)
+
+def test_empty_trace(tmp_path):
+    for fmt in ('pages', 'addr', 'lackey', 'bin64'):
+        assert _read(_write(tmp_path, 'empty', b''), fmt) == ([], [])
+    assert list(iter_tagged_chunks(_write(tmp_path, 'empty', b''))) == []
+
+@pytest.mark.parametrize('fmt, text, line', [
+    ('pages', '1 2\n3x\n', 2),
+    ('pages', '1\n\n2w\nw\n', 4),
+    ('addr', '0x10 R\n0x20 X\n', 2),
+    ('addr', '0x10\nzz\n', 2),
+    ('lackey', ' L 1000,4\n S nothex,4\n', 2),
+    ('tagged', '1 2\n3\n', 2),
+    ('tagged', '1 2\n1 2 3\n', 2),
+    ('tagged', '# header\nx 2\n', 2),
+])
+def test_malformed_lines(tmp_path, fmt, text, line):
+    path = _write(tmp_path, 'bad.txt', text)
+    with pytest.raises(TraceFormatError, match=f"line {line}:"):
+        if fmt == 'tagged':
+            list(iter_tagged_chunks(path))
+        else:
+            read_references(path, fmt)
+
+def test_truncated_binary_trace(tmp_path):
+    path = _write(tmp_path, 'bad.bin', b'\0' * 12)
+    with pytest.raises(TraceFormatError):
+        read_references(path, 'bin64')
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        read_references(_write(tmp_path, 't.txt', '1'), 'csv')
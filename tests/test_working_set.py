@@ -0,0 +1,149 @@
+"""Working sets, their allocators and the thrashing detector"""
+
+import random
+
+import pytest
+
+from simulator.memory_manager import MemoryManager, OutOfFramesError
+from simulator.multiprocess import MultiProcessManager
+from simulator.working_set import PFFAllocator, ThrashingDetector, WorkingSet, WorkingSetAllocator
+
+def _trace(seed, length=3000, processes=3):
+    """Interleaved (pid, page) references with per-process phases"""
+    rng = random.Random(seed)
+    pids, pages = [], []
+    while len(pages) < length:
+        pid = rng.randrange(processes)
+        base = (len(pages) // 700) * 5
+        for _ in range(rng.randint(1, 20)):
+            pids.append(pid)
+            pages.append(base + rng.randrange(rng.choice([4, 12])))
+    return pids[:length], pages[:length]
+
+@pytest.mark.parametrize('window', [1, 5, 40])
+def test_window_matches_last_references(window):
+    rng = random.Random(window)
+    refs = [rng.randrange(20) for _ in range(1000)]
+    working_set = WorkingSet(window)
+    for t, page in enumerate(refs, 1):
+        before = set(working_set.last_ref)
+        expired = working_set.reference(page)
+        expected = set(refs[max(0, t - window):t])
+        assert set(working_set.last_ref) == expected
+        assert set(expired) == before - expected
+
+def test_allocators_need_a_window():
+    for make in (WorkingSet, WorkingSetAllocator, PFFAllocator):
+        with pytest.raises(ValueError):
+            make(0)
+    for make in (WorkingSetAllocator, PFFAllocator):
+        with pytest.raises(ValueError):
+            make(None)
+
+def test_thrashing_detector():
+    alarms = []
+    detector = ThrashingDetector(4, sample_interval=3,
+                                 on_thrashing=lambda time, total: alarms.append((time, total)))
+    totals = [1, 3, 5, 6, 4, 2, 5, 5, 3]
+    previous = 0
+    for total in totals:
+        detector.update(total - previous)
+        previous = total
+    assert detector.episodes == [[3, 5, 6], [7, 9, 5]]
+    assert alarms == [(3, 5), (7, 5)]
+    assert list(detector.samples) == [5, 2, 3]
+    assert detector.get_metrics() == {
+        'wss': 3,
+        'wss_avg': sum(totals) / len(totals),
+        'wss_peak': 6,
+        'thrashing_refs': 4,
+        'thrashing_episodes': 2
+    }
+
+@pytest.mark.parametrize('window', [10, 60])
+def test_ws_policy_keeps_the_working_set(window):
+    pids, pages = _trace(window)
+    manager = MultiProcessManager(256, algorithm='LRU', policy='ws', window=window)
+    manager.initialize_replacer()
+    history = {}
+    for pid, page in zip(pids, pages):
+        manager.access_page(pid, page)
+        refs = history.setdefault(pid, [])
+        refs.append(page)
+        assert set(manager.processes[pid].frame_of) == set(refs[-window:])
+    assert manager.get_metrics()['released_pages'] > 0
+
+def test_ws_policy_reclaims_when_frames_run_out():
+    pids, pages = _trace(5)
+    manager = MultiProcessManager(12, algorithm='LRU', policy='ws', window=50)
+    manager.initialize_replacer()
+    history = {}
+    for pid, page in zip(pids, pages):
+        manager.access_page(pid, page)
+        history.setdefault(pid, []).append(page)
+        process = manager.processes[pid]
+        assert page in process.frame_of
+        assert set(process.frame_of) <= set(history[pid][-50:])
+        assert sum(len(p.frame_of) for p in manager.processes.values()) <= 12
+
+@pytest.mark.parametrize('threshold', [2, 8, 30])
+def test_pff_policy_matches_reference(threshold):
+    pids, pages = _trace(threshold)
+    manager = MultiProcessManager(256, algorithm='LRU', policy='pff', pff_threshold=threshold)
+    manager.initialize_replacer()
+    # Per process: resident pages -> virtual time of last reference, and last fault
+    resident, last_fault, time = {}, {}, {}
+    for pid, page in zip(pids, pages):
+        result = manager.access_page(pid, page)
+        pages_of = resident.setdefault(pid, {})
+        t = time[pid] = time.get(pid, 0) + 1
+        assert result['page_fault'] == (page not in pages_of)
+        if page not in pages_of:
+            previous = last_fault.get(pid, 0)
+            if t - previous > threshold:
+                for old in [p for p, ref in pages_of.items() if ref < previous]:
+                    del pages_of[old]
+            last_fault[pid] = t
+        pages_of[page] = t
+        assert set(manager.processes[pid].frame_of) == set(pages_of)
+
+@pytest.mark.parametrize('algorithm', ['LRU', 'FIFO', 'Optimal', 'CLOCK'])
+def test_local_policy_isolates_processes(algorithm):
+    pids, pages = _trace(1)
+    quotas = {0: 3, 1: 5, 2: 4}
+    manager = MultiProcessManager(16, algorithm=algorithm, policy='local', quotas=quotas)
+    manager.initialize_replacer(pids, pages)
+    manager.access_many(pids, pages)
+    # Each process faults exactly as it would alone in its quota of frames
+    for process in manager.process_metrics():
+        refs = [page for p, page in zip(pids, pages) if p == process['pid']]
+        alone = MemoryManager(num_frames=quotas[process['pid']], algorithm=algorithm)
+        alone.initialize_replacer(refs)
+        assert process['page_faults'] == alone.access_many(refs, record=False)['page_faults']
+        assert process['peak_resident'] <= quotas[process['pid']]
+
+def test_local_quotas_must_fit():
+    with pytest.raises(ValueError):
+        MultiProcessManager(8, policy='local')
+    manager = MultiProcessManager(8, policy='local', quota=5)
+    manager.initialize_replacer()
+    manager.access_page(0, 1)
+    with pytest.raises(OutOfFramesError):
+        manager.access_page(1, 1)
+
+def test_detector_follows_the_processes():
+    pids, pages = _trace(2)
+    window = 25
+    manager = MultiProcessManager(20, algorithm='LRU', window=window, sample_interval=100)
+    manager.initialize_replacer()
+    history = {}
+    samples = []
+    for t, (pid, page) in enumerate(zip(pids, pages), 1):
+        manager.access_page(pid, page)
+        history.setdefault(pid, []).append(page)
+        if t % 100 == 0:
+            samples.append(sum(len(set(refs[-window:])) for refs in history.values()))
+    assert manager.wss_history() == samples
+    metrics = manager.get_metrics()
+    assert metrics['wss_peak'] >= max(samples)
+    assert metrics['thrashing_episodes'] > 0